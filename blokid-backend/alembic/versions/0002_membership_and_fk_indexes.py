@@ -0,0 +1,47 @@
+"""Composite membership indexes and foreign-key indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:01
+
+Fails if a user already has two memberships of the same organization or
+website; remove the duplicates before upgrading.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Permission snapshots and membership checks filter on (user_id, resource id)
+    op.create_index(
+        "ix_organization_members_user_id_organization_id",
+        "organization_members", ["user_id", "organization_id"], unique=True
+    )
+    op.create_index(
+        "ix_website_members_user_id_website_id",
+        "website_members", ["user_id", "website_id"], unique=True
+    )
+
+    # Member listings, cascading deletes and joins from the parent side
+    op.create_index("ix_organization_members_organization_id", "organization_members", ["organization_id"])
+    op.create_index("ix_website_members_website_id", "website_members", ["website_id"])
+    op.create_index("ix_websites_organization_id", "websites", ["organization_id"])
+    op.create_index("ix_organizations_owner_id", "organizations", ["owner_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_organizations_owner_id", table_name="organizations")
+    op.drop_index("ix_websites_organization_id", table_name="websites")
+    op.drop_index("ix_website_members_website_id", table_name="website_members")
+    op.drop_index("ix_organization_members_organization_id", table_name="organization_members")
+    op.drop_index("ix_website_members_user_id_website_id", table_name="website_members")
+    op.drop_index("ix_organization_members_user_id_organization_id", table_name="organization_members")
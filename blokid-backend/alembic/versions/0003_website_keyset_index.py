@@ -0,0 +1,32 @@
+"""Keyset pagination index for an organization's websites
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pages of /websites/organizations/{id}/websites seek on (created_at, id);
+    # the leading organization_id column also replaces the plain FK index
+    op.create_index(
+        "ix_websites_organization_id_created_at_id",
+        "websites", ["organization_id", "created_at", "id"]
+    )
+    op.drop_index("ix_websites_organization_id", table_name="websites")
+
+
+def downgrade() -> None:
+    op.create_index("ix_websites_organization_id", "websites", ["organization_id"])
+    op.drop_index("ix_websites_organization_id_created_at_id", table_name="websites")
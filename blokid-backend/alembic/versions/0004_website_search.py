@@ -0,0 +1,59 @@
+"""Full-text search index over website name, url and description
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DOCUMENT = "coalesce(name, '') || ' ' || coalesce(url, '') || ' ' || coalesce(description, '')"
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        # External-content FTS5 table mirrored from websites by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE websites_fts USING fts5("
+            "name, url, description, content='websites', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER websites_fts_insert AFTER INSERT ON websites BEGIN "
+            "INSERT INTO websites_fts(rowid, name, url, description) "
+            "VALUES (new.id, new.name, new.url, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER websites_fts_delete AFTER DELETE ON websites BEGIN "
+            "INSERT INTO websites_fts(websites_fts, rowid, name, url, description) "
+            "VALUES ('delete', old.id, old.name, old.url, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER websites_fts_update AFTER UPDATE ON websites BEGIN "
+            "INSERT INTO websites_fts(websites_fts, rowid, name, url, description) "
+            "VALUES ('delete', old.id, old.name, old.url, old.description); "
+            "INSERT INTO websites_fts(rowid, name, url, description) "
+            "VALUES (new.id, new.name, new.url, new.description); END"
+        )
+        op.execute("INSERT INTO websites_fts(websites_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        op.execute(f"CREATE INDEX ix_websites_search ON websites USING gin (to_tsvector('simple', {DOCUMENT}))")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("websites_fts_insert", "websites_fts_delete", "websites_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS websites_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_websites_search")
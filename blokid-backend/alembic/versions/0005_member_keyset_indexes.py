@@ -0,0 +1,39 @@
+"""Keyset pagination indexes for organization and website members
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Member listings filter on the parent and seek on (created_at, id); the leading
+    # parent column also serves the lookups the plain FK indexes answered
+    op.create_index(
+        "ix_organization_members_organization_id_created_at_id",
+        "organization_members", ["organization_id", "created_at", "id"]
+    )
+    op.drop_index("ix_organization_members_organization_id", table_name="organization_members")
+    op.create_index(
+        "ix_website_members_website_id_created_at_id",
+        "website_members", ["website_id", "created_at", "id"]
+    )
+    op.drop_index("ix_website_members_website_id", table_name="website_members")
+
+
+def downgrade() -> None:
+    op.create_index("ix_website_members_website_id", "website_members", ["website_id"])
+    op.drop_index("ix_website_members_website_id_created_at_id", table_name="website_members")
+    op.create_index("ix_organization_members_organization_id", "organization_members", ["organization_id"])
+    op.drop_index("ix_organization_members_organization_id_created_at_id", table_name="organization_members")
@@ -0,0 +1,26 @@
+"""Index on users.updated_at for token revocation sync
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every worker periodically reads the users whose token_version was bumped recently
+    op.create_index("ix_users_updated_at", "users", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_updated_at", table_name="users")
@@ -0,0 +1,33 @@
+"""Split URLs into words in the Postgres search index, as FTS5 does
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DOCUMENT = "coalesce(name, '') || ' ' || coalesce(url, '') || ' ' || coalesce(description, '')"
+WORDS = f"regexp_replace({DOCUMENT}, '[^[:alnum:]]+', ' ', 'g')"
+
+
+def upgrade() -> None:
+    # SQLite's FTS5 table already splits on every non-alphanumeric character
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_websites_search")
+        op.execute(f"CREATE INDEX ix_websites_search ON websites USING gin (to_tsvector('simple', {WORDS}))")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_websites_search")
+        op.execute(f"CREATE INDEX ix_websites_search ON websites USING gin (to_tsvector('simple', {DOCUMENT}))")
@@ -0,0 +1,26 @@
+import argparse
+from app.database import Base, get_engine
+from app.models import user, organization, website  # noqa: F401  (register tables)
+
+def create_schema() -> None:
+    """Create any missing tables on the configured database"""
+    Base.metadata.create_all(bind=get_engine())
+
+def drop_schema() -> None:
+    """Drop every table on the configured database"""
+    Base.metadata.drop_all(bind=get_engine())
+
+COMMANDS = {
+    "create-schema": create_schema,
+    "drop-schema": drop_schema,
+}
+
+def main(argv=None) -> None:
+    """Entry point for `python -m app.cli <command>`"""
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+    COMMANDS[args.command]()
+
+if __name__ == "__main__":
+    main()
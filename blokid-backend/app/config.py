@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -5,11 +6,76 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = False
+    DB_USE_NULL_POOL: bool = False
+    
+    # Raise on relationship lazy loads in request sessions (catches N+1s)
+    STRICT_RELATIONSHIP_LOADING: bool = False
+    
+    # Re-validate trusted list responses against their schemas (tests, debugging)
+    VALIDATE_TRUSTED_RESPONSES: bool = False
+    
+    # Read replicas (comma-separated URLs) for read-only routes
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_EJECT_SECONDS: float = 30
+    # Reads go to the primary this long after a write; clients must return the
+    # last_write cookie set on writes, as browsers and cookie-jar clients do
+    READ_YOUR_WRITES_SECONDS: float = 5
+    
+    # Worker threads for sync routes (anyio's default is 40)
+    THREADPOOL_TOKENS: int = 40
+    
     # JWT
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     
+    # Embed user id, active flag, token version and roles in access tokens
+    TOKEN_EMBED_PRINCIPAL: bool = False
+    # Other workers reject a revoked embedded-claims token within this many seconds
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5
+    
+    # Auth caches
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    
+    # Pagination
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+    
+    # Bulk endpoints
+    MAX_BULK_ITEMS: int = 5000
+    
+    # Streaming exports fetch and encode this many rows at a time
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Streaming imports commit this many rows per transaction
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_REJECTIONS: int = 1000
+    # Longer NDJSON lines or CSV records are rejected without being buffered
+    IMPORT_MAX_RECORD_BYTES: int = 65536
+    
+    # Permission snapshots
+    PERMISSION_CACHE_SIZE: int = 10000
+    PERMISSION_CACHE_TTL_SECONDS: int = 60
+    WEBSITE_ORGANIZATION_CACHE_SIZE: int = 100000
+    
+    # Organization and website bodies; writes evict, the TTL bounds replica lag
+    RESPONSE_CACHE_SIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    
+    # Password hashing pool
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    
     # Email (Gmail SMTP Example)
     SMTP_SERVER: Optional[str] = None
     SMTP_PORT: Optional[int] = None
@@ -21,4 +87,21 @@ class Settings(BaseSettings):
         env_prefix = ""
         case_sensitive = False
 
-settings = Settings()
\ No newline at end of file
+@lru_cache
+def get_settings() -> Settings:
+    """Read settings from the environment on first use"""
+    return Settings()
+
+class LazySettings:
+    """Proxy to get_settings() so importing a module does not read the environment"""
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name):
+        delattr(get_settings(), name)
+
+settings = LazySettings()
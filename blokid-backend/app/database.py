@@ -1,42 +1,138 @@
-# from sqlalchemy import create_engine
-# from sqlalchemy.ext.declarative import declarative_base
-# from sqlalchemy.orm import sessionmaker
-# from sqlalchemy.pool import NullPool
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.utils.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 
-# from app.config import settings
+def engine_options(url: str) -> dict:
+    """Pool settings from Settings, limited to what the URL's pool accepts"""
+    if settings.DB_USE_NULL_POOL:
+        # For external poolers such as PgBouncer
+        return {"poolclass": NullPool}
+    
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and (
+        parsed.database in (None, "", ":memory:") or parsed.get_driver_name() == "aiosqlite"
+    ):
+        # In-memory SQLite and aiosqlite do not use a queue pool
+        return options
+    
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+    )
+    return options
 
-# # Use NullPool for PostgreSQL 17 to avoid connection pooling issues
-# SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+def create_db_engine(url: str):
+    """Create a sync engine with the configured, instrumented pool"""
+    options = engine_options(url)
+    if "pool_size" in options:
+        options["poolclass"] = InstrumentedQueuePool
+    return create_engine(url, **options)
 
-# engine = create_engine(
-#     SQLALCHEMY_DATABASE_URL,
-#     poolclass=NullPool  # Use NullPool for better connection handling
-# )
-# SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engine = None
+_session_factory = None
 
-# Base = declarative_base()
+def get_engine():
+    """Create the primary engine on first use rather than at import"""
+    global _engine, _session_factory
+    if _engine is None:
+        _engine = create_db_engine(settings.DATABASE_URL)
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    return _engine
 
-# def get_db():
-#     db = SessionLocal()
-#     try:
-#         yield db
-#     finally:
-#         db.close()
+def get_session_factory() -> sessionmaker:
+    """Session factory bound to the primary engine"""
+    get_engine()
+    return _session_factory
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from app.config import settings
+def __getattr__(name):
+    # Keep `from app.database import engine, SessionLocal` working, lazily
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Async drivers for each sync dialect we deploy on
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto its async driver"""
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.get_backend_name()]).render_as_string(
+        hide_password=False
+    )
+
+def create_async_db_engine(url: str):
+    """create_db_engine() for async URLs"""
+    options = engine_options(url)
+    if "pool_size" in options:
+        options["poolclass"] = InstrumentedAsyncAdaptedQueuePool
+    return create_async_engine(url, **options)
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_async_engine = None
+_async_session_factory = None
+
+def get_async_engine():
+    """Create the async engine on first use so the driver stays optional"""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(to_async_url(settings.DATABASE_URL))
+        _async_session_factory = async_sessionmaker(
+            _async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
 
 Base = declarative_base()
 
+def enable_strict_loading(db: Session, enabled: bool = True) -> Session:
+    """Make relationship lazy loads on this session raise instead of querying"""
+    db.info["strict_loading"] = enabled
+    return db
+
+@event.listens_for(Session, "do_orm_execute")
+def _forbid_lazy_loads(orm_execute_state: ORMExecuteState):
+    # Routes load what their response needs up front (see app.utils.loading)
+    # selectinload and subqueryload run relationship loads too; only lazy ones
+    # come from an attribute access, and those carry the state they load from
+    if not orm_execute_state.is_relationship_load or not orm_execute_state.session.info.get("strict_loading"):
+        return
+    state = orm_execute_state.lazy_loaded_from
+    if state is not None:
+        owner = state.class_.__name__
+        raise exc.InvalidRequestError(
+            f"Lazy load of a relationship on {owner} in strict loading mode; "
+            "add the eager-loading option for this response shape"
+        )
+
 def get_db():
     """Database dependency"""
-    db = SessionLocal()
+    db = enable_strict_loading(get_session_factory()(), settings.STRICT_RELATIONSHIP_LOADING)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Async session factory bound to the primary engine"""
+    get_async_engine()
+    return _async_session_factory
+
+async def get_async_db():
+    """Async database dependency for routes that never block the event loop"""
+    async with get_async_session_factory()() as db:
+        enable_strict_loading(db.sync_session, settings.STRICT_RELATIONSHIP_LOADING)
+        yield db
@@ -1,37 +1,85 @@
+from anyio import to_thread
+from typing import Type
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import auth, organizations, websites
-from app.database import engine
-from app.models import user, organization, website
+from app.config import settings
+from app.database import get_async_engine, get_engine
+from app.utils.pool_metrics import pool_status
+from app.utils.replicas import WriteTrackingMiddleware, get_replica_set
+from app.utils.response_cache import response_cache
+from app.utils.responses import NegotiatedResponse, NegotiationMiddleware
+from app.utils import security
 
-user.Base.metadata.create_all(bind=engine)
-organization.Base.metadata.create_all(bind=engine)
-website.Base.metadata.create_all(bind=engine)
+def create_app(response_class: Type[Response] = NegotiatedResponse) -> FastAPI:
+    """Build the application; the database is only touched on first request"""
+    app = FastAPI(title="BlokID Backend", version="1.0.0", default_response_class=response_class)
+    
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with specific origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],
+    )
+    
+    # Successful writes pin the user's reads to the primary for a short window
+    app.add_middleware(WriteTrackingMiddleware)
+    
+    # Outermost, so the negotiated format is visible to every route
+    app.add_middleware(NegotiationMiddleware)
+    
+    @app.on_event("startup")
+    async def configure_threadpool():
+        # Sync routes share this pool; size it for the expected concurrency
+        to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_TOKENS
+    
+    @app.on_event("shutdown")
+    def shutdown_password_hasher():
+        # Only a pool that was started needs stopping
+        if security._password_hasher is not None:
+            security._password_hasher.shutdown()
+    
+    @app.get("/")
+    async def root():
+        return {"message": "Welcome to BlokID Backend"}
+    
+    # Include routers
+    app.include_router(auth.router)
+    app.include_router(organizations.router, prefix="/api")
+    app.include_router(websites.router)
+    
+    @app.get("/health")
+    def health_check():
+        return {"status": "healthy"}
+    
+    @app.get("/health/db-pool")
+    def db_pool_status():
+        """Connection pool occupancy and checkout wait times for this worker"""
+        status = {
+            "primary": pool_status(get_engine()),
+            "primary_async": pool_status(get_async_engine()),
+        }
+        replica_set = get_replica_set()
+        if replica_set is not None:
+            status["replicas"] = [
+                {**pool_status(replica_engine), **health}
+                for replica_engine, health in zip(replica_set.engines, replica_set.status())
+            ]
+            # Async replica engines are built by the first async read
+            for replica, async_engine in zip(status["replicas"], replica_set.async_engines or []):
+                replica["async"] = pool_status(async_engine)
+        return status
+    
+    @app.get("/health/response-cache")
+    def response_cache_status():
+        """Organization and website body cache occupancy and counters for this worker"""
+        return response_cache.stats()
+    
+    return app
 
-app = FastAPI(title="BlokID Backend", version="1.0.0")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-@app.get("/")
-async def root():
-    return {"message": "Welcome to BlokID Backend"}
-
-# Include routers
-app.include_router(auth.router)
-app.include_router(organizations.router, prefix="/api")
-app.include_router(websites.router)
-
-@app.get("/")
-def root():
-    return {"message": "Organization Website Management API"}
-
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+# Schema changes are applied with `python -m app.cli create-schema`, not at import
+app = create_app()
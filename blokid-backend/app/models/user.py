@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.common import utcnow
 import enum
 from app.models.organization import Organization
 from datetime import datetime, timezone
@@ -20,13 +21,16 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean)
     is_verified = Column(Boolean)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True))
-    updated_at = Column(DateTime(timezone=True))
+    # Indexed for the periodic read of recent token_version bumps
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow, index=True)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.is_active = kwargs.get('is_active', True)
         self.is_verified = kwargs.get('is_verified', False)
+        self.token_version = kwargs.get('token_version', 0)
         self.created_at = kwargs.get('created_at', datetime.now(timezone.utc))
         self.updated_at = kwargs.get('updated_at', None)
     
@@ -42,7 +46,14 @@ class OrganizationMember(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
     role = Column(Enum(UserRole), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    
+    # Permission lookups filter on user_id, then organization_id; member pages
+    # seek on (created_at, id) within one organization
+    __table_args__ = (
+        Index("ix_organization_members_user_id_organization_id", "user_id", "organization_id", unique=True),
+        Index("ix_organization_members_organization_id_created_at_id", "organization_id", "created_at", "id"),
+    )
     
     # Relationships
     user = relationship("User", back_populates="organization_memberships")
@@ -55,7 +66,14 @@ class WebsiteMember(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     website_id = Column(Integer, ForeignKey("websites.id"), nullable=False)
     role = Column(Enum(UserRole), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    
+    # Permission lookups filter on user_id, then website_id; member pages
+    # seek on (created_at, id) within one website
+    __table_args__ = (
+        Index("ix_website_members_user_id_website_id", "user_id", "website_id", unique=True),
+        Index("ix_website_members_website_id_created_at_id", "website_id", "created_at", "id"),
+    )
     
     # Relationships
     user = relationship("User", back_populates="website_memberships")
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.common import utcnow
 from app.models.organization import Organization
 
 class Website(Base):
@@ -12,9 +13,59 @@ class Website(Base):
     url = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set in Python so keyset cursors compare like with like on every backend
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    # Sub-second precision keeps ETags distinct across edits made in quick succession
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+    
+    # Serves organization lookups and keyset pages of an organization's websites
+    __table_args__ = (
+        Index("ix_websites_organization_id_created_at_id", "organization_id", "created_at", "id"),
+    )
     
     # Relationships
     organization = relationship("Organization", back_populates="websites")
-    members = relationship("WebsiteMember", back_populates="website")
\ No newline at end of file
+    # Services delete memberships in bulk first, so deletes need not load them
+    members = relationship("WebsiteMember", back_populates="website", passive_deletes=True)
+
+# Full-text index over name, url and description, kept outside the mapped metadata
+# because each backend builds it differently (alembic revisions 0004 and 0007 do the same).
+# Postgres' parser keeps hosts, paths and emails whole where FTS5 splits them into words,
+# so every run of non-alphanumerics becomes a space first and both index the same words
+SEARCH_DOCUMENT = (
+    "regexp_replace(coalesce(name, '') || ' ' || coalesce(url, '') || ' ' || coalesce(description, ''), "
+    "'[^[:alnum:]]+', ' ', 'g')"
+)
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS websites_fts USING fts5("
+    "name, url, description, content='websites', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS websites_fts_insert AFTER INSERT ON websites BEGIN "
+    "INSERT INTO websites_fts(rowid, name, url, description) "
+    "VALUES (new.id, new.name, new.url, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS websites_fts_delete AFTER DELETE ON websites BEGIN "
+    "INSERT INTO websites_fts(websites_fts, rowid, name, url, description) "
+    "VALUES ('delete', old.id, old.name, old.url, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS websites_fts_update AFTER UPDATE ON websites BEGIN "
+    "INSERT INTO websites_fts(websites_fts, rowid, name, url, description) "
+    "VALUES ('delete', old.id, old.name, old.url, old.description); "
+    "INSERT INTO websites_fts(rowid, name, url, description) "
+    "VALUES (new.id, new.name, new.url, new.description); END",
+]
+
+POSTGRESQL_SEARCH_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_websites_search ON websites "
+    f"USING gin (to_tsvector('simple', {SEARCH_DOCUMENT}))",
+]
+
+def is_search_object(name: str) -> bool:
+    """Whether a reflected table or index belongs to the search index, for autogenerate"""
+    return name.startswith("websites_fts") or name == "ix_websites_search"
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Website.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Website.__table__, "before_drop", DDL("DROP TABLE IF EXISTS websites_fts").execute_if(dialect="sqlite")
+)
+for statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(Website.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -1,69 +1,142 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Annotated, List, Optional
 from app.database import get_db
-from app.schemas.organization import Organization, OrganizationCreate, OrganizationUpdate, OrganizationInvite, OrganizationInviteResponse
-from app.schemas.user import User
-from app.services.organization_service import OrganizationService
-from app.utils.dependencies import get_current_active_user, require_organization_admin, require_organization_access
+from app.models.organization import Organization as OrganizationModel
+from app.models.user import OrganizationMember, User as UserModel
+from app.schemas.bulk import InviteResult
+from app.schemas.organization import Organization, OrganizationCreate, OrganizationSummary, OrganizationUpdate, OrganizationInvite, OrganizationInviteResponse
+from app.schemas.user import Member, User
+from app.services.organization_service import AsyncOrganizationService, OrganizationService
+from app.services.permission_service import AsyncPermissionService, PermissionService, user_organizations_statement
+from app.utils.dependencies import (
+    async_organization_permission,
+    get_async_permission_service,
+    get_current_active_user,
+    get_current_active_user_async,
+    get_permission_service,
+    organization_permission
+)
+from app.utils.etags import collection_etag, conditional_response, conditional_response_async, version_of, versioned_etag
+from app.utils.export import ExportFormat, export_format, stream_export
+from app.utils.limits import bulk_limit, page_items_limit
+from app.utils.pagination import PageParams, page_params, paginate_async, set_next_cursor
+from app.utils.replicas import get_async_cache_fill_db, get_async_read_db, get_read_db, reads_own_writes
+from app.utils.response_cache import CachedBody, read_through
+from app.utils.responses import NegotiatedResponse
+from app.utils.serialization import dump_trusted, trusted_response
 from app.models.user import UserRole
 
+can_read_organization = organization_permission("read")
+can_read_organization_async = async_organization_permission("read")
+can_update_organization = organization_permission("update")
+can_manage_organization = organization_permission("manage", "Organization admin access required")
+
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
+def _cached_body(organization: OrganizationModel) -> CachedBody:
+    return CachedBody(
+        resource=("Organization", organization.id),
+        body=dump_trusted(Organization, [organization])[0],
+        versions=(version_of(organization), version_of(organization.owner)),
+        organization_id=organization.id,
+        owner_id=organization.owner_id
+    )
+
 @router.post("/", response_model=Organization, status_code=status.HTTP_201_CREATED)
 def create_organization(
     org_create: OrganizationCreate,
     current_user: User = Depends(get_current_active_user),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
     """Create a new organization"""
-    org_service = OrganizationService(db)
+    org_service = OrganizationService(db, permission_service)
     return org_service.create_organization(org_create, current_user)
 
 @router.get("/", response_model=List[Organization])
-def get_user_organizations(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def get_user_organizations(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get organizations for current user; follow X-Next-Cursor for further pages"""
+    org_service = AsyncOrganizationService(db, AsyncPermissionService(db))
+    # Each organization embeds its owner, so owner edits must move the validator too
+    etag = await collection_etag(
+        db, user_organizations_statement(current_user).join(OrganizationModel.owner),
+        OrganizationModel, "Organization", page, joined=(UserModel,)
+    )
+    
+    async def build():
+        return trusted_response(Organization, await org_service.get_user_organizations(current_user, page))
+    
+    return await conditional_response_async(request, etag, build)
+
+@router.get("/summary", response_model=List[OrganizationSummary])
+async def get_organization_summaries(
+    response: Response,
+    organization_ids: Annotated[Optional[List[int]], Query(
+        alias="organization_id",
+        description="Organizations to summarize; omit for a page of all readable ones"
+    ), page_items_limit] = None,
+    page: PageParams = Depends(page_params),
+    current_user: User = Depends(get_current_active_user_async),
+    permission_service: AsyncPermissionService = Depends(get_async_permission_service),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get all organizations for current user"""
-    org_service = OrganizationService(db)
-    return org_service.get_user_organizations(current_user)
+    """Website count, member count per role and last change for each organization"""
+    org_service = AsyncOrganizationService(db, permission_service)
+    summaries = await org_service.get_organization_summaries(current_user, organization_ids, page)
+    set_next_cursor(response, summaries)
+    return summaries
 
 @router.get("/{organization_id}", response_model=Organization)
-def get_organization(
+async def get_organization(
     organization_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: User = Depends(can_read_organization_async),
+    permission_service: AsyncPermissionService = Depends(get_async_permission_service),
+    db: AsyncSession = Depends(get_async_cache_fill_db)
 ):
-    # Manually check organization access
-    require_organization_access(organization_id)(current_user, db)
-    """Get specific organization"""
-    org_service = OrganizationService(db)
-    return org_service.get_organization(organization_id, current_user)
+    """Get specific organization; If-None-Match with its ETag answers 304"""
+    org_service = AsyncOrganizationService(db, permission_service)
+    
+    async def load() -> CachedBody:
+        return _cached_body(await org_service.get_organization(organization_id, current_user))
+    
+    cached = await read_through(
+        "Organization", organization_id,
+        await permission_service.organization_scope(current_user, organization_id), load,
+        use_cached=not reads_own_writes(db)
+    )
+    etag = versioned_etag("Organization", cached.versions)
+    return conditional_response(request, etag, lambda: NegotiatedResponse(cached.body))
 
 @router.put("/{organization_id}", response_model=Organization)
 def update_organization(
     organization_id: int,
     org_update: OrganizationUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(can_update_organization),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
-    # Manually check organization access
-    require_organization_access(organization_id)(current_user, db)
     """Update organization"""
-    org_service = OrganizationService(db)
+    org_service = OrganizationService(db, permission_service)
     return org_service.update_organization(organization_id, org_update, current_user)
 
 @router.delete("/{organization_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_organization(
     organization_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(can_manage_organization),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
-    # Manually check organization admin access
-    require_organization_admin(organization_id)(current_user, db)
     """Delete organization"""
-    org_service = OrganizationService(db)
+    org_service = OrganizationService(db, permission_service)
     org_service.delete_organization(organization_id, current_user)
     return None
 
@@ -71,13 +144,12 @@ def delete_organization(
 def invite_user_to_organization(
     organization_id: int,
     invite_data: OrganizationInvite,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(can_manage_organization),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
-    # Manually check organization admin access
-    require_organization_admin(organization_id)(current_user, db)
     """Invite user to organization"""
-    org_service = OrganizationService(db)
+    org_service = OrganizationService(db, permission_service)
     membership = org_service.invite_user_to_organization(
         organization_id, 
         invite_data.email, 
@@ -86,17 +158,65 @@ def invite_user_to_organization(
     )
     return {"message": "User invited successfully", "membership_id": membership.id}
 
-@router.get("/{organization_id}/members")
-def get_organization_members(
+@router.post("/{organization_id}/invite/batch", response_model=List[InviteResult])
+def invite_users_to_organization(
     organization_id: int,
-    current_user: User = Depends(get_current_active_user),
+    invites: Annotated[List[OrganizationInvite], Body(), bulk_limit],
+    current_user: User = Depends(can_manage_organization),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
-    # Manually check organization access
-    require_organization_access(organization_id)(current_user, db)
-    """Get organization members"""
-    from app.models.user import OrganizationMember
-    members = db.query(OrganizationMember).filter(
+    """Invite users to organization; each email reports its own status"""
+    org_service = OrganizationService(db, permission_service)
+    return org_service.invite_users_to_organization(organization_id, invites, current_user)
+
+@router.get("/{organization_id}/members", response_model=List[Member])
+async def get_organization_members(
+    organization_id: int,
+    request: Request,
+    role: Optional[UserRole] = Query(None, description="Only members with this role"),
+    page: PageParams = Depends(page_params),
+    current_user: User = Depends(can_read_organization_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get organization members with their account details; follow X-Next-Cursor for further pages"""
+    statement = select(
+        OrganizationMember.id,
+        OrganizationMember.user_id,
+        UserModel.email,
+        UserModel.is_active,
+        UserModel.is_verified,
+        OrganizationMember.role,
+        OrganizationMember.created_at
+    ).join(
+        UserModel, UserModel.id == OrganizationMember.user_id
+    ).where(
+        OrganizationMember.organization_id == organization_id
+    )
+    if role is not None:
+        statement = statement.where(OrganizationMember.role == role)
+    etag = await collection_etag(db, statement, OrganizationMember, "Member", page, joined=(UserModel,))
+    
+    async def build():
+        return trusted_response(
+            Member, await paginate_async(db, statement, OrganizationMember.created_at, OrganizationMember.id, page)
+        )
+    
+    return await conditional_response_async(request, etag, build)
+
+@router.get("/{organization_id}/members/export")
+def export_organization_members(
+    organization_id: int,
+    format: ExportFormat = Depends(export_format),
+    current_user: User = Depends(can_read_organization),
+    db: Session = Depends(get_read_db)
+):
+    """Stream every organization member as NDJSON or CSV"""
+    statement = select(
+        OrganizationMember.user_id,
+        OrganizationMember.role,
+        OrganizationMember.created_at.label("joined_at")
+    ).where(
         OrganizationMember.organization_id == organization_id
-    ).all()
-    return [{"user_id": m.user_id, "role": m.role, "joined_at": m.created_at} for m in members]
\ No newline at end of file
+    ).order_by(OrganizationMember.created_at, OrganizationMember.id)
+    return stream_export(db, statement, format, f"organization-{organization_id}-members")
@@ -1,29 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database import get_db
-from app.models.user import User
+from app.database import get_async_db
+from app.models.user import User as UserModel
 from app.schemas.user import User, UserCreate, UserUpdate
-from app.services.auth_service import AuthService
+from app.utils.auth_cache import invalidate_user
+from app.utils.response_cache import evict_owner
+from app.utils.pagination import PageParams, keyset, page_from_rows, page_params, set_next_cursor
+from app.utils.principal import bump_token_versions
+from app.utils.unit_of_work import unit_of_work
 
 router = APIRouter()
 
 @router.get("/", response_model=List[User])
 async def get_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    users = db.query(User).offset(skip).limit(limit).all()
+    result = await db.execute(keyset(select(UserModel), UserModel.created_at, UserModel.id, page))
+    users = page_from_rows(result.scalars().all(), page)
+    set_next_cursor(response, users)
     return users
 
 @router.get("/{user_id}", response_model=User)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(UserModel, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -35,19 +42,32 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    auth_service = AuthService(db)
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(UserModel, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    for field, value in user_update.model_dump(exclude_unset=True).items():
-        setattr(user, field, value)
+    previous_email = user.email
+    changes = user_update.model_dump(exclude_unset=True)
     
-    db.commit()
-    db.refresh(user)
+    def apply_changes(session):
+        # The unit of work raises token version floors only after the commit
+        uow = unit_of_work(session)
+        with uow.begin():
+            for field, value in changes.items():
+                setattr(user, field, value)
+            # Deactivation or a new email invalidates tokens carrying the old principal
+            if changes.get("is_active") is False or user.email != previous_email:
+                bump_token_versions(session, [user.id])
+    
+    await db.run_sync(apply_changes)
+    await db.refresh(user)
+    
+    # Cached tokens, principals and bodies embedding the user must not outlive the change
+    invalidate_user(previous_email, user.email)
+    evict_owner(user.id)
     return user
@@ -1,73 +1,179 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Annotated, List, Optional
 from app.database import get_db
-from app.schemas.website import Website, WebsiteCreate, WebsiteUpdate, WebsiteInvite
-from app.schemas.user import User
-from app.services.website_service import WebsiteService
+from app.models.organization import Organization as OrganizationModel
+from app.models.user import User as UserModel, UserRole, WebsiteMember
+from app.models.website import Website as WebsiteModel
+from app.schemas.bulk import BulkItemResult, ImportProgress, InviteResult
+from app.schemas.website import Website, WebsiteBulkUpdate, WebsiteCreate, WebsiteUpdate, WebsiteInvite
+from app.schemas.user import Member, User
+from app.services.website_service import AsyncWebsiteService, WebsiteService, organization_websites_statement
+from app.services.permission_service import AsyncPermissionService, PermissionService, user_websites_statement
+from app.utils.common import generate_uuid
 from app.utils.dependencies import (
-    get_current_active_user, 
-    require_website_admin, 
-    require_website_access,
-    require_organization_access
+    async_organization_permission,
+    async_website_permission,
+    get_async_permission_service,
+    get_current_active_user,
+    get_current_active_user_async,
+    get_permission_service,
+    organization_permission,
+    website_permission
 )
+from app.utils.etags import collection_etag, conditional_response, conditional_response_async, version_of, versioned_etag
+from app.utils.export import ExportFormat, export_format, stream_export
+from app.utils.imports import import_progress, read_records
+from app.utils.limits import bulk_limit
+from app.utils.pagination import PageParams, page_params, paginate_async
+from app.utils.replicas import get_async_cache_fill_db, get_async_read_db, get_read_db, reads_own_writes
+from app.utils.response_cache import CachedBody, read_through
+from app.utils.responses import NegotiatedResponse
+from app.utils.serialization import dump_trusted, trusted_response
 
 router = APIRouter(prefix="/websites", tags=["websites"])
 
+async def _websites_etag(db: AsyncSession, statement: Select, page: PageParams) -> str:
+    """Collection ETag that also moves when an embedded organization or owner changes"""
+    return await collection_etag(
+        db, statement.join(WebsiteModel.organization).join(OrganizationModel.owner),
+        WebsiteModel, "Website", page, joined=(OrganizationModel, UserModel)
+    )
+
+def _cached_body(website: WebsiteModel) -> CachedBody:
+    organization = website.organization
+    return CachedBody(
+        resource=("Website", website.id),
+        body=dump_trusted(Website, [website])[0],
+        versions=(version_of(website), version_of(organization), version_of(organization.owner)),
+        organization_id=organization.id,
+        owner_id=organization.owner_id
+    )
+
+can_read_website = website_permission("read")
+can_update_website = website_permission("update")
+can_manage_website = website_permission("manage", "Website admin access required")
+can_read_organization = organization_permission("read")
+can_read_website_async = async_website_permission("read")
+can_read_organization_async = async_organization_permission("read")
+
 @router.post("/", response_model=Website, status_code=status.HTTP_201_CREATED)
 def create_website(
     website_create: WebsiteCreate,
     current_user: User = Depends(get_current_active_user),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
     """Create a new website"""
-    website_service = WebsiteService(db)
+    website_service = WebsiteService(db, permission_service)
     return website_service.create_website(website_create, current_user)
 
-@router.get("/", response_model=List[Website])
-def get_user_websites(
+# Bulk routes are declared before /{website_id} so "bulk" is never parsed as an id
+
+@router.post("/bulk", response_model=List[BulkItemResult])
+def bulk_create_websites(
+    websites: Annotated[List[WebsiteCreate], Body(), bulk_limit],
     current_user: User = Depends(get_current_active_user),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
-    """Get all websites for current user"""
-    website_service = WebsiteService(db)
-    return website_service.get_user_websites(current_user)
+    """Create websites in one transaction; each entry reports its own status"""
+    website_service = WebsiteService(db, permission_service)
+    return website_service.bulk_create_websites(websites, current_user)
 
-@router.get("/{website_id}", response_model=Website)
-def get_website(
-    website_id: int,
+@router.put("/bulk", response_model=List[BulkItemResult])
+def bulk_update_websites(
+    websites: Annotated[List[WebsiteBulkUpdate], Body(), bulk_limit],
+    current_user: User = Depends(get_current_active_user),
+    permission_service: PermissionService = Depends(get_permission_service),
+    db: Session = Depends(get_db)
+):
+    """Update websites in one transaction; each entry reports its own status"""
+    website_service = WebsiteService(db, permission_service)
+    return website_service.bulk_update_websites(websites, current_user)
+
+@router.post("/bulk/delete", response_model=List[BulkItemResult])
+def bulk_delete_websites(
+    website_ids: Annotated[List[int], Body(), bulk_limit],
     current_user: User = Depends(get_current_active_user),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
-    """Get specific website"""
-    # Check access
-    require_website_access(website_id)(current_user=current_user, db=db)
-    website_service = WebsiteService(db)
-    return website_service.get_website(website_id, current_user)
+    """Delete websites in one transaction; each entry reports its own status"""
+    website_service = WebsiteService(db, permission_service)
+    return website_service.bulk_delete_websites(website_ids, current_user)
+
+@router.get("/", response_model=List[Website])
+async def get_user_websites(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get websites for current user; follow X-Next-Cursor for further pages"""
+    website_service = AsyncWebsiteService(db, AsyncPermissionService(db))
+    etag = await _websites_etag(db, user_websites_statement(current_user), page)
+    
+    async def build():
+        return trusted_response(Website, await website_service.get_user_websites(current_user, page))
+    
+    return await conditional_response_async(request, etag, build)
+
+@router.get("/search", response_model=List[Website])
+async def search_websites(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match by prefix"),
+    page: PageParams = Depends(page_params),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Search the current user's websites by name, url and description"""
+    website_service = AsyncWebsiteService(db, AsyncPermissionService(db))
+    return trusted_response(Website, await website_service.search_websites(current_user, q, page))
+
+@router.get("/{website_id}", response_model=Website)
+async def get_website(
+    website_id: int,
+    request: Request,
+    current_user: User = Depends(can_read_website_async),
+    permission_service: AsyncPermissionService = Depends(get_async_permission_service),
+    db: AsyncSession = Depends(get_async_cache_fill_db)
+):
+    """Get specific website; If-None-Match with its ETag answers 304"""
+    website_service = AsyncWebsiteService(db, permission_service)
+    
+    async def load() -> CachedBody:
+        return _cached_body(await website_service.get_website(website_id, current_user))
+    
+    cached = await read_through(
+        "Website", website_id, await permission_service.website_scope(current_user, website_id), load,
+        use_cached=not reads_own_writes(db)
+    )
+    etag = versioned_etag("Website", cached.versions)
+    return conditional_response(request, etag, lambda: NegotiatedResponse(cached.body))
 
 @router.put("/{website_id}", response_model=Website)
 def update_website(
     website_id: int,
     website_update: WebsiteUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(can_update_website),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
     """Update website"""
-    # Check access
-    require_website_access(website_id)(current_user=current_user, db=db)
-    website_service = WebsiteService(db)
+    website_service = WebsiteService(db, permission_service)
     return website_service.update_website(website_id, website_update, current_user)
 
 @router.delete("/{website_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_website(
     website_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(can_manage_website),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
     """Delete website"""
-    # Check admin access
-    require_website_admin(website_id)(current_user=current_user, db=db)
-    website_service = WebsiteService(db)
+    website_service = WebsiteService(db, permission_service)
     website_service.delete_website(website_id, current_user)
     return None
 
@@ -75,44 +181,152 @@ def delete_website(
 def invite_user_to_website(
     website_id: int,
     invite_data: WebsiteInvite,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(can_manage_website),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
     """Invite user to website"""
-    # Check admin access
-    require_website_admin(website_id)(current_user=current_user, db=db)
-    website_service = WebsiteService(db)
+    website_service = WebsiteService(db, permission_service)
     membership = website_service.invite_user_to_website(
         website_id=website_id,
-        email=invite_data.email,
+        user_email=invite_data.email,
         role=invite_data.role,
-        current_user=current_user
+        inviter=current_user
     )
     return {"message": "User invited successfully", "membership_id": membership.id}
 
-@router.get("/{website_id}/members")
-def get_website_members(
+@router.post("/{website_id}/invite/batch", response_model=List[InviteResult])
+def invite_users_to_website(
     website_id: int,
-    current_user: User = Depends(get_current_active_user),
+    invites: Annotated[List[WebsiteInvite], Body(), bulk_limit],
+    current_user: User = Depends(can_manage_website),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
-    """Get website members"""
-    # Check access
-    require_website_access(website_id)(current_user=current_user, db=db)
-    from app.models.user import WebsiteMember
-    members = db.query(WebsiteMember).filter(
+    """Invite users to website; each email reports its own status"""
+    website_service = WebsiteService(db, permission_service)
+    return website_service.invite_users_to_website(website_id, invites, current_user)
+
+@router.get("/{website_id}/members/export")
+def export_website_members(
+    website_id: int,
+    format: ExportFormat = Depends(export_format),
+    current_user: User = Depends(can_read_website),
+    db: Session = Depends(get_read_db)
+):
+    """Stream every website member as NDJSON or CSV"""
+    statement = select(
+        WebsiteMember.user_id,
+        WebsiteMember.role,
+        WebsiteMember.created_at.label("joined_at")
+    ).where(
+        WebsiteMember.website_id == website_id
+    ).order_by(WebsiteMember.created_at, WebsiteMember.id)
+    return stream_export(db, statement, format, f"website-{website_id}-members")
+
+@router.get("/{website_id}/members", response_model=List[Member])
+async def get_website_members(
+    website_id: int,
+    request: Request,
+    role: Optional[UserRole] = Query(None, description="Only members with this role"),
+    page: PageParams = Depends(page_params),
+    current_user: User = Depends(can_read_website_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get website members with their account details; follow X-Next-Cursor for further pages"""
+    statement = select(
+        WebsiteMember.id,
+        WebsiteMember.user_id,
+        UserModel.email,
+        UserModel.is_active,
+        UserModel.is_verified,
+        WebsiteMember.role,
+        WebsiteMember.created_at
+    ).join(
+        UserModel, UserModel.id == WebsiteMember.user_id
+    ).where(
         WebsiteMember.website_id == website_id
-    ).all()
-    return [{"user_id": m.user_id, "role": m.role, "joined_at": m.created_at} for m in members]
+    )
+    if role is not None:
+        statement = statement.where(WebsiteMember.role == role)
+    etag = await collection_etag(db, statement, WebsiteMember, "Member", page, joined=(UserModel,))
+    
+    async def build():
+        return trusted_response(
+            Member, await paginate_async(db, statement, WebsiteMember.created_at, WebsiteMember.id, page)
+        )
+    
+    return await conditional_response_async(request, etag, build)
 
 @router.get("/organizations/{organization_id}/websites", response_model=List[Website])
-def get_organization_websites(
+async def get_organization_websites(
+    organization_id: int,
+    request: Request,
+    page: PageParams = Depends(page_params),
+    current_user: User = Depends(can_read_organization_async),
+    permission_service: AsyncPermissionService = Depends(get_async_permission_service),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get websites in an organization; follow X-Next-Cursor for further pages"""
+    website_service = AsyncWebsiteService(db, permission_service)
+    etag = await _websites_etag(db, organization_websites_statement(organization_id), page)
+    
+    async def build():
+        return trusted_response(
+            Website, await website_service.get_organization_websites(organization_id, current_user, page)
+        )
+    
+    return await conditional_response_async(request, etag, build)
+
+@router.get("/organizations/{organization_id}/websites/export")
+def export_organization_websites(
     organization_id: int,
+    format: ExportFormat = Depends(export_format),
+    current_user: User = Depends(can_read_organization),
+    db: Session = Depends(get_read_db)
+):
+    """Stream every website in an organization as NDJSON or CSV"""
+    statement = select(
+        WebsiteModel.id,
+        WebsiteModel.name,
+        WebsiteModel.url,
+        WebsiteModel.description,
+        WebsiteModel.organization_id,
+        WebsiteModel.created_at,
+        WebsiteModel.updated_at
+    ).where(
+        WebsiteModel.organization_id == organization_id
+    ).order_by(WebsiteModel.created_at, WebsiteModel.id)
+    return stream_export(db, statement, format, f"organization-{organization_id}-websites")
+
+@router.post("/organizations/{organization_id}/websites/import", response_model=ImportProgress)
+async def import_organization_websites(
+    organization_id: int,
+    request: Request,
+    format: ExportFormat = Depends(export_format),
+    import_id: Optional[str] = Query(None, description="Client-chosen id to poll progress with"),
     current_user: User = Depends(get_current_active_user),
+    permission_service: PermissionService = Depends(get_permission_service),
     db: Session = Depends(get_db)
 ):
-    """Get all websites in an organization"""
-    # Check organization access
-    require_organization_access(organization_id)(current_user=current_user, db=db)
-    website_service = WebsiteService(db)
-    return website_service.get_organization_websites(organization_id, current_user)
+    """Import websites from a streamed NDJSON or CSV body into an organization"""
+    website_service = WebsiteService(db, permission_service)
+    progress = ImportProgress(import_id=import_id or generate_uuid())
+    import_progress.set((current_user.id, progress.import_id), progress)
+    return await website_service.import_websites(
+        organization_id, read_records(request.stream(), format), current_user, progress
+    )
+
+@router.get("/imports/{import_id}", response_model=ImportProgress)
+def get_import_progress(
+    import_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Progress of one of the current user's imports, including a running one"""
+    progress = import_progress.get((current_user.id, import_id))
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import not found"
+        )
+    return progress
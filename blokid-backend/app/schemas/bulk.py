@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class BulkItemResult(BaseModel):
+    """Outcome of one entry of a bulk request, by its position in the request"""
+    index: int
+    status: int
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class InviteResult(BulkItemResult):
+    """Outcome of one invite of a batch; id is the new membership's"""
+    email: str
+
+class ImportRejection(BaseModel):
+    """A line of an import that was not inserted"""
+    line: int
+    detail: str
+
+class ImportProgress(BaseModel):
+    """Running totals of an import; rejections lists at most the first few"""
+    import_id: str
+    processed: int = 0
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+    done: bool = False
+    rejections: List[ImportRejection] = []
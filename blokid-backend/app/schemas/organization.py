@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from app.schemas.user import User
 from enum import Enum
@@ -32,6 +32,15 @@ class Organization(OrganizationInDB):
 class OrganizationWithMembers(Organization):
     members: Optional[List['OrganizationMember']] = None
 
+class OrganizationSummary(BaseModel):
+    """Dashboard aggregates for one organization"""
+    organization_id: int
+    website_count: int
+    # UserRole value -> members holding it
+    member_counts: Dict[str, int]
+    # Latest change to the organization or any of its websites
+    last_updated_at: datetime
+
 class OrganizationInviteStatus(str, Enum):
     PENDING = "pending"
     ACCEPTED = "accepted"
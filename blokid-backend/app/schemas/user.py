@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 from app.models.user import UserRole
@@ -52,6 +52,19 @@ class OrganizationMember(OrganizationMemberBase):
     class Config:
         from_attributes = True
 
+class Member(BaseModel):
+    """Membership as listed by the members endpoints, with the member's account"""
+    user_id: int
+    email: EmailStr
+    is_active: bool
+    is_verified: bool
+    role: UserRole
+    joined_at: datetime = Field(validation_alias="created_at")
+    
+    class Config:
+        from_attributes = True
+        populate_by_name = True
+
 class WebsiteMemberBase(BaseModel):
     user_id: int
     website_id: int
@@ -54,6 +54,9 @@ class WebsiteUpdate(BaseModel):
     url: Optional[str] = None
     description: Optional[str] = None
 
+class WebsiteBulkUpdate(WebsiteUpdate):
+    id: int
+
 class WebsiteInvite(BaseModel):
     email: str  
     role: UserRole
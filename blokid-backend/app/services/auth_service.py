@@ -1,67 +1,89 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from datetime import timedelta
-from app.models.user import User, OrganizationMember, UserRole
-from app.models.organization import Organization
+from typing import Optional
+from app.models.user import User, OrganizationMember, WebsiteMember
+from app.schemas.organization import OrganizationCreate
 from app.schemas.user import UserCreate
-from app.utils.security import get_password_hash, verify_password, create_access_token
+from app.services.organization_service import OrganizationService
+from app.utils.security import (
+    get_password_hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+    create_access_token
+)
+from app.utils.principal import build_principal_claims
+from app.utils.unit_of_work import unit_of_work
 from app.config import settings
 
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
     
-    def register_user(self, user_create: UserCreate) -> User:
+    def register_user(self, user_create: UserCreate, hashed_password: Optional[str] = None) -> User:
         """Register a new user and create their organization"""
-        # Check if user already exists
-        existing_user = self.db.query(User).filter(User.email == user_create.email).first()
-        if existing_user:
+        self._check_email_available(user_create.email)
+        
+        # User, organization and membership are written in one transaction
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_create.password)
+        with unit_of_work(self.db).begin():
+            db_user = User(
+                email=user_create.email,
+                hashed_password=hashed_password
+            )
+            self.db.add(db_user)
+            self.db.flush()
+            
+            # Create organization for the user, with them as admin
+            OrganizationService(self.db).create_organization(
+                OrganizationCreate(
+                    name=f"{user_create.email}'s Organization",
+                    description="Default organization"
+                ),
+                db_user
+            )
+        
+        return db_user
+    
+    async def register_user_async(self, user_create: UserCreate) -> User:
+        """Register a user, hashing the password on the hashing pool"""
+        # Duplicates are rejected before they spend a bcrypt round on the pool
+        await run_in_threadpool(self._check_email_available, user_create.email)
+        hashed_password = await get_password_hash_async(user_create.password)
+        return await run_in_threadpool(self.register_user, user_create, hashed_password)
+    
+    def _check_email_available(self, email: str) -> None:
+        if self.get_user_by_email(email) is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-        
-        # Create new user
-        hashed_password = get_password_hash(user_create.password)
-        db_user = User(
-            email=user_create.email,
-            hashed_password=hashed_password
-        )
-        self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
-        
-        # Create organization for the user
-        organization = Organization(
-            name=f"{user_create.email}'s Organization",
-            description="Default organization",
-            owner_id=db_user.id
-        )
-        self.db.add(organization)
-        self.db.commit()
-        self.db.refresh(organization)
-        
-        # Add user as organization admin
-        org_membership = OrganizationMember(
-            user_id=db_user.id,
-            organization_id=organization.id,
-            role=UserRole.ORGANIZATION_ADMIN
-        )
-        self.db.add(org_membership)
-        self.db.commit()
-        
-        return db_user
+    
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """Get a user by email"""
+        return self.db.query(User).filter(User.email == email).first()
     
     def authenticate_user(self, email: str, password: str) -> User:
         """Authenticate a user with email and password"""
-        user = self.db.query(User).filter(User.email == email).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password"
-            )
-        
-        if not verify_password(password, user.hashed_password):
+        user = self.get_user_by_email(email)
+        return self._check_credentials(
+            user, user is not None and verify_password(password, user.hashed_password)
+        )
+    
+    async def authenticate_user_async(self, email: str, password: str) -> User:
+        """Authenticate a user, verifying the password on the hashing pool"""
+        user = await run_in_threadpool(self.get_user_by_email, email)
+        password_valid = user is not None and await verify_password_async(
+            password, user.hashed_password
+        )
+        return self._check_credentials(user, password_valid)
+    
+    def _check_credentials(self, user: Optional[User], password_valid: bool) -> User:
+        """Raise for unknown users, wrong passwords and inactive accounts"""
+        if not user or not password_valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -78,7 +100,14 @@ class AuthService:
     def create_user_token(self, user: User) -> str:
         """Create access token for user"""
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        data = {"sub": user.email}
+        if settings.TOKEN_EMBED_PRINCIPAL:
+            data.update(build_principal_claims(
+                user,
+                self.db.query(OrganizationMember).filter(OrganizationMember.user_id == user.id).all(),
+                self.db.query(WebsiteMember).filter(WebsiteMember.user_id == user.id).all()
+            ))
         access_token = create_access_token(
-            data={"sub": user.email}, expires_delta=access_token_expires
+            data=data, expires_delta=access_token_expires
         )
         return access_token
\ No newline at end of file
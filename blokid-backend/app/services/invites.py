@@ -0,0 +1,28 @@
+from fastapi import status
+from app.schemas.bulk import InviteResult
+from typing import Dict, List, Set, Tuple
+
+def plan_invites(
+    invites: list,
+    user_ids: Dict[str, int],
+    members: Set[int],
+    target: str
+) -> Tuple[List[InviteResult], List[int]]:
+    """Per-email results and the indexes of invites that need a new membership"""
+    results = []
+    accepted = []
+    invited = set()
+    for index, invite in enumerate(invites):
+        user_id = user_ids.get(invite.email)
+        result = InviteResult(index=index, email=invite.email, status=status.HTTP_200_OK)
+        if user_id is None:
+            result.status = status.HTTP_404_NOT_FOUND
+            result.detail = "User not found"
+        elif user_id in members or user_id in invited:
+            result.status = status.HTTP_400_BAD_REQUEST
+            result.detail = f"User is already a member of {target}"
+        else:
+            invited.add(user_id)
+            accepted.append(index)
+        results.append(result)
+    return results, accepted
@@ -1,37 +1,122 @@
+from sqlalchemy import Select, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.organization import Organization
 from app.models.user import User, OrganizationMember, UserRole
-from app.schemas.organization import OrganizationCreate, OrganizationUpdate
-from app.services.permission_service import PermissionService
-from typing import List
+from app.models.website import Website
+from app.schemas.bulk import InviteResult
+from app.schemas.organization import OrganizationCreate, OrganizationInvite, OrganizationSummary, OrganizationUpdate
+from app.services.invites import plan_invites
+from app.services.permission_service import (
+    ORGANIZATION_READ_ROLES,
+    AsyncPermissionService,
+    PermissionService,
+    user_organizations_statement
+)
+from app.utils.loading import ORGANIZATION_RESPONSE_OPTIONS
+from app.utils.pagination import Page, PageParams, paginate_async
+from app.utils.principal import bump_token_versions
+from app.utils.response_cache import evict_organization
+from app.utils.unit_of_work import unit_of_work
+from typing import List, Optional
+
+def _organization_statement(organization_id: int) -> Select:
+    """An organization with everything its response serializes"""
+    return select(Organization).options(*ORGANIZATION_RESPONSE_OPTIONS).where(Organization.id == organization_id)
+
+def _summary_forbidden() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Not authorized to access this organization"
+    )
+
+def _summary_organizations_statement(user: User, organization_ids: Optional[List[int]]) -> Select:
+    statement = user_organizations_statement(user).with_only_columns(
+        Organization.id,
+        Organization.created_at,
+        func.coalesce(Organization.updated_at, Organization.created_at).label("changed_at")
+    )
+    if organization_ids is not None:
+        statement = statement.where(Organization.id.in_(organization_ids))
+    return statement
+
+# Counted per organization by the database, so cost tracks the page, not tenant size
+def _website_totals_statement(ids: List[int]) -> Select:
+    return select(
+        Website.organization_id,
+        func.count(Website.id).label("count"),
+        func.max(func.coalesce(Website.updated_at, Website.created_at)).label("changed_at")
+    ).where(
+        Website.organization_id.in_(ids)
+    ).group_by(Website.organization_id)
+
+def _member_totals_statement(ids: List[int]) -> Select:
+    return select(
+        OrganizationMember.organization_id,
+        OrganizationMember.role,
+        func.count(OrganizationMember.id)
+    ).where(
+        OrganizationMember.organization_id.in_(ids)
+    ).group_by(OrganizationMember.organization_id, OrganizationMember.role)
+
+def _build_summaries(organizations: Page, website_rows, member_rows) -> Page:
+    """One OrganizationSummary per organization row from the grouped totals"""
+    websites = {row.organization_id: row for row in website_rows}
+    member_counts = {
+        row.id: {role.value: 0 for role in ORGANIZATION_READ_ROLES}
+        for row in organizations
+    }
+    for organization_id, role, count in member_rows:
+        member_counts[organization_id][role.value] = count
+    
+    summaries = []
+    for row in organizations:
+        website = websites.get(row.id)
+        changed_at = row.changed_at
+        if website is not None and website.changed_at is not None:
+            changed_at = max(changed_at, website.changed_at)
+        summaries.append(OrganizationSummary(
+            organization_id=row.id,
+            website_count=website.count if website is not None else 0,
+            member_counts=member_counts[row.id],
+            last_updated_at=changed_at
+        ))
+    return Page(summaries, organizations.next_cursor)
 
 class OrganizationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, permission_service: Optional[PermissionService] = None):
         self.db = db
-        self.permission_service = PermissionService(db)
+        # Routes pass the request's PermissionService so guard decisions are reused
+        self.permission_service = permission_service or PermissionService(db)
     
     def create_organization(self, org_create: OrganizationCreate, user: User) -> Organization:
         """Create a new organization"""
-        organization = Organization(
-            name=org_create.name,
-            description=org_create.description,
-            owner_id=user.id
-        )
-        self.db.add(organization)
-        self.db.commit()
-        self.db.refresh(organization)
-        
-        # Add user as organization admin
-        membership = OrganizationMember(
-            user_id=user.id,
-            organization_id=organization.id,
-            role=UserRole.ORGANIZATION_ADMIN
-        )
-        self.db.add(membership)
-        self.db.commit()
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            organization = Organization(
+                name=org_create.name,
+                description=org_create.description,
+                owner_id=user.id
+            )
+            self.db.add(organization)
+            self.db.flush()
+            organization_id = organization.id
+            
+            # Add user as organization admin
+            membership = OrganizationMember(
+                user_id=user.id,
+                organization_id=organization.id,
+                role=UserRole.ORGANIZATION_ADMIN
+            )
+            self.db.add(membership)
+            uow.after_commit(lambda: self.permission_service.invalidate(user.id))
         
-        return organization
+        return self._load_organization(organization_id)
+    
+    def _load_organization(self, organization_id: int) -> Optional[Organization]:
+        """Load an organization with everything its response serializes"""
+        return self.db.scalars(_organization_statement(organization_id)).first()
     
     def get_organization(self, organization_id: int, user: User) -> Organization:
         """Get an organization by ID"""
@@ -41,9 +126,7 @@ class OrganizationService:
                 detail="Not authorized to access this organization"
             )
         
-        organization = self.db.query(Organization).filter(
-            Organization.id == organization_id
-        ).first()
+        organization = self._load_organization(organization_id)
         
         if not organization:
             raise HTTPException(
@@ -53,9 +136,9 @@ class OrganizationService:
         
         return organization
     
-    def get_user_organizations(self, user: User) -> List[Organization]:
-        """Get all organizations for a user"""
-        return self.permission_service.get_user_organizations(user)
+    def get_user_organizations(self, user: User, page: Optional[PageParams] = None) -> Page:
+        """Get organizations for a user, optionally one keyset page at a time"""
+        return self.permission_service.get_user_organizations(user, page, db=self.db)
     
     def update_organization(
         self, 
@@ -82,13 +165,13 @@ class OrganizationService:
         
         # Update fields
         update_data = org_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(organization, field, value)
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            for field, value in update_data.items():
+                setattr(organization, field, value)
+            uow.after_commit(lambda: evict_organization(organization_id))
         
-        self.db.commit()
-        self.db.refresh(organization)
-        
-        return organization
+        return self._load_organization(organization_id)
     
     def delete_organization(self, organization_id: int, user: User) -> bool:
         """Delete an organization"""
@@ -108,14 +191,22 @@ class OrganizationService:
                 detail="Organization not found"
             )
         
-        # Delete associated memberships first
-        self.db.query(OrganizationMember).filter(
-            OrganizationMember.organization_id == organization_id
-        ).delete()
-        
-        # Delete organization
-        self.db.delete(organization)
-        self.db.commit()
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            # Delete associated memberships first, revoking tokens that embed them
+            members = self.db.query(OrganizationMember.user_id).filter(
+                OrganizationMember.organization_id == organization_id
+            ).all()
+            member_ids = [m.user_id for m in members]
+            bump_token_versions(self.db, member_ids)
+            self.db.query(OrganizationMember).filter(
+                OrganizationMember.organization_id == organization_id
+            ).delete()
+            
+            # Delete organization
+            self.db.delete(organization)
+            uow.after_commit(lambda: self.permission_service.invalidate(*member_ids))
+            uow.after_commit(lambda: evict_organization(organization_id))
         
         return True
     
@@ -154,13 +245,110 @@ class OrganizationService:
             )
         
         # Create membership
-        membership = OrganizationMember(
-            user_id=user_to_invite.id,
-            organization_id=organization_id,
-            role=role
-        )
-        self.db.add(membership)
-        self.db.commit()
-        self.db.refresh(membership)
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            membership = OrganizationMember(
+                user_id=user_to_invite.id,
+                organization_id=organization_id,
+                role=role
+            )
+            self.db.add(membership)
+            uow.after_commit(lambda: self.permission_service.invalidate(user_to_invite.id))
+            uow.after_commit(lambda: evict_organization(organization_id))
+        
+        return membership
+    
+    def invite_users_to_organization(
+        self,
+        organization_id: int,
+        invites: List[OrganizationInvite],
+        inviter: User
+    ) -> List[InviteResult]:
+        """Invite many users to an organization, reporting each email's outcome"""
+        if not self.permission_service.can_manage_organization(inviter, organization_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to invite users to this organization"
+            )
+        
+        # One query resolves every email, one more finds existing memberships
+        user_ids = dict(self.db.query(User.email, User.id).filter(
+            User.email.in_({invite.email for invite in invites})
+        ).all())
+        members = {row.user_id for row in self.db.query(OrganizationMember.user_id).filter(
+            OrganizationMember.organization_id == organization_id,
+            OrganizationMember.user_id.in_(user_ids.values())
+        )}
         
-        return membership
\ No newline at end of file
+        results, accepted = plan_invites(invites, user_ids, members, "this organization")
+        if not accepted:
+            return results
+        
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            membership_ids = self.db.scalars(
+                insert(OrganizationMember).returning(OrganizationMember.id, sort_by_parameter_order=True),
+                [
+                    {"user_id": user_ids[results[index].email], "organization_id": organization_id, "role": invites[index].role}
+                    for index in accepted
+                ]
+            ).all()
+            invitee_ids = [user_ids[results[index].email] for index in accepted]
+            uow.after_commit(lambda: self.permission_service.invalidate(*invitee_ids))
+            uow.after_commit(lambda: evict_organization(organization_id))
+        
+        for index, membership_id in zip(accepted, membership_ids):
+            results[index].status = status.HTTP_201_CREATED
+            results[index].id = membership_id
+        return results
+
+class AsyncOrganizationService:
+    """Organization read paths on an AsyncSession"""
+    
+    def __init__(self, db: AsyncSession, permission_service: AsyncPermissionService):
+        self.db = db
+        self.permission_service = permission_service
+    
+    async def get_organization(self, organization_id: int, user: User) -> Organization:
+        """Get an organization by ID"""
+        if not await self.permission_service.can_read_organization(user, organization_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this organization"
+            )
+        
+        organization = (await self.db.scalars(_organization_statement(organization_id))).first()
+        if not organization:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Organization not found"
+            )
+        
+        return organization
+    
+    async def get_user_organizations(self, user: User, page: Optional[PageParams] = None) -> Page:
+        """Get organizations for a user, optionally one keyset page at a time"""
+        return await self.permission_service.get_user_organizations(user, page)
+    
+    async def get_organization_summaries(
+        self,
+        user: User,
+        organization_ids: Optional[List[int]] = None,
+        page: Optional[PageParams] = None
+    ) -> Page:
+        """Website and member counts for the given organizations, or a page of all the user's"""
+        if organization_ids is not None:
+            for organization_id in organization_ids:
+                if not await self.permission_service.can_read_organization(user, organization_id):
+                    raise _summary_forbidden()
+            page = None
+        organizations = await paginate_async(
+            self.db, _summary_organizations_statement(user, organization_ids),
+            Organization.created_at, Organization.id, page
+        )
+        ids = [row.id for row in organizations]
+        return _build_summaries(
+            organizations,
+            (await self.db.execute(_website_totals_statement(ids))).all(),
+            (await self.db.execute(_member_totals_statement(ids))).all()
+        )
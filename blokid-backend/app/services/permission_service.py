@@ -1,162 +1,375 @@
+from sqlalchemy import Select, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from dataclasses import dataclass, field
+from functools import wraps
+from app.config import settings
 from app.models.user import User, OrganizationMember, WebsiteMember, UserRole
 from app.models.organization import Organization
 from app.models.website import Website
-from typing import List
+from app.utils.cache import TTLCache
+from app.utils.loading import ORGANIZATION_RESPONSE_OPTIONS, WEBSITE_RESPONSE_OPTIONS
+from app.utils.pagination import Page, PageParams, paginate, paginate_async
+from app.utils.principal import Principal
+from typing import Dict, Optional
+
+ORGANIZATION_READ_ROLES = (UserRole.ORGANIZATION_ADMIN, UserRole.ORGANIZATION_USER)
+WEBSITE_READ_ROLES = (UserRole.WEBSITE_ADMIN, UserRole.WEBSITE_USER)
+
+@dataclass(frozen=True)
+class PermissionSnapshot:
+    """Effective roles of one user"""
+    organization_roles: Dict[int, UserRole] = field(default_factory=dict)
+    website_roles: Dict[int, UserRole] = field(default_factory=dict)
+
+# user id -> PermissionSnapshot
+snapshot_cache = TTLCache(
+    maxsize=lambda: settings.PERMISSION_CACHE_SIZE,
+    ttl=lambda: settings.PERMISSION_CACHE_TTL_SECONDS
+)
+
+# website id -> organization id; websites never move between organizations
+website_organization_cache = TTLCache(
+    maxsize=lambda: settings.WEBSITE_ORGANIZATION_CACHE_SIZE,
+    ttl=3600
+)
+
+def invalidate_permissions(*user_ids: int) -> None:
+    """Drop cached snapshots after membership changes"""
+    for user_id in user_ids:
+        snapshot_cache.pop(user_id)
+
+def remember_website_organization(website_id: int, organization_id: int) -> None:
+    """Cache the organization of a website loaded elsewhere"""
+    website_organization_cache.set(website_id, organization_id)
+
+def forget_website(*website_ids: int) -> None:
+    """Drop the cached organization of deleted websites"""
+    for website_id in website_ids:
+        website_organization_cache.pop(website_id)
+
+def clear_permission_caches() -> None:
+    """Reset all permission caches"""
+    snapshot_cache.clear()
+    website_organization_cache.clear()
+
+def _organization_roles_statement(user_id: int) -> Select:
+    return select(OrganizationMember.organization_id, OrganizationMember.role).where(
+        OrganizationMember.user_id == user_id
+    )
+
+def _website_roles_statement(user_id: int) -> Select:
+    # Joining Website drops memberships of deleted websites
+    return select(WebsiteMember.website_id, WebsiteMember.role, Website.organization_id).join(
+        Website, Website.id == WebsiteMember.website_id
+    ).where(WebsiteMember.user_id == user_id)
+
+def _snapshot_from_rows(organization_rows, website_rows) -> PermissionSnapshot:
+    """Snapshot from the rows of the two role statements"""
+    for website_id, _, organization_id in website_rows:
+        website_organization_cache.set(website_id, organization_id)
+    return PermissionSnapshot(
+        organization_roles={org_id: role for org_id, role in organization_rows},
+        website_roles={website_id: role for website_id, role, _ in website_rows}
+    )
+
+def _website_organization_statement(website_id: int) -> Select:
+    return select(Website.organization_id).where(Website.id == website_id)
+
+def accessible_websites(user):
+    """Filter for websites the user reaches through an organization or directly"""
+    # Tested per row against the user's few memberships, rather than
+    # materializing the id of every website in those organizations
+    organization_ids = select(OrganizationMember.organization_id).where(
+        OrganizationMember.user_id == user.id
+    )
+    direct = select(WebsiteMember.website_id).where(WebsiteMember.user_id == user.id)
+    
+    return or_(Website.organization_id.in_(organization_ids), Website.id.in_(direct))
+
+def user_organizations_statement(user) -> Select:
+    """Unordered select of organizations user has access to"""
+    return select(Organization).join(
+        OrganizationMember, OrganizationMember.organization_id == Organization.id
+    ).where(
+        OrganizationMember.user_id == user.id
+    )
+
+def user_websites_statement(user) -> Select:
+    """Unordered select of websites user has access to"""
+    return select(Website).where(accessible_websites(user))
+
+def _memoized(check):
+    """Answer a check at most once per service instance, i.e. once per request"""
+    @wraps(check)
+    def wrapper(self, user, resource_id: int) -> bool:
+        key = (check.__name__, user.id, resource_id)
+        if key not in self._decisions:
+            self._decisions[key] = check(self, user, resource_id)
+        return self._decisions[key]
+    return wrapper
 
 class PermissionService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session]):
         self.db = db
+        self._snapshots: Dict[int, PermissionSnapshot] = {}
+        # website id -> organization id (None once known to be missing)
+        self._website_organizations: Dict[int, Optional[int]] = {}
+        self._decisions: Dict[tuple, bool] = {}
+    
+    def get_snapshot(self, user) -> PermissionSnapshot:
+        """Get the user's effective roles"""
+        if isinstance(user, Principal) and user.id not in self._snapshots:
+            # Token-embedded roles need no queries at all
+            self._snapshots[user.id] = PermissionSnapshot(
+                user.organization_roles, user.website_roles
+            )
+        return self._get_snapshot_by_id(user.id)
+    
+    def _get_snapshot_by_id(self, user_id: int) -> PermissionSnapshot:
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is None:
+            snapshot = snapshot_cache.get(user_id)
+            if snapshot is None:
+                snapshot = self._build_snapshot(user_id)
+                snapshot_cache.set(user_id, snapshot)
+            self._snapshots[user_id] = snapshot
+        return snapshot
+    
+    def invalidate(self, *user_ids: int) -> None:
+        """Forget snapshots of users whose memberships changed"""
+        for user_id in user_ids:
+            self._snapshots.pop(user_id, None)
+        self._decisions = {
+            key: allowed for key, allowed in self._decisions.items() if key[1] not in user_ids
+        }
+        invalidate_permissions(*user_ids)
+    
+    def _build_snapshot(self, user_id: int) -> PermissionSnapshot:
+        return _snapshot_from_rows(
+            self.db.execute(_organization_roles_statement(user_id)).all(),
+            self.db.execute(_website_roles_statement(user_id)).all()
+        )
+    
+    def _get_website_organization_id(self, website_id: int) -> Optional[int]:
+        if website_id in self._website_organizations:
+            return self._website_organizations[website_id]
+        organization_id = website_organization_cache.get(website_id)
+        if organization_id is None:
+            organization_id = self.db.execute(_website_organization_statement(website_id)).scalar()
+            if organization_id is None:
+                return None
+            website_organization_cache.set(website_id, organization_id)
+        return organization_id
+    
+    def _get_organization_role(self, user, organization_id: int) -> Optional[UserRole]:
+        return self.get_snapshot(user).organization_roles.get(organization_id)
+    
+    def organization_scope(self, user, organization_id: int) -> Optional[UserRole]:
+        """Role through which user reads an organization, for cache keys"""
+        return self._get_organization_role(user, organization_id)
+    
+    def website_scope(self, user, website_id: int) -> tuple:
+        """Direct and organization roles through which user reads a website, for cache keys"""
+        organization_id = self._get_website_organization_id(website_id)
+        return (
+            self.get_snapshot(user).website_roles.get(website_id),
+            None if organization_id is None else self._get_organization_role(user, organization_id)
+        )
     
     def get_user_organization_role(self, user_id: int, organization_id: int) -> UserRole:
         """Get user's role in an organization"""
-        membership = self.db.query(OrganizationMember).filter(
-            OrganizationMember.user_id == user_id,
-            OrganizationMember.organization_id == organization_id
-        ).first()
-        
-        if not membership:
+        role = self._get_snapshot_by_id(user_id).organization_roles.get(organization_id)
+        if role is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User is not a member of this organization"
             )
         
-        return membership.role
+        return role
     
     def get_user_website_role(self, user_id: int, website_id: int) -> UserRole:
         """Get user's role for a website"""
-        membership = self.db.query(WebsiteMember).filter(
-            WebsiteMember.user_id == user_id,
-            WebsiteMember.website_id == website_id
-        ).first()
-        
-        if not membership:
+        role = self._get_snapshot_by_id(user_id).website_roles.get(website_id)
+        if role is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User is not a member of this website"
             )
         
-        return membership.role
+        return role
     
+    @_memoized
     def can_manage_organization(self, user: User, organization_id: int) -> bool:
         """Check if user can manage (CRUD) an organization"""
-        try:
-            role = self.get_user_organization_role(user.id, organization_id)
-            return role == UserRole.ORGANIZATION_ADMIN
-        except HTTPException:
-            return False
+        return self._get_organization_role(user, organization_id) == UserRole.ORGANIZATION_ADMIN
     
+    @_memoized
     def can_read_organization(self, user: User, organization_id: int) -> bool:
         """Check if user can read an organization"""
-        try:
-            role = self.get_user_organization_role(user.id, organization_id)
-            return role in [UserRole.ORGANIZATION_ADMIN, UserRole.ORGANIZATION_USER]
-        except HTTPException:
-            return False
+        return self._get_organization_role(user, organization_id) in ORGANIZATION_READ_ROLES
     
+    @_memoized
     def can_update_organization(self, user: User, organization_id: int) -> bool:
         """Check if user can update an organization"""
-        try:
-            role = self.get_user_organization_role(user.id, organization_id)
-            return role in [UserRole.ORGANIZATION_ADMIN, UserRole.ORGANIZATION_USER]
-        except HTTPException:
-            return False
+        return self._get_organization_role(user, organization_id) in ORGANIZATION_READ_ROLES
     
+    @_memoized
     def can_manage_website(self, user: User, website_id: int) -> bool:
         """Check if user can manage (CRUD) a website"""
-        website = self.db.query(Website).filter(Website.id == website_id).first()
-        if not website:
-            return False
-        
-        # Check organization-level permissions first
-        if self.can_manage_organization(user, website.organization_id):
+        # Direct website roles only exist for websites that exist
+        if self.get_snapshot(user).website_roles.get(website_id) == UserRole.WEBSITE_ADMIN:
             return True
         
-        # Check website-level permissions
-        try:
-            role = self.get_user_website_role(user.id, website_id)
-            return role == UserRole.WEBSITE_ADMIN
-        except HTTPException:
+        # Check organization-level permissions
+        organization_id = self._get_website_organization_id(website_id)
+        if organization_id is None:
             return False
+        return self.can_manage_organization(user, organization_id)
     
+    @_memoized
     def can_read_website(self, user: User, website_id: int) -> bool:
         """Check if user can read a website"""
-        website = self.db.query(Website).filter(Website.id == website_id).first()
-        if not website:
-            return False
-        
-        # Check organization-level permissions first
-        if self.can_read_organization(user, website.organization_id):
+        if self.get_snapshot(user).website_roles.get(website_id) in WEBSITE_READ_ROLES:
             return True
         
-        # Check website-level permissions
-        try:
-            role = self.get_user_website_role(user.id, website_id)
-            return role in [UserRole.WEBSITE_ADMIN, UserRole.WEBSITE_USER]
-        except HTTPException:
+        organization_id = self._get_website_organization_id(website_id)
+        if organization_id is None:
             return False
+        return self.can_read_organization(user, organization_id)
     
+    @_memoized
     def can_update_website(self, user: User, website_id: int) -> bool:
         """Check if user can update a website"""
-        website = self.db.query(Website).filter(Website.id == website_id).first()
-        if not website:
-            return False
-        
-        # Check organization-level permissions first
-        if self.can_manage_organization(user, website.organization_id):
+        if self.get_snapshot(user).website_roles.get(website_id) in WEBSITE_READ_ROLES:
             return True
         
-        # Check website-level permissions
-        try:
-            role = self.get_user_website_role(user.id, website_id)
-            return role in [UserRole.WEBSITE_ADMIN, UserRole.WEBSITE_USER]
-        except HTTPException:
+        organization_id = self._get_website_organization_id(website_id)
+        if organization_id is None:
             return False
+        return self.can_manage_organization(user, organization_id)
     
+    @_memoized
     def can_create_website_in_organization(self, user: User, organization_id: int) -> bool:
         """Check if user can create websites in an organization"""
-        try:
-            role = self.get_user_organization_role(user.id, organization_id)
-            return role in [UserRole.ORGANIZATION_ADMIN, UserRole.ORGANIZATION_USER]
-        except HTTPException:
-            return False
+        return self._get_organization_role(user, organization_id) in ORGANIZATION_READ_ROLES
     
-    def get_user_organizations(self, user: User) -> List[Organization]:
-        """Get all organizations user has access to"""
-        memberships = self.db.query(OrganizationMember).filter(
-            OrganizationMember.user_id == user.id
-        ).all()
-        
-        organization_ids = [m.organization_id for m in memberships]
-        return self.db.query(Organization).filter(
-            Organization.id.in_(organization_ids)
-        ).all()
-    
-    def get_user_websites(self, user: User) -> List[Website]:
-        """Get all websites user has access to"""
-        # Get websites through organization membership
-        org_memberships = self.db.query(OrganizationMember).filter(
+    def get_user_organizations(
+        self,
+        user: User,
+        page: Optional[PageParams] = None,
+        db: Optional[Session] = None
+    ) -> Page:
+        """Get organizations user has access to, optionally paged and on another session"""
+        query = self.user_organizations_query(user, db).options(*ORGANIZATION_RESPONSE_OPTIONS)
+        return paginate(query, Organization.created_at, Organization.id, page)
+    
+    def user_organizations_query(self, user: User, db: Optional[Session] = None):
+        """Unordered query for organizations user has access to"""
+        return (db or self.db).query(Organization).join(
+            OrganizationMember, OrganizationMember.organization_id == Organization.id
+        ).filter(
             OrganizationMember.user_id == user.id
-        ).all()
-        
-        org_website_ids = []
-        for membership in org_memberships:
-            websites = self.db.query(Website).filter(
-                Website.organization_id == membership.organization_id
-            ).all()
-            org_website_ids.extend([w.id for w in websites])
-        
-        # Get websites through direct website membership
-        website_memberships = self.db.query(WebsiteMember).filter(
-            WebsiteMember.user_id == user.id
-        ).all()
-        
-        direct_website_ids = [m.website_id for m in website_memberships]
-        
-        # Combine and deduplicate
-        all_website_ids = list(set(org_website_ids + direct_website_ids))
-        
-        return self.db.query(Website).filter(
-            Website.id.in_(all_website_ids)
-        ).all()
\ No newline at end of file
+        )
+    
+    def accessible_websites(self, user: User):
+        """Filter for websites the user reaches through an organization or directly"""
+        return accessible_websites(user)
+    
+    def get_user_websites(
+        self,
+        user: User,
+        page: Optional[PageParams] = None,
+        db: Optional[Session] = None
+    ) -> Page:
+        """Get websites user has access to, optionally paged and on another session"""
+        query = self.user_websites_query(user, db).options(*WEBSITE_RESPONSE_OPTIONS)
+        return paginate(query, Website.created_at, Website.id, page)
+    
+    def user_websites_query(self, user: User, db: Optional[Session] = None):
+        """Unordered query for websites user has access to"""
+        return (db or self.db).query(Website).filter(self.accessible_websites(user))
+
+class AsyncPermissionService:
+    """PermissionService for AsyncSession routes; queries are awaited, decisions shared"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Decides in memory once _load has fetched everything a check reads
+        self.decisions = PermissionService(None)
+    
+    async def _load(self, user, website_id: Optional[int] = None) -> None:
+        """Fetch the user's snapshot and a website's organization ahead of a check"""
+        decisions = self.decisions
+        if user.id not in decisions._snapshots and not isinstance(user, Principal):
+            snapshot = snapshot_cache.get(user.id)
+            if snapshot is None:
+                snapshot = _snapshot_from_rows(
+                    (await self.db.execute(_organization_roles_statement(user.id))).all(),
+                    (await self.db.execute(_website_roles_statement(user.id))).all()
+                )
+                snapshot_cache.set(user.id, snapshot)
+            decisions._snapshots[user.id] = snapshot
+        if website_id is not None and website_id not in decisions._website_organizations:
+            organization_id = website_organization_cache.get(website_id)
+            if organization_id is None:
+                organization_id = (await self.db.execute(_website_organization_statement(website_id))).scalar()
+                if organization_id is not None:
+                    website_organization_cache.set(website_id, organization_id)
+            decisions._website_organizations[website_id] = organization_id
+    
+    async def organization_scope(self, user, organization_id: int) -> Optional[UserRole]:
+        """Role through which user reads an organization, for cache keys"""
+        await self._load(user)
+        return self.decisions.organization_scope(user, organization_id)
+    
+    async def website_scope(self, user, website_id: int) -> tuple:
+        """Direct and organization roles through which user reads a website, for cache keys"""
+        await self._load(user, website_id)
+        return self.decisions.website_scope(user, website_id)
+    
+    async def can_manage_organization(self, user: User, organization_id: int) -> bool:
+        """Check if user can manage (CRUD) an organization"""
+        await self._load(user)
+        return self.decisions.can_manage_organization(user, organization_id)
+    
+    async def can_read_organization(self, user: User, organization_id: int) -> bool:
+        """Check if user can read an organization"""
+        await self._load(user)
+        return self.decisions.can_read_organization(user, organization_id)
+    
+    async def can_update_organization(self, user: User, organization_id: int) -> bool:
+        """Check if user can update an organization"""
+        await self._load(user)
+        return self.decisions.can_update_organization(user, organization_id)
+    
+    async def can_manage_website(self, user: User, website_id: int) -> bool:
+        """Check if user can manage (CRUD) a website"""
+        await self._load(user, website_id)
+        return self.decisions.can_manage_website(user, website_id)
+    
+    async def can_read_website(self, user: User, website_id: int) -> bool:
+        """Check if user can read a website"""
+        await self._load(user, website_id)
+        return self.decisions.can_read_website(user, website_id)
+    
+    async def can_update_website(self, user: User, website_id: int) -> bool:
+        """Check if user can update a website"""
+        await self._load(user, website_id)
+        return self.decisions.can_update_website(user, website_id)
+    
+    async def can_create_website_in_organization(self, user: User, organization_id: int) -> bool:
+        """Check if user can create websites in an organization"""
+        await self._load(user)
+        return self.decisions.can_create_website_in_organization(user, organization_id)
+    
+    async def get_user_organizations(self, user: User, page: Optional[PageParams] = None) -> Page:
+        """Get organizations user has access to, optionally one keyset page at a time"""
+        statement = user_organizations_statement(user).options(*ORGANIZATION_RESPONSE_OPTIONS)
+        return await paginate_async(self.db, statement, Organization.created_at, Organization.id, page)
+    
+    async def get_user_websites(self, user: User, page: Optional[PageParams] = None) -> Page:
+        """Get websites user has access to, optionally one keyset page at a time"""
+        statement = user_websites_statement(user).options(*WEBSITE_RESPONSE_OPTIONS)
+        return await paginate_async(self.db, statement, Website.created_at, Website.id, page)
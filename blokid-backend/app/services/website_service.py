@@ -1,15 +1,52 @@
+from sqlalchemy import Select, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from app.config import settings
 from app.models.website import Website
 from app.models.user import User, WebsiteMember, UserRole
-from app.schemas.website import WebsiteCreate, WebsiteUpdate
-from app.services.permission_service import PermissionService
-from typing import List
+from app.schemas.bulk import BulkItemResult, ImportProgress, ImportRejection, InviteResult
+from app.schemas.website import WebsiteBulkUpdate, WebsiteCreate, WebsiteInvite, WebsiteUpdate
+from app.services.invites import plan_invites
+from app.services.permission_service import (
+    AsyncPermissionService,
+    PermissionService,
+    forget_website,
+    remember_website_organization,
+    user_websites_statement
+)
+from app.utils.loading import WEBSITE_RESPONSE_OPTIONS
+from app.utils.pagination import Page, PageParams, paginate, paginate_async
+from app.utils.principal import bump_token_versions
+from app.utils.response_cache import evict_website
+from app.utils.search import search_terms, website_search_condition
+from app.utils.common import utcnow
+from app.utils.unit_of_work import unit_of_work
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+def _website_statement(website_id: int) -> Select:
+    """A website with everything its response serializes"""
+    return select(Website).options(*WEBSITE_RESPONSE_OPTIONS).where(Website.id == website_id)
+
+def organization_websites_statement(organization_id: int) -> Select:
+    """Unordered select of websites in an organization"""
+    return select(Website).where(Website.organization_id == organization_id)
+
+def _null_violations(changes: dict) -> Optional[str]:
+    """Detail naming fields an update would set to NULL in a NOT NULL column"""
+    columns = Website.__table__.columns
+    fields = [field for field, value in changes.items() if value is None and not columns[field].nullable]
+    if not fields:
+        return None
+    return f"{', '.join(fields)} cannot be null"
 
 class WebsiteService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, permission_service: Optional[PermissionService] = None):
         self.db = db
-        self.permission_service = PermissionService(db)
+        # Routes pass the request's PermissionService so guard decisions are reused
+        self.permission_service = permission_service or PermissionService(db)
     
     def create_website(self, website_create: WebsiteCreate, user: User) -> Website:
         """Create a new website"""
@@ -21,27 +58,33 @@ class WebsiteService:
                 detail="Not authorized to create websites in this organization"
             )
         
-        website = Website(
-            name=website_create.name,
-            description=website_create.description,
-            url=website_create.url,
-            organization_id=website_create.organization_id
-        )
-        self.db.add(website)
-        self.db.commit()
-        self.db.refresh(website)
-        
-        # Add creator as website admin if they're not org admin
-        if not self.permission_service.can_manage_organization(user, website_create.organization_id):
-            membership = WebsiteMember(
-                user_id=user.id,
-                website_id=website.id,
-                role=UserRole.WEBSITE_ADMIN
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            website = Website(
+                name=website_create.name,
+                description=website_create.description,
+                url=website_create.url,
+                organization_id=website_create.organization_id
             )
-            self.db.add(membership)
-            self.db.commit()
+            self.db.add(website)
+            self.db.flush()
+            website_id = website.id
+            
+            # Add creator as website admin if they're not org admin
+            if not self.permission_service.can_manage_organization(user, website_create.organization_id):
+                membership = WebsiteMember(
+                    user_id=user.id,
+                    website_id=website.id,
+                    role=UserRole.WEBSITE_ADMIN
+                )
+                self.db.add(membership)
+                uow.after_commit(lambda: self.permission_service.invalidate(user.id))
         
-        return website
+        return self._load_website(website_id)
+    
+    def _load_website(self, website_id: int) -> Optional[Website]:
+        """Load a website with everything its response serializes"""
+        return self.db.scalars(_website_statement(website_id)).first()
     
     def get_website(self, website_id: int, user: User) -> Website:
         """Get a website by ID"""
@@ -51,7 +94,7 @@ class WebsiteService:
                 detail="Not authorized to access this website"
             )
         
-        website = self.db.query(Website).filter(Website.id == website_id).first()
+        website = self._load_website(website_id)
         if not website:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -60,21 +103,29 @@ class WebsiteService:
         
         return website
     
-    def get_organization_websites(self, organization_id: int, user: User) -> List[Website]:
-        """Get all websites in an organization"""
+    def get_organization_websites(
+        self,
+        organization_id: int,
+        user: User,
+        page: Optional[PageParams] = None
+    ) -> Page:
+        """Get websites in an organization, optionally one keyset page at a time"""
         if not self.permission_service.can_read_organization(user, organization_id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to access this organization"
             )
         
-        return self.db.query(Website).filter(
-            Website.organization_id == organization_id
-        ).all()
+        query = self.organization_websites_query(organization_id).options(*WEBSITE_RESPONSE_OPTIONS)
+        return paginate(query, Website.created_at, Website.id, page)
     
-    def get_user_websites(self, user: User) -> List[Website]:
-        """Get all websites for a user"""
-        return self.permission_service.get_user_websites(user)
+    def organization_websites_query(self, organization_id: int):
+        """Unordered query for websites in an organization"""
+        return self.db.query(Website).filter(Website.organization_id == organization_id)
+    
+    def get_user_websites(self, user: User, page: Optional[PageParams] = None) -> Page:
+        """Get websites for a user, optionally one keyset page at a time"""
+        return self.permission_service.get_user_websites(user, page, db=self.db)
     
     def update_website(
         self, 
@@ -98,13 +149,19 @@ class WebsiteService:
         
         # Update fields
         update_data = website_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(website, field, value)
-        
-        self.db.commit()
-        self.db.refresh(website)
+        violations = _null_violations(update_data)
+        if violations:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=violations
+            )
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            for field, value in update_data.items():
+                setattr(website, field, value)
+            uow.after_commit(lambda: evict_website(website_id))
         
-        return website
+        return self._load_website(website_id)
     
     def delete_website(self, website_id: int, user: User) -> bool:
         """Delete a website"""
@@ -121,14 +178,23 @@ class WebsiteService:
                 detail="Website not found"
             )
         
-        # Delete associated memberships first
-        self.db.query(WebsiteMember).filter(
-            WebsiteMember.website_id == website_id
-        ).delete()
-        
-        # Delete website
-        self.db.delete(website)
-        self.db.commit()
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            # Delete associated memberships first, revoking tokens that embed them
+            members = self.db.query(WebsiteMember.user_id).filter(
+                WebsiteMember.website_id == website_id
+            ).all()
+            member_ids = [m.user_id for m in members]
+            bump_token_versions(self.db, member_ids)
+            self.db.query(WebsiteMember).filter(
+                WebsiteMember.website_id == website_id
+            ).delete()
+            
+            # Delete website
+            self.db.delete(website)
+            uow.after_commit(lambda: self.permission_service.invalidate(*member_ids))
+            uow.after_commit(lambda: forget_website(website_id))
+            uow.after_commit(lambda: evict_website(website_id))
         
         return True
     
@@ -167,13 +233,324 @@ class WebsiteService:
             )
         
         # Create membership
-        membership = WebsiteMember(
-            user_id=user_to_invite.id,
-            website_id=website_id,
-            role=role
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            membership = WebsiteMember(
+                user_id=user_to_invite.id,
+                website_id=website_id,
+                role=role
+            )
+            self.db.add(membership)
+            uow.after_commit(lambda: self.permission_service.invalidate(user_to_invite.id))
+            uow.after_commit(lambda: evict_website(website_id))
+        
+        return membership
+    
+    def bulk_create_websites(self, items: List[WebsiteCreate], user: User) -> List[BulkItemResult]:
+        """Create many websites in one transaction, reporting each entry's outcome"""
+        # One permission decision per distinct organization, not per entry
+        allowed = {
+            organization_id: self.permission_service.can_create_website_in_organization(user, organization_id)
+            for organization_id in {item.organization_id for item in items}
+        }
+        results: List[Optional[BulkItemResult]] = [None] * len(items)
+        accepted = []
+        for index, item in enumerate(items):
+            if allowed[item.organization_id]:
+                accepted.append(index)
+            else:
+                results[index] = BulkItemResult(
+                    index=index,
+                    status=status.HTTP_403_FORBIDDEN,
+                    detail="Not authorized to create websites in this organization"
+                )
+        if not accepted:
+            return results
+        
+        unmanaged = {
+            organization_id for organization_id, can_create in allowed.items()
+            if can_create and not self.permission_service.can_manage_organization(user, organization_id)
+        }
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            website_ids = self.db.scalars(
+                insert(Website).returning(Website.id, sort_by_parameter_order=True),
+                [items[index].model_dump() for index in accepted]
+            ).all()
+            
+            # Add creator as website admin where they're not org admin
+            memberships = [
+                {"user_id": user.id, "website_id": website_id, "role": UserRole.WEBSITE_ADMIN}
+                for index, website_id in zip(accepted, website_ids)
+                if items[index].organization_id in unmanaged
+            ]
+            if memberships:
+                self.db.execute(insert(WebsiteMember), memberships)
+                uow.after_commit(lambda: self.permission_service.invalidate(user.id))
+        
+        for index, website_id in zip(accepted, website_ids):
+            results[index] = BulkItemResult(index=index, status=status.HTTP_201_CREATED, id=website_id)
+        return results
+    
+    def _website_organizations(self, website_ids) -> Dict[int, int]:
+        """Organization of each existing website among website_ids, in one query"""
+        rows = self.db.query(Website.id, Website.organization_id).filter(
+            Website.id.in_(set(website_ids))
+        ).all()
+        for website_id, organization_id in rows:
+            remember_website_organization(website_id, organization_id)
+        return dict(rows)
+    
+    def _authorize_each(self, website_ids: List[int], check: Callable, detail: str) -> List[BulkItemResult]:
+        """Per-entry 404/403 results, with 200 for entries that may proceed"""
+        organizations = self._website_organizations(website_ids)
+        results = []
+        for index, website_id in enumerate(website_ids):
+            if website_id not in organizations:
+                results.append(BulkItemResult(
+                    index=index, status=status.HTTP_404_NOT_FOUND, id=website_id, detail="Website not found"
+                ))
+            elif not check(website_id):
+                results.append(BulkItemResult(
+                    index=index, status=status.HTTP_403_FORBIDDEN, id=website_id, detail=detail
+                ))
+            else:
+                results.append(BulkItemResult(index=index, status=status.HTTP_200_OK, id=website_id))
+        return results
+    
+    def bulk_update_websites(self, items: List[WebsiteBulkUpdate], user: User) -> List[BulkItemResult]:
+        """Update many websites in one transaction, reporting each entry's outcome"""
+        results = self._authorize_each(
+            [item.id for item in items],
+            lambda website_id: self.permission_service.can_update_website(user, website_id),
+            "Not authorized to update this website"
+        )
+        now = utcnow()
+        rows = []
+        for item, result in zip(items, results):
+            if result.status != status.HTTP_200_OK:
+                continue
+            changes = item.model_dump(exclude_unset=True, exclude={"id"})
+            # An explicit null for a NOT NULL column would fail the whole batch
+            violations = _null_violations(changes)
+            if violations:
+                result.status = status.HTTP_422_UNPROCESSABLE_ENTITY
+                result.detail = violations
+                continue
+            rows.append({**changes, "id": item.id, "updated_at": now})
+        if not rows:
+            return results
+        
+        website_ids = {row["id"] for row in rows}
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            # Bulk UPDATE by primary key, grouped into executemany batches
+            self.db.execute(update(Website), rows)
+            uow.after_commit(lambda: evict_website(*website_ids))
+        
+        return results
+    
+    def bulk_delete_websites(self, website_ids: List[int], user: User) -> List[BulkItemResult]:
+        """Delete many websites in one transaction, reporting each entry's outcome"""
+        results = self._authorize_each(
+            website_ids,
+            lambda website_id: self.permission_service.can_manage_website(user, website_id),
+            "Not authorized to delete this website"
         )
-        self.db.add(membership)
-        self.db.commit()
-        self.db.refresh(membership)
+        deletable = {result.id for result in results if result.status == status.HTTP_200_OK}
+        if not deletable:
+            return results
+        
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            # Delete associated memberships first, revoking tokens that embed them
+            member_ids = {
+                row.user_id for row in self.db.query(WebsiteMember.user_id).filter(
+                    WebsiteMember.website_id.in_(deletable)
+                )
+            }
+            bump_token_versions(self.db, member_ids)
+            self.db.query(WebsiteMember).filter(
+                WebsiteMember.website_id.in_(deletable)
+            ).delete(synchronize_session=False)
+            self.db.query(Website).filter(Website.id.in_(deletable)).delete(synchronize_session=False)
+            uow.after_commit(lambda: self.permission_service.invalidate(*member_ids))
+            uow.after_commit(lambda: forget_website(*deletable))
+            uow.after_commit(lambda: evict_website(*deletable))
+        
+        for result in results:
+            if result.status == status.HTTP_200_OK:
+                result.status = status.HTTP_204_NO_CONTENT
+        return results
+    
+    def invite_users_to_website(
+        self,
+        website_id: int,
+        invites: List[WebsiteInvite],
+        inviter: User
+    ) -> List[InviteResult]:
+        """Invite many users to a website, reporting each email's outcome"""
+        if not self.permission_service.can_manage_website(inviter, website_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to invite users to this website"
+            )
+        
+        # One query resolves every email, one more finds existing memberships
+        user_ids = dict(self.db.query(User.email, User.id).filter(
+            User.email.in_({invite.email for invite in invites})
+        ).all())
+        members = {row.user_id for row in self.db.query(WebsiteMember.user_id).filter(
+            WebsiteMember.website_id == website_id,
+            WebsiteMember.user_id.in_(user_ids.values())
+        )}
+        
+        results, accepted = plan_invites(invites, user_ids, members, "this website")
+        if not accepted:
+            return results
+        
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            membership_ids = self.db.scalars(
+                insert(WebsiteMember).returning(WebsiteMember.id, sort_by_parameter_order=True),
+                [
+                    {"user_id": user_ids[results[index].email], "website_id": website_id, "role": invites[index].role}
+                    for index in accepted
+                ]
+            ).all()
+            invitee_ids = [user_ids[results[index].email] for index in accepted]
+            uow.after_commit(lambda: self.permission_service.invalidate(*invitee_ids))
+            uow.after_commit(lambda: evict_website(website_id))
+        
+        for index, membership_id in zip(accepted, membership_ids):
+            results[index].status = status.HTTP_201_CREATED
+            results[index].id = membership_id
+        return results
+    
+    async def import_websites(
+        self,
+        organization_id: int,
+        records: AsyncIterator[Tuple[int, Optional[dict], Optional[str]]],
+        user: User,
+        progress: ImportProgress
+    ) -> ImportProgress:
+        """Validate streamed records and insert them in batches, one transaction per batch"""
+        # Decided once for the whole upload, not per row, on a worker thread since
+        # building the permission snapshot queries the database
+        allowed = await run_in_threadpool(
+            self.permission_service.can_create_website_in_organization, user, organization_id
+        )
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to create websites in this organization"
+            )
+        unmanaged = not await run_in_threadpool(
+            self.permission_service.can_manage_organization, user, organization_id
+        )
+        
+        batch = []
+        async for line, record, error in records:
+            progress.processed += 1
+            if error is None:
+                record.setdefault("organization_id", organization_id)
+                try:
+                    website = WebsiteCreate.model_validate(record)
+                except ValidationError as exc:
+                    error = "; ".join(
+                        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in exc.errors()
+                    )
+                else:
+                    if website.organization_id != organization_id:
+                        error = "organization_id does not match the import target"
+            if error is not None:
+                progress.rejected += 1
+                if len(progress.rejections) < settings.IMPORT_MAX_REPORTED_REJECTIONS:
+                    progress.rejections.append(ImportRejection(line=line, detail=error))
+                continue
+            
+            batch.append(website.model_dump())
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                await run_in_threadpool(self._import_batch, batch, user, unmanaged)
+                progress.imported += len(batch)
+                progress.batches += 1
+                batch = []
+        
+        if batch:
+            await run_in_threadpool(self._import_batch, batch, user, unmanaged)
+            progress.imported += len(batch)
+            progress.batches += 1
+        progress.done = True
+        return progress
+    
+    def _import_batch(self, rows: List[dict], user: User, unmanaged: bool) -> None:
+        """Insert one batch of validated websites in its own transaction"""
+        uow = unit_of_work(self.db)
+        with uow.begin():
+            if not unmanaged:
+                self.db.execute(insert(Website), rows)
+                return
+            
+            # Add importer as website admin when they're not org admin
+            website_ids = self.db.scalars(
+                insert(Website).returning(Website.id, sort_by_parameter_order=True), rows
+            ).all()
+            self.db.execute(insert(WebsiteMember), [
+                {"user_id": user.id, "website_id": website_id, "role": UserRole.WEBSITE_ADMIN}
+                for website_id in website_ids
+            ])
+            uow.after_commit(lambda: self.permission_service.invalidate(user.id))
+
+class AsyncWebsiteService:
+    """Website read paths on an AsyncSession"""
+    
+    def __init__(self, db: AsyncSession, permission_service: AsyncPermissionService):
+        self.db = db
+        self.permission_service = permission_service
+    
+    async def get_website(self, website_id: int, user: User) -> Website:
+        """Get a website by ID"""
+        if not await self.permission_service.can_read_website(user, website_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this website"
+            )
+        
+        website = (await self.db.scalars(_website_statement(website_id))).first()
+        if not website:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Website not found"
+            )
+        
+        return website
+    
+    async def get_organization_websites(
+        self,
+        organization_id: int,
+        user: User,
+        page: Optional[PageParams] = None
+    ) -> Page:
+        """Get websites in an organization, optionally one keyset page at a time"""
+        if not await self.permission_service.can_read_organization(user, organization_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this organization"
+            )
+        
+        statement = organization_websites_statement(organization_id).options(*WEBSITE_RESPONSE_OPTIONS)
+        return await paginate_async(self.db, statement, Website.created_at, Website.id, page)
+    
+    async def get_user_websites(self, user: User, page: Optional[PageParams] = None) -> Page:
+        """Get websites for a user, optionally one keyset page at a time"""
+        return await self.permission_service.get_user_websites(user, page)
+    
+    async def search_websites(self, user: User, query: str, page: Optional[PageParams] = None) -> Page:
+        """Websites the user can access whose name, url or description match every word"""
+        terms = search_terms(query)
+        if not terms:
+            return Page()
         
-        return membership
\ No newline at end of file
+        condition = website_search_condition(self.db.get_bind().dialect.name, terms)
+        statement = user_websites_statement(user).where(condition).options(*WEBSITE_RESPONSE_OPTIONS)
+        return await paginate_async(self.db, statement, Website.created_at, Website.id, page)
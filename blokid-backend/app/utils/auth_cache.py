@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.config import settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+# token digest -> decoded JWT claims
+token_cache = TTLCache(
+    maxsize=lambda: settings.TOKEN_CACHE_SIZE,
+    ttl=lambda: settings.TOKEN_CACHE_TTL_SECONDS
+)
+
+# user email -> detached User snapshot
+principal_cache = TTLCache(
+    maxsize=lambda: settings.PRINCIPAL_CACHE_SIZE,
+    ttl=lambda: settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+class TokenVersionFloors:
+    """user id -> lowest token_version still accepted by this process"""
+
+    def __init__(self):
+        # A plain dict rather than an LRU: evicting a floor would quietly re-admit
+        # revoked tokens, so entries only lapse once older tokens have expired
+        self._floors: Dict[int, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        # When floors were last read back from the database
+        self.synced_at: Optional[datetime] = None
+
+    def get(self, user_id: int) -> Optional[int]:
+        """Current floor for a user, or None when every token is accepted"""
+        entry = self._floors.get(user_id)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def raise_to(self, user_id: int, version: int) -> None:
+        """Reject tokens older than version until every such token has expired"""
+        expires_at = time.monotonic() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        with self._lock:
+            current = self._floors.get(user_id)
+            if current is None or version >= current[0]:
+                self._floors[user_id] = (version, expires_at)
+
+    def prune(self) -> None:
+        """Forget floors whose older tokens have all expired"""
+        now = time.monotonic()
+        with self._lock:
+            for user_id in [key for key, (_, expires_at) in self._floors.items() if expires_at <= now]:
+                del self._floors[user_id]
+
+    def clear(self) -> None:
+        """Forget every floor and force a fresh read from the database"""
+        with self._lock:
+            self._floors.clear()
+            self.synced_at = None
+
+token_version_floors = TokenVersionFloors()
+
+def token_digest(token: str) -> str:
+    """Digest used as cache key so raw tokens are never kept in memory"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def get_cached_claims(token: str) -> Optional[dict]:
+    """Return previously verified claims for a token that has not expired yet"""
+    claims = token_cache.get(token_digest(token))
+    if claims is None:
+        return None
+    exp = claims.get("exp")
+    if exp is not None and exp <= time.time():
+        token_cache.pop(token_digest(token))
+        return None
+    return claims
+
+def cache_claims(token: str, claims: dict) -> None:
+    """Remember verified claims until the token's own expiry at the latest"""
+    exp = claims.get("exp")
+    ttl = None if exp is None else exp - time.time()
+    token_cache.set(token_digest(token), claims, ttl=ttl)
+
+def get_cached_principal(email: str, db: Session) -> Optional[User]:
+    """Attach a cached user snapshot to the session without querying"""
+    snapshot = principal_cache.get(email)
+    if snapshot is None:
+        return None
+    return db.merge(snapshot, load=False)
+
+def cache_principal(user: User) -> None:
+    """Cache a detached copy of a freshly loaded user"""
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    snapshot = User(**values)
+    make_transient_to_detached(snapshot)
+    principal_cache.set(user.email, snapshot)
+
+def invalidate_user(*emails: Optional[str]) -> None:
+    """Drop cached principals and verified tokens for the given users"""
+    for email in emails:
+        if email is None:
+            continue
+        principal_cache.pop(email)
+        token_cache.pop_matching(lambda claims: claims.get("sub") == email)
+
+def clear_auth_caches() -> None:
+    """Reset all authentication caches"""
+    token_cache.clear()
+    principal_cache.clear()
+    token_version_floors.clear()
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Union
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache with per-entry expiry"""
+
+    def __init__(self, maxsize: Union[int, Callable[[], int]], ttl: Union[float, Callable[[], float]]):
+        # Callables are read on use, so module-level caches can be sized from
+        # settings without reading them at import
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Entries removed on purpose, as opposed to expired or pushed out
+        self.invalidations = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize() if callable(self._maxsize) else self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        self._maxsize = value
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl() if callable(self._ttl) else self._ttl
+
+    @ttl.setter
+    def ttl(self, value: float) -> None:
+        self._ttl = value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry, dropping it if it has expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry; ``ttl`` can only shorten the cache-wide TTL"""
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + lifetime)
+            self._data.move_to_end(key)
+            maxsize = self.maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self.invalidations += 1
+        return default if entry is None else entry[0]
+
+    def pop_matching(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every entry whose value satisfies ``predicate``"""
+        with self._lock:
+            keys = [key for key, (value, _) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """Size and counters, for health endpoints"""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
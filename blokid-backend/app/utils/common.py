@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 
 def generate_uuid() -> str:
@@ -10,6 +10,10 @@ def get_timestamp() -> datetime:
     """Get current timestamp with timezone"""
     return datetime.now()
 
+def utcnow() -> datetime:
+    """Get current UTC timestamp"""
+    return datetime.now(timezone.utc)
+
 def format_datetime(dt: datetime) -> str:
     """Format datetime to ISO 8601 string with timezone"""
     return dt.isoformat()
@@ -1,10 +1,21 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.config import settings
+from app.database import get_async_db, get_db
 from app.models.user import User
-from app.services.permission_service import PermissionService
-from app.utils.security import verify_token
+from app.services.permission_service import AsyncPermissionService, PermissionService
+from app.utils.security import decode_token, verify_token
+from app.utils.principal import (
+    Principal,
+    is_token_version_current,
+    load_principal,
+    principal_from_claims,
+    sync_token_version_floors
+)
+from app.utils.auth_cache import get_cached_principal, cache_principal
 
 security = HTTPBearer()
 
@@ -23,14 +34,125 @@ def get_current_user(
     if email is None:
         raise credentials_exception
     
+    user = get_cached_principal(email, db)
+    if user is not None:
+        return user
+    
     user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise credentials_exception
     
+    cache_principal(user)
+    return user
+
+def _principal_credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _check_principal(principal: Principal) -> Principal:
+    if not is_token_version_current(principal.id, principal.token_version):
+        raise _principal_credentials_exception()
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Get current principal from embedded token claims without a user lookup"""
+    claims = decode_token(credentials.credentials)
+    if claims is None:
+        raise _principal_credentials_exception()
+    
+    principal = principal_from_claims(claims)
+    if principal is None:
+        # Tokens issued without embedded claims fall back to the database
+        principal = load_principal(db, get_current_user(credentials, db))
+    else:
+        # Revocations made by other workers only reach this one through the database
+        sync_token_version_floors(db)
+    return _check_principal(principal)
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_current_user() for async routes"""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    email = verify_token(credentials.credentials)
+    if email is None:
+        raise credentials_exception
+    
+    # Merging without load does no I/O, so the sync session view is safe here
+    user = get_cached_principal(email, db.sync_session)
+    if user is not None:
+        return user
+    
+    user = (await db.scalars(select(User).where(User.email == email))).first()
+    if user is None:
+        raise credentials_exception
+    
+    cache_principal(user)
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
-    """Get current active user"""
+async def get_current_principal_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """get_current_principal() for async routes"""
+    claims = decode_token(credentials.credentials)
+    if claims is None:
+        raise _principal_credentials_exception()
+    
+    principal = principal_from_claims(claims)
+    if principal is None:
+        user = await get_current_user_async(credentials, db)
+        principal = await db.run_sync(load_principal, user)
+    else:
+        await db.run_sync(sync_token_version_floors)
+    return _check_principal(principal)
+
+def get_authenticated_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get the caller from token claims when TOKEN_EMBED_PRINCIPAL is on, else from the database"""
+    if settings.TOKEN_EMBED_PRINCIPAL:
+        return get_current_principal(credentials, db)
+    return get_current_user(credentials, db)
+
+async def get_authenticated_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_authenticated_user() for async routes"""
+    if settings.TOKEN_EMBED_PRINCIPAL:
+        return await get_current_principal_async(credentials, db)
+    return await get_current_user_async(credentials, db)
+
+async def get_current_active_user_async(current_user: User = Depends(get_authenticated_user_async)) -> User:
+    """get_current_active_user() for async routes"""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+def get_current_active_user(current_user: User = Depends(get_authenticated_user)) -> User:
+    """Get current active user, as a Principal when TOKEN_EMBED_PRINCIPAL is on"""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+def get_current_active_user_record(current_user: User = Depends(get_current_user)) -> User:
+    """Get current active user's database row, for routes returning profile fields"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
@@ -93,4 +215,64 @@ def require_website_access(website_id: int):
                 detail="Website access required"
             )
         return current_user
-    return _require_website_access
\ No newline at end of file
+    return _require_website_access
+
+def get_permission_service(db: Session = Depends(get_db)) -> PermissionService:
+    """Request-scoped PermissionService shared by guards and services"""
+    return PermissionService(db)
+
+def organization_permission(permission: str, detail: str = "Organization access required"):
+    """Declarative guard checking a permission on the organization_id path parameter"""
+    def _organization_permission(
+        organization_id: int,
+        current_user: User = Depends(get_current_active_user),
+        permission_service: PermissionService = Depends(get_permission_service)
+    ) -> User:
+        check = getattr(permission_service, f"can_{permission}_organization")
+        if not check(current_user, organization_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return current_user
+    return _organization_permission
+
+def website_permission(permission: str, detail: str = "Website access required"):
+    """Declarative guard checking a permission on the website_id path parameter"""
+    def _website_permission(
+        website_id: int,
+        current_user: User = Depends(get_current_active_user),
+        permission_service: PermissionService = Depends(get_permission_service)
+    ) -> User:
+        check = getattr(permission_service, f"can_{permission}_website")
+        if not check(current_user, website_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return current_user
+    return _website_permission
+
+async def get_async_permission_service(db: AsyncSession = Depends(get_async_db)) -> AsyncPermissionService:
+    """Request-scoped AsyncPermissionService shared by async guards and services"""
+    return AsyncPermissionService(db)
+
+def async_organization_permission(permission: str, detail: str = "Organization access required"):
+    """organization_permission() for async routes"""
+    async def _organization_permission(
+        organization_id: int,
+        current_user: User = Depends(get_current_active_user_async),
+        permission_service: AsyncPermissionService = Depends(get_async_permission_service)
+    ) -> User:
+        check = getattr(permission_service, f"can_{permission}_organization")
+        if not await check(current_user, organization_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return current_user
+    return _organization_permission
+
+def async_website_permission(permission: str, detail: str = "Website access required"):
+    """website_permission() for async routes"""
+    async def _website_permission(
+        website_id: int,
+        current_user: User = Depends(get_current_active_user_async),
+        permission_service: AsyncPermissionService = Depends(get_async_permission_service)
+    ) -> User:
+        check = getattr(permission_service, f"can_{permission}_website")
+        if not await check(current_user, website_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return current_user
+    return _website_permission
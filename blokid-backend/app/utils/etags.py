@@ -0,0 +1,91 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Optional
+from fastapi import Request, Response, status
+from sqlalchemy import Select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.pagination import PageParams
+from app.utils.responses import wants_msgpack
+
+# Dashboards poll the read routes every few seconds and most answers are unchanged,
+# so each route derives a validator from row versions before building its body.
+
+ETAG_HEADER = "ETag"
+
+def version_of(obj: Any) -> tuple:
+    """(kind, id, last change) of a row; updated_at stays NULL until the first edit"""
+    changed_at = getattr(obj, "updated_at", None) or obj.created_at
+    return type(obj).__name__, obj.id, changed_at.isoformat() if changed_at else None
+
+def _digest(shape: str, parts: tuple) -> str:
+    """Hash of the response shape, negotiated encoding and version parts"""
+    # JSON and MessagePack bodies are different representations of the same resource
+    raw = repr((shape, wants_msgpack.get(), parts)).encode()
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+def versioned_etag(shape: str, versions: tuple) -> str:
+    """Strong ETag for a body built from exactly the rows with these versions"""
+    return f'"{_digest(shape, versions)}"'
+
+def _changed_at(model):
+    """Column expression for when a row of model last changed"""
+    if hasattr(model, "updated_at"):
+        return func.coalesce(model.updated_at, model.created_at)
+    return model.created_at
+
+async def collection_etag(
+    db: AsyncSession, statement: Select, model, shape: str, page: Optional[PageParams] = None, joined=()
+) -> str:
+    """Weak ETag from one aggregate over the rows a collection select matches"""
+    # joined names other models the body copies columns from, so their edits count too.
+    # Count and id sum catch rows leaving or joining the set without an edit
+    result = await db.execute(statement.with_only_columns(
+        func.count(model.id), func.sum(model.id),
+        *(func.max(_changed_at(source)) for source in (model, *joined)),
+        maintain_column_froms=True
+    ).order_by(None))
+    count, id_sum, *latest = result.one()
+    page_key = (page.cursor, page.limit) if page is not None else None
+    return f'W/"{_digest(shape, (count, *map(str, latest), id_sum, page_key))}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of If-None-Match against the current ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={ETAG_HEADER: etag, "Vary": "Accept"}
+        )
+    return None
+
+def conditional_response(request: Request, etag: str, build: Callable[[], Response]) -> Response:
+    """304 when the client already holds etag, otherwise build the body and tag it"""
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    response = build()
+    response.headers[ETAG_HEADER] = etag
+    return response
+
+async def conditional_response_async(
+    request: Request, etag: str, build: Callable[[], Awaitable[Response]]
+) -> Response:
+    """conditional_response() for bodies built from awaited queries"""
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    response = await build()
+    response.headers[ETAG_HEADER] = etag
+    return response
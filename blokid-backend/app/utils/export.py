@@ -0,0 +1,74 @@
+import csv
+import io
+from enum import Enum
+from typing import Any, Iterable, Iterator, Sequence
+import orjson
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.utils.responses import encode_default
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+def export_format(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson or csv")
+) -> ExportFormat:
+    """Export format query parameter shared by export routes"""
+    return format
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+def encode_batches(
+    batches: Iterable[Sequence[tuple]],
+    columns: Sequence[str],
+    format: ExportFormat
+) -> Iterator[bytes]:
+    """Encode batches of rows one chunk at a time; nothing outlives its batch"""
+    if format is ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for batch in batches:
+            writer.writerows([_csv_value(value) for value in row] for row in batch)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+        return
+    
+    for batch in batches:
+        yield b"".join(
+            orjson.dumps(dict(zip(columns, row)), default=encode_default, option=orjson.OPT_APPEND_NEWLINE)
+            for row in batch
+        )
+
+def stream_export(db: Session, statement, format: ExportFormat, filename: str) -> StreamingResponse:
+    """Stream a Core select as NDJSON or CSV, named after its selected columns"""
+    def batches():
+        # yield_per streams from a server-side cursor where the driver has one.
+        # Request-scoped sessions close only after the body has been sent.
+        result = db.execute(statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield partition
+    
+    return StreamingResponse(
+        encode_batches(batches(), statement.selected_columns.keys(), format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format.value}"'}
+    )
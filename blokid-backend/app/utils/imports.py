@@ -0,0 +1,93 @@
+import csv
+import json
+from typing import AsyncIterator, Optional, Tuple
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.export import ExportFormat
+
+# (user id, import id) -> ImportProgress, polled while the upload is running
+import_progress = TTLCache(maxsize=1000, ttl=3600)
+
+async def _lines(chunks: AsyncIterator[bytes], limit: int) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """Numbered text lines of a streamed body; None stands for a line over limit bytes"""
+    # Only the current line is buffered, and only up to limit bytes of it
+    pending = bytearray()
+    oversized = False
+    number = 0
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            piece = chunk[start:] if end < 0 else chunk[start:end]
+            if not oversized:
+                if len(pending) + len(piece) > limit:
+                    oversized = True
+                    pending.clear()
+                else:
+                    pending += piece
+            if end < 0:
+                break
+            number += 1
+            yield number, None if oversized else pending.decode("utf-8", errors="replace").rstrip("\r")
+            pending.clear()
+            oversized = False
+            start = end + 1
+    if pending or oversized:
+        yield number + 1, None if oversized else pending.decode("utf-8", errors="replace").rstrip("\r")
+
+async def read_records(
+    chunks: AsyncIterator[bytes],
+    format: ExportFormat
+) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """(line, record, error) for each NDJSON line or CSV record of a streamed body"""
+    limit = settings.IMPORT_MAX_RECORD_BYTES
+    too_long = f"Record exceeds {limit} bytes"
+    if format is ExportFormat.NDJSON:
+        async for number, line in _lines(chunks, limit):
+            if line is None:
+                yield number, None, too_long
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield number, None, "Invalid JSON"
+                continue
+            if isinstance(record, dict):
+                yield number, record, None
+            else:
+                yield number, None, "Expected a JSON object"
+        return
+    
+    header = None
+    parts, size, quotes, first = [], 0, 0, 0
+    async for number, line in _lines(chunks, limit):
+        if parts and (line is None or size + len(line) > limit):
+            # Usually a stray quote swallowing the rows after it; reject what was
+            # gathered and resume with this line rather than buffer the rest
+            yield first, None, f"{too_long}; unbalanced quote?"
+            parts, size, quotes, first = [], 0, 0, 0
+        if line is None:
+            yield number, None, too_long
+            continue
+        parts.append(line)
+        size += len(line) + 1
+        # Counted per line; an odd running total means a quoted field continues
+        quotes += line.count('"')
+        first = first or number
+        if quotes % 2:
+            continue
+        values = next(csv.reader(["\n".join(parts)]), [])
+        start = first
+        parts, size, quotes, first = [], 0, 0, 0
+        if not any(values):
+            continue
+        if header is None:
+            header = values
+        elif len(values) != len(header):
+            yield start, None, f"Expected {len(header)} fields, got {len(values)}"
+        else:
+            yield start, {key: value for key, value in zip(header, values) if value != ""}, None
+    if parts:
+        yield first, None, "Unterminated quoted field"
@@ -0,0 +1,30 @@
+from typing import Any, Callable
+from pydantic import AfterValidator, BeforeValidator
+from app.config import settings
+
+# Route signatures are evaluated at import, before settings may be read, so limits
+# taken from settings are checked per request by these validators instead of
+# being passed to Query() or Body()
+
+def max_items(setting: str) -> Callable[[Any], Any]:
+    """Validator rejecting a list with more entries than the named setting allows"""
+    def check(value):
+        limit = getattr(settings, setting)
+        if isinstance(value, list) and len(value) > limit:
+            raise ValueError(f"List should have at most {limit} items, not {len(value)}")
+        return value
+    return check
+
+def max_value(setting: str) -> Callable[[Any], Any]:
+    """Validator rejecting a number above the named setting"""
+    def check(value):
+        limit = getattr(settings, setting)
+        if value is not None and value > limit:
+            raise ValueError(f"Input should be less than or equal to {limit}")
+        return value
+    return check
+
+# Checked before items are validated, so oversized requests are cheap to refuse
+bulk_limit = BeforeValidator(max_items("MAX_BULK_ITEMS"))
+page_items_limit = BeforeValidator(max_items("MAX_PAGE_SIZE"))
+page_size_limit = AfterValidator(max_value("MAX_PAGE_SIZE"))
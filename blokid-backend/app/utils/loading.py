@@ -0,0 +1,16 @@
+from sqlalchemy.orm import joinedload
+from app.models.organization import Organization
+from app.models.website import Website
+
+# Loader options matching each response schema, so serialization never lazy-loads.
+# Every nested relationship is many-to-one, so one joined SELECT covers the shape.
+
+# schemas.organization.Organization: owner
+ORGANIZATION_RESPONSE_OPTIONS = (
+    joinedload(Organization.owner),
+)
+
+# schemas.website.Website: organization -> owner
+WEBSITE_RESPONSE_OPTIONS = (
+    joinedload(Website.organization).joinedload(Organization.owner),
+)
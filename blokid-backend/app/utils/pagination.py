@@ -0,0 +1,90 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Annotated, Optional, Tuple
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, or_
+from app.config import settings
+from app.utils.limits import page_size_limit
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+@dataclass(frozen=True)
+class PageParams:
+    """Requested page: an opaque cursor from the previous page and a size"""
+    cursor: Optional[str] = None
+    limit: int = field(default_factory=lambda: settings.DEFAULT_PAGE_SIZE)
+
+class Page(list):
+    """One page of results; next_cursor is None on the last page"""
+
+    def __init__(self, items=(), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+async def page_params(
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from {NEXT_CURSOR_HEADER}"),
+    limit: Annotated[Optional[int], Query(ge=1, description="Page size; DEFAULT_PAGE_SIZE if omitted"), page_size_limit] = None
+) -> PageParams:
+    """Pagination query parameters shared by collection routes"""
+    # async so that async routes never hop to the threadpool just to read these
+    if limit is None:
+        return PageParams(cursor=cursor)
+    return PageParams(cursor=cursor, limit=limit)
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque cursor for the (created_at, id) position of a row"""
+    raw = json.dumps([created_at.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Position encoded by encode_cursor; 400 for anything else"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def keyset(statement, created_at_column, id_column, page: Optional[PageParams]):
+    """Order a Query or Select by (created_at, id) and seek past the page cursor"""
+    statement = statement.order_by(created_at_column, id_column)
+    if page is None:
+        return statement
+    if page.cursor is not None:
+        created_at, id = decode_cursor(page.cursor)
+        statement = statement.where(or_(
+            created_at_column > created_at,
+            and_(created_at_column == created_at, id_column > id)
+        ))
+    # One extra row tells whether another page follows
+    return statement.limit(page.limit + 1)
+
+def page_from_rows(rows, page: Optional[PageParams], key=lambda row: (row.created_at, row.id)) -> Page:
+    """Trim the look-ahead row fetched by keyset() and derive the next cursor"""
+    if page is None or len(rows) <= page.limit:
+        return Page(rows)
+    rows = rows[:page.limit]
+    return Page(rows, encode_cursor(*key(rows[-1])))
+
+def paginate(query, created_at_column, id_column, page: Optional[PageParams]) -> Page:
+    """Run a Query one keyset page at a time; without a page, return every row"""
+    return page_from_rows(keyset(query, created_at_column, id_column, page).all(), page)
+
+async def paginate_async(db, statement, created_at_column, id_column, page: Optional[PageParams]) -> Page:
+    """paginate() for a Select on an AsyncSession; a single-entity select yields objects"""
+    result = await db.execute(keyset(statement, created_at_column, id_column, page))
+    description = statement.column_descriptions
+    if len(description) == 1 and description[0]["type"] is description[0]["entity"]:
+        return page_from_rows(result.scalars().all(), page)
+    return page_from_rows(result.all(), page)
+
+def set_next_cursor(response: Response, page: Page) -> None:
+    """Expose the next page's cursor to the client"""
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
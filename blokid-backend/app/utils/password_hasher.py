@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+# Kept free of app imports so spawned workers start quickly
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def hash_password(password: str) -> str:
+    """Hash a password (runs inside a pool worker)"""
+    return pwd_context.hash(password)
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash (runs inside a pool worker)"""
+    return pwd_context.verify(plain_password, hashed_password)
+
+class PasswordHasher:
+    """Async-facing bcrypt executor with a bounded queue"""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.max_workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    # Zero workers keeps hashing in-process (tests, tiny deployments)
+                    self._executor = ThreadPoolExecutor(max_workers=1)
+            return self._executor
+
+    def _discard_executor(self, executor: Executor) -> None:
+        with self._lock:
+            # Concurrent failures must not discard a pool another call already replaced
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, retry shortly",
+                    headers={"Retry-After": "1"}
+                )
+            self.pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def _run(self, fn, *args):
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                # A killed worker breaks the whole pool; replace it and retry once
+                self._discard_executor(executor)
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop"""
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop"""
+        return await self._run(check_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop pool workers"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import deque
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class PoolMetrics:
+    """Checkout wait times and timeouts for one connection pool"""
+
+    def __init__(self, window: int = 1024):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self._recent.append(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        """Wait statistics in milliseconds over the recent window"""
+        with self._lock:
+            recent = sorted(self._recent)
+            checkouts, timeouts = self.checkouts, self.timeouts
+            total_wait, max_wait = self.total_wait, self.max_wait
+
+        def percentile(fraction: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))] * 1000
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms_avg": (total_wait / checkouts * 1000) if checkouts else 0.0,
+            "wait_ms_p50": percentile(0.50),
+            "wait_ms_p99": percentile(0.99),
+            "wait_ms_max": max_wait * 1000,
+        }
+
+class _InstrumentedPool:
+    """Queue pool mixin recording how long callers wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """QueuePool that records how long callers wait for a connection"""
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for async engines"""
+
+def pool_status(engine) -> dict:
+    """Live occupancy of an engine's pool plus wait statistics when available"""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.user import User, OrganizationMember, WebsiteMember, UserRole
+from app.utils.auth_cache import invalidate_user, token_version_floors
+from app.utils.common import utcnow
+from app.utils.unit_of_work import unit_of_work
+
+# Compact role codes embedded in tokens
+ROLE_CODES = {
+    UserRole.ORGANIZATION_ADMIN: "oa",
+    UserRole.ORGANIZATION_USER: "ou",
+    UserRole.WEBSITE_ADMIN: "wa",
+    UserRole.WEBSITE_USER: "wu",
+}
+CODE_ROLES = {code: role for role, code in ROLE_CODES.items()}
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user as described by embedded token claims"""
+    id: int
+    email: str
+    is_active: bool
+    token_version: int
+    organization_roles: Dict[int, UserRole] = field(default_factory=dict)
+    website_roles: Dict[int, UserRole] = field(default_factory=dict)
+
+def build_principal_claims(
+    user: User,
+    organization_memberships: Iterable[OrganizationMember],
+    website_memberships: Iterable[WebsiteMember]
+) -> dict:
+    """Build the claims that let a token stand in for a user lookup"""
+    return {
+        "uid": user.id,
+        "act": bool(user.is_active),
+        "tv": user.token_version or 0,
+        "roles": {
+            "o": {str(m.organization_id): ROLE_CODES[m.role] for m in organization_memberships},
+            "w": {str(m.website_id): ROLE_CODES[m.role] for m in website_memberships},
+        },
+    }
+
+def principal_from_claims(claims: dict) -> Optional[Principal]:
+    """Rebuild a principal from token claims, or None if they are absent"""
+    if "uid" not in claims or "sub" not in claims:
+        return None
+    roles = claims.get("roles", {})
+    return Principal(
+        id=claims["uid"],
+        email=claims["sub"],
+        is_active=claims.get("act", False),
+        token_version=claims.get("tv", 0),
+        organization_roles={int(k): CODE_ROLES[v] for k, v in roles.get("o", {}).items()},
+        website_roles={int(k): CODE_ROLES[v] for k, v in roles.get("w", {}).items()},
+    )
+
+def load_principal(db: Session, user: User) -> Principal:
+    """Build a principal from the database"""
+    org_memberships = db.query(OrganizationMember).filter(
+        OrganizationMember.user_id == user.id
+    ).all()
+    website_memberships = db.query(WebsiteMember).filter(
+        WebsiteMember.user_id == user.id
+    ).all()
+    claims = build_principal_claims(user, org_memberships, website_memberships)
+    claims["sub"] = user.email
+    return principal_from_claims(claims)
+
+def is_token_version_current(user_id: int, token_version: int) -> bool:
+    """Check a token's version against the bumps this process knows about"""
+    minimum = token_version_floors.get(user_id)
+    return minimum is None or token_version >= minimum
+
+def sync_token_version_floors(db: Session) -> None:
+    """Pick up token version bumps other processes committed, at most once per interval"""
+    now = utcnow()
+    synced_at = token_version_floors.synced_at
+    interval = timedelta(seconds=settings.TOKEN_REVOCATION_SYNC_SECONDS)
+    if synced_at is not None and now - synced_at < interval:
+        return
+    token_version_floors.synced_at = now
+    # Bumping a version touches updated_at. Windows overlap by one interval so
+    # commits landing after their updated_at was stamped are still seen
+    since = (synced_at or now - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)) - interval
+    for user_id, token_version in db.query(User.id, User.token_version).filter(
+        User.updated_at >= since,
+        User.token_version > 0
+    ):
+        token_version_floors.raise_to(user_id, token_version)
+    token_version_floors.prune()
+
+def bump_token_versions(db: Session, user_ids: Iterable[int]) -> None:
+    """Invalidate every token issued so far for the given users, once the change commits"""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    users = db.query(User).filter(User.id.in_(user_ids)).all()
+    floors = {}
+    for user in users:
+        user.token_version = (user.token_version or 0) + 1
+        floors[user.id] = (user.token_version, user.email)
+    
+    def raise_floors():
+        for user_id, (token_version, email) in floors.items():
+            token_version_floors.raise_to(user_id, token_version)
+            invalidate_user(email)
+    
+    # A rolled back change must not leave floors that reject the users' current tokens
+    unit_of_work(db).after_commit(raise_floors)
@@ -0,0 +1,215 @@
+import http.cookies
+import itertools
+import math
+import threading
+import time
+from typing import List, Optional
+from fastapi import Depends, Request
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.database import (
+    create_async_db_engine,
+    create_db_engine,
+    enable_strict_loading,
+    get_async_db,
+    get_db,
+    to_async_url
+)
+
+# Time of the client's last write. The client carries it, so whichever worker
+# serves its next read sends that read to the primary, with no shared state
+LAST_WRITE_COOKIE = "last_write"
+
+# Session.info flags describing where a read session's rows come from
+REPLICA = "replica"
+READS_OWN_WRITES = "reads_own_writes"
+
+def is_replica(db) -> bool:
+    """Whether a read session is on a replica, which may lag the primary"""
+    return db.info.get(REPLICA, False)
+
+def reads_own_writes(db) -> bool:
+    """Whether a read session serves a user inside the read-your-writes window"""
+    return db.info.get(READS_OWN_WRITES, False)
+
+class ReplicaSet:
+    """Round-robin over read replicas, ejecting ones that fail to connect"""
+
+    def __init__(self, urls: List[str], eject_seconds: float):
+        self.urls = urls
+        self.engines = [create_db_engine(url) for url in urls]
+        self.session_factories = [
+            sessionmaker(autocommit=False, autoflush=False, bind=engine) for engine in self.engines
+        ]
+        # Built on the first async read, so sync-only deployments need no async driver
+        self.async_engines = None
+        self.async_session_factories = None
+        self.eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * len(urls)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def healthy_indexes(self) -> List[int]:
+        """Replica indexes in round-robin order, skipping ejected ones"""
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._counter)
+        count = len(self.engines)
+        order = [(start + offset) % count for offset in range(count)]
+        return [i for i in order if self._ejected_until[i] <= now]
+
+    def eject(self, index: int) -> None:
+        """Take a replica out of rotation for eject_seconds"""
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+
+    def open_session(self) -> Optional[Session]:
+        """Open a session on the next healthy replica, or None if none is up"""
+        for index in self.healthy_indexes():
+            session = enable_strict_loading(
+                self.session_factories[index](), settings.STRICT_RELATIONSHIP_LOADING
+            )
+            try:
+                # Check out a connection now so a dead replica is detected here
+                session.connection()
+                session.info[REPLICA] = True
+                return session
+            except exc.DBAPIError:
+                session.close()
+                self.eject(index)
+        return None
+
+    async def open_async_session(self) -> Optional[AsyncSession]:
+        """open_session() for async routes"""
+        if self.async_session_factories is None:
+            self.async_engines = [create_async_db_engine(to_async_url(url)) for url in self.urls]
+            self.async_session_factories = [
+                async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+                for engine in self.async_engines
+            ]
+        for index in self.healthy_indexes():
+            session = self.async_session_factories[index]()
+            enable_strict_loading(session.sync_session, settings.STRICT_RELATIONSHIP_LOADING)
+            try:
+                await session.connection()
+                session.info[REPLICA] = True
+                return session
+            except exc.DBAPIError:
+                await session.close()
+                self.eject(index)
+        return None
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {"index": i, "ejected": self._ejected_until[i] > now}
+            for i in range(len(self.engines))
+        ]
+
+_replica_set: Optional[ReplicaSet] = None
+_replica_lock = threading.Lock()
+
+def get_replica_set() -> Optional[ReplicaSet]:
+    """Replica set from DATABASE_REPLICA_URLS, or None when none are configured"""
+    global _replica_set
+    urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    if not urls:
+        return None
+    with _replica_lock:
+        if _replica_set is None:
+            _replica_set = ReplicaSet(urls, settings.REPLICA_EJECT_SECONDS)
+    return _replica_set
+
+def record_write(headers: list) -> None:
+    """Pin the client's reads to the primary for the read-your-writes window"""
+    window = settings.READ_YOUR_WRITES_SECONDS
+    if window > 0:
+        cookie = http.cookies.SimpleCookie()
+        cookie[LAST_WRITE_COOKIE] = f"{time.time():.3f}"
+        cookie[LAST_WRITE_COOKIE].update(
+            {"max-age": math.ceil(window), "path": "/", "httponly": True, "samesite": "lax"}
+        )
+        headers.append((b"set-cookie", cookie.output(header="").strip().encode("latin-1")))
+
+class WriteTrackingMiddleware:
+    """Mark clients whose authenticated writes succeeded, so their next reads use the primary"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+        authorization = next((value for name, value in scope["headers"] if name == b"authorization"), b"")
+        scheme, _, token = authorization.partition(b" ")
+        if scheme.lower() != b"bearer" or not token:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = list(message.get("headers", []))
+                record_write(headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
+
+def wrote_recently(request: Request) -> bool:
+    """Whether the client's last write falls inside the read-your-writes window"""
+    try:
+        written_at = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    # A timestamp from the future is forged; it must not pin reads indefinitely
+    return 0 <= time.time() - written_at < settings.READ_YOUR_WRITES_SECONDS
+
+def get_read_db(request: Request, primary: Session = Depends(get_db)):
+    """Database dependency for read-only routes, served by a replica when possible"""
+    replica_set = get_replica_set()
+    if replica_set is None:
+        yield primary
+        return
+    if wrote_recently(request):
+        primary.info[READS_OWN_WRITES] = True
+        yield primary
+        return
+
+    replica = replica_set.open_session()
+    if replica is None:
+        yield primary
+        return
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+async def get_async_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """get_read_db() for async routes"""
+    replica_set = get_replica_set()
+    if replica_set is None:
+        yield primary
+        return
+    if wrote_recently(request):
+        primary.info[READS_OWN_WRITES] = True
+        yield primary
+        return
+
+    replica = await replica_set.open_async_session()
+    if replica is None:
+        yield primary
+        return
+    try:
+        yield replica
+    finally:
+        await replica.close()
+
+async def get_async_cache_fill_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """get_async_read_db() for routes filling the response cache, always on the primary"""
+    # A miss read from a lagging replica would be cached and served long after the lag ends
+    if get_replica_set() is not None and wrote_recently(request):
+        primary.info[READS_OWN_WRITES] = True
+    return primary
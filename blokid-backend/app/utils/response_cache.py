@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+from app.config import settings
+from app.utils.cache import TTLCache
+
+@dataclass(frozen=True)
+class CachedBody:
+    """Serialized body of one resource and the rows it was built from"""
+    resource: tuple
+    body: dict
+    versions: tuple
+    organization_id: int
+    owner_id: int
+
+# (kind, id, permission scope) -> CachedBody. Routes check access before reading,
+# and the scope in the key keeps bodies from being shared between different roles.
+response_cache = TTLCache(
+    maxsize=lambda: settings.RESPONSE_CACHE_SIZE,
+    ttl=lambda: settings.RESPONSE_CACHE_TTL_SECONDS
+)
+
+async def read_through(
+    kind: str,
+    resource_id: int,
+    scope: Hashable,
+    load: Callable[[], Awaitable[CachedBody]],
+    use_cached: bool = True
+) -> CachedBody:
+    """Cached body for a resource the caller may read, loading it on a miss"""
+    # Callers turn off use_cached when the reader must see its own writes. load must
+    # read the primary: a replica may lag writes the cache was evicted for
+    key = (kind, resource_id, scope)
+    entry = response_cache.get(key) if use_cached else None
+    if entry is None:
+        entry = await load()
+        response_cache.set(key, entry)
+    return entry
+
+def evict_organization(organization_id: int) -> None:
+    """Drop an organization and its websites, whose bodies embed it"""
+    response_cache.pop_matching(lambda entry: entry.organization_id == organization_id)
+
+def evict_website(*website_ids: int) -> None:
+    """Drop every cached body of the given websites"""
+    resources = {("Website", website_id) for website_id in website_ids}
+    response_cache.pop_matching(lambda entry: entry.resource in resources)
+
+def evict_owner(user_id: int) -> None:
+    """Drop bodies that embed a user as organization owner"""
+    response_cache.pop_matching(lambda entry: entry.owner_id == user_id)
+
+def clear_response_cache() -> None:
+    """Reset the response cache"""
+    response_cache.clear()
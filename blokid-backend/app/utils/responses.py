@@ -0,0 +1,59 @@
+from contextvars import ContextVar
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any
+from uuid import UUID
+import msgpack
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_ACCEPT_TYPES = (b"application/msgpack", b"application/x-msgpack")
+
+# Set per request by NegotiationMiddleware; read when the response renders
+wants_msgpack: ContextVar[bool] = ContextVar("wants_msgpack", default=False)
+
+def encode_default(obj: Any) -> Any:
+    """Fallback encoder for values orjson and msgpack do not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+class NegotiatedResponse(JSONResponse):
+    """orjson-encoded JSON, or MessagePack when the client accepts it"""
+
+    def __init__(self, content: Any = None, *args, **kwargs):
+        # Decided before headers are built, since media_type feeds Content-Type
+        self.media_type = MSGPACK_MEDIA_TYPE if wants_msgpack.get() else "application/json"
+        super().__init__(content, *args, **kwargs)
+        self.headers.setdefault("Vary", "Accept")
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return msgpack.packb(content, default=encode_default, datetime=False)
+        return orjson.dumps(content, default=encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+class NegotiationMiddleware:
+    """Record whether the client asked for MessagePack in its Accept header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = next((value for name, value in scope["headers"] if name == b"accept"), b"")
+        token = wants_msgpack.set(any(media_type in accept for media_type in MSGPACK_ACCEPT_TYPES))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            wants_msgpack.reset(token)
@@ -0,0 +1,35 @@
+import re
+from typing import List
+from sqlalchemy import and_, or_, select, text
+from app.models.website import SEARCH_DOCUMENT, Website
+
+MAX_SEARCH_TERMS = 8
+
+def search_terms(query: str) -> List[str]:
+    """Lower-cased words of a search query; punctuation only separates them"""
+    # Letters and digits only, as both text indexes split on underscores too
+    return re.findall(r"[^\W_]+", query.lower())[:MAX_SEARCH_TERMS]
+
+def website_search_condition(dialect_name: str, terms: List[str]):
+    """Filter matching websites whose words start with every term, using the text index"""
+    if dialect_name == "sqlite":
+        # Quoted so FTS5 operators in user input stay literal; * makes each a prefix
+        match = " ".join(f'"{term}"*' for term in terms)
+        return Website.id.in_(
+            select(text("rowid")).select_from(text("websites_fts")).where(
+                text("websites_fts MATCH :match").bindparams(match=match)
+            )
+        )
+    if dialect_name == "postgresql":
+        # Same expression as ix_websites_search, so the GIN index serves it;
+        # qualified because eager loads join organizations, which share column names
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        document = SEARCH_DOCUMENT.replace("coalesce(", "coalesce(websites.")
+        return text(
+            f"to_tsvector('simple', {document}) @@ to_tsquery('simple', :tsquery)"
+        ).bindparams(tsquery=tsquery)
+    # Unindexed fallback for other backends
+    return and_(*(
+        or_(Website.name.ilike(f"%{term}%"), Website.url.ilike(f"%{term}%"), Website.description.ilike(f"%{term}%"))
+        for term in terms
+    ))
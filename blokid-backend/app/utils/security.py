@@ -1,10 +1,27 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.config import settings
+from app.utils.auth_cache import get_cached_claims, cache_claims
+from app.utils.password_hasher import PasswordHasher, pwd_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_password_hasher: Optional[PasswordHasher] = None
+
+def get_password_hasher() -> PasswordHasher:
+    """Create the hashing pool on first use rather than at import"""
+    global _password_hasher
+    if _password_hasher is None:
+        _password_hasher = PasswordHasher(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            max_pending=settings.PASSWORD_HASH_MAX_PENDING
+        )
+    return _password_hasher
+
+def __getattr__(name):
+    # Keep `from app.utils.security import password_hasher` working, lazily
+    if name == "password_hasher":
+        return get_password_hasher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
@@ -14,6 +31,14 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool"""
+    return await get_password_hasher().verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool"""
+    return await get_password_hasher().hash(password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -25,13 +50,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify and decode a JWT token"""
+def decode_token(token: str) -> Optional[dict]:
+    """Decode a JWT token, reusing claims verified earlier"""
+    payload = get_cached_claims(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        return email
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    cache_claims(token, payload)
+    return payload
+
+def verify_token(token: str) -> Optional[str]:
+    """Verify and decode a JWT token"""
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    email: str = payload.get("sub")
+    if email is None:
+        return None
+    return email
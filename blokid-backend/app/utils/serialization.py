@@ -0,0 +1,65 @@
+import typing
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Type
+from pydantic import BaseModel, TypeAdapter
+from app.config import settings
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.responses import NegotiatedResponse
+
+# Rows read from our own database already satisfy the response schemas, so list
+# routes copy their attributes into plain dicts instead of validating each one.
+
+def _nested_schema(annotation: Any):
+    """(schema, is_list) when a field holds response models, else None"""
+    for arg in (annotation, *typing.get_args(annotation)):
+        if isinstance(arg, type) and issubclass(arg, BaseModel):
+            return arg, False
+        if typing.get_origin(arg) in (list, List):
+            nested = _nested_schema(typing.get_args(arg)[0])
+            if nested is not None:
+                return nested[0], True
+    return None
+
+@lru_cache(maxsize=None)
+def trusted_dumper(schema: Type[BaseModel]) -> Callable[[Any], dict]:
+    """Compile a function copying an ORM object or Row into schema-shaped dict"""
+    plan = []
+    for name, field in schema.model_fields.items():
+        source = field.validation_alias if isinstance(field.validation_alias, str) else name
+        nested = _nested_schema(field.annotation)
+        if nested is None:
+            plan.append((name, source, None, False))
+        else:
+            plan.append((name, source, trusted_dumper(nested[0]), nested[1]))
+
+    def dump(obj: Any) -> dict:
+        result = {}
+        for name, source, nested_dump, is_list in plan:
+            value = getattr(obj, source, None)
+            if nested_dump is not None and value is not None:
+                value = [nested_dump(item) for item in value] if is_list else nested_dump(value)
+            result[name] = value
+        return result
+
+    return dump
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """Precompiled validator for a list of schema, built once per schema"""
+    return TypeAdapter(List[schema])
+
+def dump_trusted(schema: Type[BaseModel], rows: Iterable[Any]) -> List[dict]:
+    """Dicts for rows from our own database, validated only when configured"""
+    dump = trusted_dumper(schema)
+    items = [dump(row) for row in rows]
+    if settings.VALIDATE_TRUSTED_RESPONSES:
+        list_adapter(schema).validate_python(items)
+    return items
+
+def trusted_response(schema: Type[BaseModel], rows: Iterable[Any]) -> NegotiatedResponse:
+    """Response for a page of trusted rows, bypassing response_model validation"""
+    response = NegotiatedResponse(dump_trusted(schema, rows))
+    next_cursor = getattr(rows, "next_cursor", None)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
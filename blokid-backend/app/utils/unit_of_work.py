@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from typing import Callable, List
+from sqlalchemy.orm import Session
+
+class UnitOfWork:
+    """One transaction per session; nested scopes flush, the outermost commits"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.depth = 0
+        self._after_commit: List[Callable[[], None]] = []
+
+    @contextmanager
+    def begin(self):
+        """Open a scope; only the outermost scope commits or rolls back"""
+        self.depth += 1
+        try:
+            yield self
+            # Flushing assigns ids and surfaces constraint errors inside the scope
+            self.db.flush()
+        except BaseException:
+            self.depth -= 1
+            if self.depth == 0:
+                self.db.rollback()
+                self._after_commit.clear()
+            raise
+        self.depth -= 1
+        if self.depth == 0:
+            # Taken first so a failed commit cannot leave them for the next transaction
+            callbacks, self._after_commit = self._after_commit, []
+            try:
+                self.db.commit()
+            except BaseException:
+                self.db.rollback()
+                raise
+            for callback in callbacks:
+                callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the outermost scope has committed"""
+        if self.depth == 0:
+            callback()
+        else:
+            self._after_commit.append(callback)
+
+def unit_of_work(db: Session) -> UnitOfWork:
+    """The unit of work shared by every service using this session"""
+    uow = db.info.get("unit_of_work")
+    if uow is None:
+        uow = db.info["unit_of_work"] = UnitOfWork(db)
+    return uow
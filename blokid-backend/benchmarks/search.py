@@ -0,0 +1,115 @@
+"""Compare indexed website search with a naive LIKE '%q%' scan
+
+Usage (from blokid-backend/): python benchmarks/search.py [--rows 1000000] [--repeat 20]
+
+Seeds a throwaway SQLite database with one organization holding `rows` websites
+(the FTS5 index is filled by its triggers), then reports p50/p99 latency of
+WebsiteService.search_websites against the same access-restricted, paginated
+query filtered with LIKE '%term%' over name, url and description.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+DATABASE_PATH = Path(tempfile.mkdtemp()) / "search.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+from sqlalchemy import insert, or_  # noqa: E402
+from app.cli import create_schema  # noqa: E402
+from app.database import get_session_factory  # noqa: E402
+from app.models.organization import Organization  # noqa: E402
+from app.models.user import OrganizationMember, User, UserRole  # noqa: E402
+from app.models.website import Website  # noqa: E402
+from app.services.website_service import WebsiteService  # noqa: E402
+from app.utils.common import utcnow  # noqa: E402
+from app.utils.loading import WEBSITE_RESPONSE_OPTIONS  # noqa: E402
+from app.utils.pagination import PageParams, paginate  # noqa: E402
+from app.utils.search import search_terms  # noqa: E402
+
+WORDS = ["coffee", "bakery", "garden", "studio", "market", "travel", "fitness", "books",
+         "music", "repair", "pets", "crafts", "wine", "cycling", "photo", "design"]
+QUERIES = ["zephyr", "coffee", "garden studio", "4242"]
+
+def seed(rows: int):
+    """One org admin owning `rows` websites built from a small vocabulary"""
+    create_schema()
+    db = get_session_factory()()
+    user = User(email="bench@example.com", hashed_password="unused")
+    db.add(user)
+    db.flush()
+    org = Organization(name="Bench", owner_id=user.id)
+    db.add(org)
+    db.flush()
+    db.add(OrganizationMember(user_id=user.id, organization_id=org.id, role=UserRole.ORGANIZATION_ADMIN))
+    rng = random.Random(0)
+    for start in range(0, rows, 10000):
+        db.execute(insert(Website), [
+            {
+                "name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {n}",
+                "url": f"https://{rng.choice(WORDS)}{n}.example.com",
+                "description": f"A {rng.choice(WORDS)} site" if n % 3 else None,
+                "organization_id": org.id,
+                "created_at": utcnow(),
+            }
+            for n in range(start, min(start + 10000, rows))
+        ])
+    # One rare word, so selective queries are measured too
+    db.execute(insert(Website), [{
+        "name": "zephyr", "url": "https://zephyr.example.com",
+        "organization_id": org.id, "created_at": utcnow()
+    }])
+    db.commit()
+    return db, user
+
+def like_search(service: WebsiteService, user: User, query: str, page: PageParams):
+    """The naive scan the index replaces"""
+    websites = service.permission_service.user_websites_query(user, service.db)
+    for term in search_terms(query):
+        pattern = f"%{term}%"
+        websites = websites.filter(or_(
+            Website.name.like(pattern), Website.url.like(pattern), Website.description.like(pattern)
+        ))
+    return paginate(websites.options(*WEBSITE_RESPONSE_OPTIONS), Website.created_at, Website.id, page)
+
+def measure(search, repeat: int):
+    """Latencies in milliseconds and the row count of the first page"""
+    search()
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = search()
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))], len(rows)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db, user = seed(args.rows)
+    print(f"seeded {args.rows} websites in {time.perf_counter() - started:.1f}s")
+    service = WebsiteService(db)
+    page = PageParams(limit=50)
+
+    print(f"{'query':<16}{'variant':<8}{'p50 ms':>10}{'p99 ms':>10}{'rows':>6}")
+    for query in QUERIES:
+        for name, search in [
+            ("fts", lambda: service.search_websites(user, query, page)),
+            ("like", lambda: like_search(service, user, query, page)),
+        ]:
+            p50, p99, count = measure(search, args.repeat)
+            print(f"{query:<16}{name:<8}{p50:>10.2f}{p99:>10.2f}{count:>6}")
+            db.expunge_all()
+
+if __name__ == "__main__":
+    main()
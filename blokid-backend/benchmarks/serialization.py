@@ -0,0 +1,103 @@
+"""Compare response encodings on the list endpoints
+
+Usage (from blokid-backend/): python benchmarks/serialization.py [--rows 200] [--requests 300]
+
+Seeds a throwaway SQLite database, then reports p50/p99 latency and body size
+of GET /websites/ and GET /api/organizations/ with every row validated against
+the response schema (the pre-fast-path cost), and on the trusted path encoded
+as orjson and as MessagePack.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+DATABASE_PATH = Path(tempfile.mkdtemp()) / "serialization.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.cli import create_schema  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import get_session_factory  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.models.organization import Organization  # noqa: E402
+from app.models.user import OrganizationMember, User, UserRole  # noqa: E402
+from app.models.website import Website  # noqa: E402
+from app.utils.security import create_access_token  # noqa: E402
+
+ENDPOINTS = ["/websites/", "/api/organizations/"]
+
+def seed(rows: int) -> str:
+    """Create one user owning `rows` organizations and `rows` websites; return a token"""
+    create_schema()
+    db = get_session_factory()()
+    user = User(email="bench@example.com", hashed_password="unused")
+    db.add(user)
+    db.flush()
+    organizations = [
+        Organization(name=f"Org {i}", description="Benchmark organization", owner_id=user.id)
+        for i in range(rows)
+    ]
+    db.add_all(organizations)
+    db.flush()
+    db.add_all([
+        OrganizationMember(user_id=user.id, organization_id=org.id, role=UserRole.ORGANIZATION_ADMIN)
+        for org in organizations
+    ])
+    db.add_all([
+        Website(name=f"Site {i}", url=f"https://{i}.example.com", description="Benchmark website",
+                organization_id=organizations[i % len(organizations)].id)
+        for i in range(rows)
+    ])
+    db.commit()
+    db.close()
+    return create_access_token({"sub": "bench@example.com"})
+
+def measure(client: TestClient, path: str, headers: dict, requests: int):
+    """Latencies in milliseconds and the body size of one response"""
+    for _ in range(10):
+        client.get(path, headers=headers)
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.text
+    latencies.sort()
+    return (
+        statistics.median(latencies),
+        latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        len(response.content),
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    token = seed(args.rows)
+    auth = {"Authorization": f"Bearer {token}"}
+    variants = [
+        ("validated", True, {}),
+        ("orjson", False, {}),
+        ("msgpack", False, {"Accept": "application/msgpack"}),
+    ]
+
+    print(f"{'endpoint':<22}{'variant':<14}{'p50 ms':>9}{'p99 ms':>9}{'bytes':>9}")
+    with TestClient(create_app()) as client:
+        for path in ENDPOINTS:
+            for name, validate, extra in variants:
+                settings.VALIDATE_TRUSTED_RESPONSES = validate
+                p50, p99, size = measure(
+                    client, f"{path}?limit={args.rows}", {**auth, **extra}, args.requests
+                )
+                print(f"{path:<22}{name:<14}{p50:>9.2f}{p99:>9.2f}{size:>9}")
+
+if __name__ == "__main__":
+    main()
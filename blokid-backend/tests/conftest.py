@@ -1,6 +1,10 @@
+import asyncio
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 from fastapi import Depends
 from sqlalchemy.orm import Session
@@ -8,16 +12,41 @@ import os
 from datetime import timedelta
 
 from app.main import app
-from app.database import Base, get_db
+from app.cli import create_schema
+from app.database import Base, enable_strict_loading, get_async_db, get_db, to_async_url
 from app.config import settings
 from app.models.user import User, OrganizationMember, UserRole
 from app.models.organization import Organization
+from app.models.website import Website
 from app.utils.security import get_password_hash, create_access_token
+from app.utils.auth_cache import clear_auth_caches
+from app.services.permission_service import clear_permission_caches
+from app.utils.response_cache import clear_response_cache
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# TestClient runs each request on a fresh event loop, so async connections are never pooled
+async_engine = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    # Importing the app no longer issues DDL; apply the schema once per run
+    create_schema()
+
+@pytest.fixture(autouse=True)
+def validate_trusted_responses(monkeypatch):
+    # The validation-free list path must still produce schema-valid bodies
+    monkeypatch.setattr(settings, "VALIDATE_TRUSTED_RESPONSES", True)
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    # Tables are recreated per test, so cached ids and emails must not leak
+    clear_auth_caches()
+    clear_permission_caches()
+    clear_response_cache()
+    yield
 
 @pytest.fixture()
 def test_db():
@@ -35,19 +64,66 @@ def test_db():
         # Drop all tables
         Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture()
+def run_async_db(test_db):
+    """Fixture calling an async route handler with an AsyncSession on the test database"""
+    def run(handler, *args, **kwargs):
+        async def main():
+            async_engine = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL))
+            try:
+                async with AsyncSession(async_engine, expire_on_commit=False) as db:
+                    return await handler(*args, db=db, **kwargs)
+            finally:
+                await async_engine.dispose()
+        result = asyncio.run(main())
+        # The sync session must not serve rows changed behind its back
+        test_db.expire_all()
+        return result
+    return run
+
+@pytest.fixture()
+def query_counter():
+    """Fixture collecting every SQL statement executed during a test"""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(Engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", record)
+
 @pytest.fixture()
 def client(test_db):
     def override_get_db():
         try:
-            db = TestingSessionLocal()
+            # Any lazy load while serializing a response fails the test
+            db = enable_strict_loading(TestingSessionLocal())
             yield db
         finally:
             db.close()
     
+    async def override_get_async_db():
+        async with AsyncSession(async_engine, autoflush=False, expire_on_commit=False) as db:
+            enable_strict_loading(db.sync_session)
+            yield db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     yield TestClient(app)
     app.dependency_overrides.clear()
 
+@pytest.fixture()
+def add_website(test_db):
+    """Fixture adding a website to the first organization; returns (org id, website id)"""
+    def add(name="Site"):
+        org = test_db.query(Organization).first()
+        website = Website(name=name, url=f"https://{name.lower()}.example.com", organization_id=org.id)
+        test_db.add(website)
+        test_db.commit()
+        return org.id, website.id
+    return add
+
 @pytest.fixture()
 def auth_headers(test_db):
     """Fixture to create an authenticated user and return auth headers"""
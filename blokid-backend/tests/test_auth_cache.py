@@ -0,0 +1,92 @@
+# tests/test_auth_cache.py
+import time
+from datetime import timedelta
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from app.models.user import User
+from app.routers.users import update_user
+from app.schemas.user import UserUpdate
+from app.utils import security
+from app.utils.auth_cache import principal_cache, token_cache
+from app.utils.cache import TTLCache
+from app.utils.dependencies import get_current_user, get_current_active_user
+from app.utils.security import create_access_token, verify_token
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+class TestTTLCache:
+    def test_lru_bound(self):
+        """Test oldest entries are evicted past maxsize"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    def test_entry_ttl_cannot_exceed_cache_ttl(self):
+        """Test per-entry TTL only shortens the lifetime"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("short", 1, ttl=0.01)
+        cache.set("expired", 2, ttl=-1)
+        time.sleep(0.02)
+
+        assert cache.get("short") is None
+        assert cache.get("expired") is None
+
+class TestTokenCache:
+    def test_verified_token_skips_decode(self, monkeypatch):
+        """Test repeated verification reuses cached claims"""
+        token = create_access_token({"sub": "cached@example.com"}, timedelta(minutes=5))
+        assert verify_token(token) == "cached@example.com"
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("token decoded twice")
+        monkeypatch.setattr(security.jwt, "decode", fail_decode)
+
+        assert verify_token(token) == "cached@example.com"
+
+    def test_expired_claims_are_not_served(self):
+        """Test cached claims never outlive the token exp"""
+        token = create_access_token({"sub": "old@example.com"}, timedelta(seconds=-1))
+
+        assert verify_token(token) is None
+        assert len(token_cache) == 0
+
+class TestPrincipalCache:
+    def test_second_request_skips_user_query(self, test_db, query_counter):
+        """Test cached principal is attached without a DB round trip"""
+        user = User(email="principal@example.com", hashed_password="hashed")
+        test_db.add(user)
+        test_db.commit()
+        token = create_access_token({"sub": user.email}, timedelta(minutes=5))
+
+        first = get_current_user(_credentials(token), test_db)
+        test_db.expunge_all()
+        query_counter.clear()
+        second = get_current_user(_credentials(token), test_db)
+
+        assert second.id == first.id
+        assert second.email == "principal@example.com"
+        assert query_counter == []
+
+    def test_update_user_drops_cached_principal(self, test_db, run_async_db):
+        """Test deactivation through update_user is seen immediately"""
+        user = User(email="deactivate@example.com", hashed_password="hashed")
+        test_db.add(user)
+        test_db.commit()
+        token = create_access_token({"sub": user.email}, timedelta(minutes=5))
+        get_current_user(_credentials(token), test_db)
+        assert principal_cache.get("deactivate@example.com") is not None
+
+        run_async_db(update_user, user.id, UserUpdate(is_active=False))
+
+        assert principal_cache.get("deactivate@example.com") is None
+        current = get_current_user(_credentials(token), test_db)
+        with pytest.raises(Exception) as exc_info:
+            get_current_active_user(current)
+        assert exc_info.value.status_code == 400
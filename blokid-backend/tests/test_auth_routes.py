@@ -1,8 +1,12 @@
 # tests/test_auth_routes.py
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.config import settings
 from app.database import get_db
+from app.services.auth_service import AuthService
+from app.utils.security import decode_token
 from tests.conftest import test_db
 
 @pytest.fixture
@@ -70,6 +74,30 @@ class TestAuthRoutes:
         assert "access_token" in data
         assert data["token_type"] == "bearer"
     
+    def test_login_builds_token_off_the_event_loop(self, test_client, monkeypatch):
+        """Test embedding principal claims queries memberships on a worker thread"""
+        monkeypatch.setattr(settings, "TOKEN_EMBED_PRINCIPAL", True)
+        on_loop = []
+        original = AuthService.create_user_token
+        
+        def create_user_token(self, user):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return original(self, user)
+        
+        monkeypatch.setattr(AuthService, "create_user_token", create_user_token)
+        credentials = {"email": "claims@example.com", "password": "testpass123"}
+        test_client.post("/auth/register", json=credentials)
+        
+        response = test_client.post("/auth/login", json=credentials)
+        
+        assert response.status_code == 200
+        assert on_loop == [False]
+        assert "roles" in decode_token(response.json()["access_token"])
+    
     def test_login_wrong_password(self, test_client):
         """Test login with wrong password"""
         # Register user first
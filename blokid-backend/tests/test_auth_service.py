@@ -1,7 +1,9 @@
 # tests/test_auth_service.py
+import asyncio
 import pytest
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.services import auth_service as auth_service_module
 from app.services.auth_service import AuthService
 from app.schemas.user import UserCreate
 from app.models.user import User
@@ -37,6 +39,24 @@ class TestAuthService:
         assert exc_info.value.status_code == 400
         assert "Email already registered" in str(exc_info.value.detail)
     
+    def test_register_duplicate_email_async_skips_hashing(self, test_db: Session, monkeypatch):
+        """Test async registration rejects a taken email before hashing the password"""
+        auth_service = AuthService(test_db)
+        user_data = UserCreate(email="test@example.com", password="testpass123")
+        auth_service.register_user(user_data)
+        hashed = []
+        
+        async def get_password_hash_async(password):
+            hashed.append(password)
+            return "hashed"
+        
+        monkeypatch.setattr(auth_service_module, "get_password_hash_async", get_password_hash_async)
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(auth_service.register_user_async(user_data))
+        
+        assert exc_info.value.status_code == 400
+        assert hashed == []
+    
     def test_authenticate_user_success(self, test_db: Session):
         """Test successful user authentication"""
         auth_service = AuthService(test_db)
@@ -0,0 +1,111 @@
+# tests/test_batch_invites.py
+import pytest
+from app.models.organization import Organization as OrganizationModel
+from app.models.website import Website as WebsiteModel
+from app.models.user import OrganizationMember, User as UserModel, UserRole, WebsiteMember
+
+@pytest.fixture()
+def invitees(test_db, auth_headers):
+    users = [UserModel(email=f"invitee{n}@example.com", hashed_password="x") for n in range(3)]
+    test_db.add_all(users)
+    test_db.commit()
+    return [user.email for user in users]
+
+def _invites(emails, role):
+    return [{"email": email, "role": role.value} for email in emails]
+
+class TestBatchInvites:
+    def test_organization_batch_reports_each_email(self, client, auth_headers, test_db, invitees):
+        """Test new, unknown, duplicate and existing members get their own outcome"""
+        org_id = test_db.query(OrganizationModel).first().id
+        emails = [invitees[0], "nobody@example.com", invitees[1], invitees[0], "test@example.com"]
+        response = client.post(
+            f"/api/organizations/{org_id}/invite/batch",
+            json=_invites(emails, UserRole.ORGANIZATION_USER),
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["status"] for r in results] == [201, 404, 201, 400, 400]
+        assert [r["email"] for r in results] == emails
+        assert test_db.query(OrganizationMember).filter(
+            OrganizationMember.organization_id == org_id
+        ).count() == 3
+
+    def test_organization_batch_query_count_is_flat(self, client, auth_headers, test_db, invitees, query_counter):
+        """Test lookups and the insert do not grow with the number of emails"""
+        org_id = test_db.query(OrganizationModel).first().id
+        client.post(
+            f"/api/organizations/{org_id}/invite/batch",
+            json=_invites(invitees[:1], UserRole.ORGANIZATION_USER),
+            headers=auth_headers
+        )
+        emails = [f"more{n}@example.com" for n in range(20)]
+        test_db.add_all([UserModel(email=email, hashed_password="x") for email in emails])
+        test_db.commit()
+        membership_inserts = lambda: [q for q in query_counter if q.startswith("INSERT INTO organization_members")]
+        other_queries = lambda: [q for q in query_counter if not q.startswith("INSERT INTO organization_members")]
+
+        query_counter.clear()
+        client.post(
+            f"/api/organizations/{org_id}/invite/batch",
+            json=_invites(invitees[1:2], UserRole.ORGANIZATION_USER),
+            headers=auth_headers
+        )
+        one = len(other_queries())
+        query_counter.clear()
+        client.post(
+            f"/api/organizations/{org_id}/invite/batch",
+            json=_invites(emails, UserRole.ORGANIZATION_USER),
+            headers=auth_headers
+        )
+
+        assert len(other_queries()) == one
+        assert membership_inserts()
+
+    def test_invitees_gain_access(self, client, auth_headers, test_db, invitees):
+        """Test permission caches are invalidated for everyone invited"""
+        org_id = test_db.query(OrganizationModel).first().id
+        client.post(
+            f"/api/organizations/{org_id}/invite/batch",
+            json=_invites(invitees, UserRole.ORGANIZATION_USER),
+            headers=auth_headers
+        )
+        invitee = test_db.query(UserModel).filter(UserModel.email == invitees[0]).one()
+        from app.services.permission_service import PermissionService
+
+        assert PermissionService(test_db).can_read_organization(invitee, org_id)
+
+    def test_website_batch(self, client, auth_headers, test_db, invitees):
+        """Test website invites work the same way"""
+        org_id = test_db.query(OrganizationModel).first().id
+        website = WebsiteModel(name="Site", url="https://site.example.com", organization_id=org_id)
+        test_db.add(website)
+        test_db.commit()
+
+        response = client.post(
+            f"/websites/{website.id}/invite/batch",
+            json=_invites([invitees[0], invitees[0], "nobody@example.com"], UserRole.WEBSITE_USER),
+            headers=auth_headers
+        )
+
+        assert [r["status"] for r in response.json()] == [201, 400, 404]
+        assert test_db.query(WebsiteMember).filter(WebsiteMember.website_id == website.id).count() == 1
+
+    def test_requires_admin(self, client, test_db, invitees, auth_headers):
+        """Test non-admins cannot batch invite"""
+        owner = UserModel(email="other@example.com", hashed_password="x")
+        test_db.add(owner)
+        test_db.flush()
+        foreign = OrganizationModel(name="Other", owner_id=owner.id)
+        test_db.add(foreign)
+        test_db.commit()
+
+        response = client.post(
+            f"/api/organizations/{foreign.id}/invite/batch",
+            json=_invites(invitees, UserRole.ORGANIZATION_USER),
+            headers=auth_headers
+        )
+
+        assert response.status_code == 403
@@ -0,0 +1,131 @@
+# tests/test_bulk_websites.py
+from app.config import settings
+from app.models.organization import Organization as OrganizationModel
+from app.models.website import Website as WebsiteModel
+from app.models.user import User as UserModel, UserRole, WebsiteMember
+
+def _org_id(test_db):
+    return test_db.query(OrganizationModel).first().id
+
+def _foreign_org_id(test_db):
+    owner = UserModel(email="other@example.com", hashed_password="x")
+    test_db.add(owner)
+    test_db.flush()
+    org = OrganizationModel(name="Other", owner_id=owner.id)
+    test_db.add(org)
+    test_db.commit()
+    return org.id
+
+def _site(org_id, n):
+    return {"name": f"Site {n}", "url": f"https://site{n}.example.com", "organization_id": org_id}
+
+class TestBulkWebsites:
+    def test_create_reports_each_entry(self, client, auth_headers, test_db):
+        """Test permitted entries are created and the rest are refused per item"""
+        org_id, foreign_id = _org_id(test_db), _foreign_org_id(test_db)
+        response = client.post(
+            "/websites/bulk",
+            json=[_site(org_id, 1), _site(foreign_id, 2), _site(org_id, 3)],
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["status"] for r in results] == [201, 403, 201]
+        assert [r["index"] for r in results] == [0, 1, 2]
+        created = test_db.query(WebsiteModel).filter(WebsiteModel.id.in_([results[0]["id"], results[2]["id"]]))
+        assert sorted(w.name for w in created) == ["Site 1", "Site 3"]
+
+    def test_create_checks_permissions_once(self, client, auth_headers, test_db, query_counter):
+        """Test everything but the batched insert costs the same for 1 or 50 entries"""
+        org_id = _org_id(test_db)
+        client.post("/websites/bulk", json=[_site(org_id, 0)], headers=auth_headers)
+        # SQLite cannot return ordered ids from one multi-row INSERT, so the
+        # website insert itself is left out; PostgreSQL batches it
+        other = lambda: [q for q in query_counter if not q.startswith("INSERT INTO websites")]
+        query_counter.clear()
+        client.post("/websites/bulk", json=[_site(org_id, 1)], headers=auth_headers)
+        one = len(other())
+
+        query_counter.clear()
+        client.post("/websites/bulk", json=[_site(org_id, n) for n in range(2, 52)], headers=auth_headers)
+
+        assert len(other()) == one
+        assert test_db.query(WebsiteModel).count() == 52
+
+    def test_update_reports_missing_and_forbidden(self, client, auth_headers, test_db):
+        """Test updates apply per item and unknown or foreign ids are reported"""
+        org_id, foreign_id = _org_id(test_db), _foreign_org_id(test_db)
+        mine = WebsiteModel(name="Mine", url="https://mine.example.com", organization_id=org_id)
+        theirs = WebsiteModel(name="Theirs", url="https://theirs.example.com", organization_id=foreign_id)
+        test_db.add_all([mine, theirs])
+        test_db.commit()
+
+        response = client.put(
+            "/websites/bulk",
+            json=[{"id": mine.id, "name": "Renamed"}, {"id": theirs.id, "name": "x"}, {"id": 999, "name": "x"}],
+            headers=auth_headers
+        )
+
+        assert [r["status"] for r in response.json()] == [200, 403, 404]
+        test_db.expire_all()
+        assert mine.name == "Renamed" and mine.url == "https://mine.example.com"
+        assert mine.updated_at is not None
+        assert theirs.name == "Theirs"
+
+    def test_update_reports_nulls_for_required_fields(self, client, auth_headers, test_db):
+        """Test an explicit null for a NOT NULL column is a 422 entry, not a failed batch"""
+        org_id = _org_id(test_db)
+        first = WebsiteModel(name="First", url="https://first.example.com", organization_id=org_id)
+        second = WebsiteModel(name="Second", url="https://second.example.com", organization_id=org_id)
+        test_db.add_all([first, second])
+        test_db.commit()
+
+        response = client.put(
+            "/websites/bulk",
+            json=[
+                {"id": first.id, "name": None},
+                {"id": second.id, "name": "Renamed", "description": None},
+                {"id": first.id, "url": None, "name": None}
+            ],
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["status"] for r in results] == [422, 200, 422]
+        assert results[0]["detail"] == "name cannot be null"
+        assert results[2]["detail"] == "name, url cannot be null"
+        test_db.expire_all()
+        assert first.name == "First" and first.url == "https://first.example.com"
+        assert second.name == "Renamed" and second.description is None
+
+    def test_delete_removes_websites_and_memberships(self, client, auth_headers, test_db):
+        """Test deletes remove memberships too and report foreign ids"""
+        org_id, foreign_id = _org_id(test_db), _foreign_org_id(test_db)
+        mine = WebsiteModel(name="Mine", url="https://mine.example.com", organization_id=org_id)
+        theirs = WebsiteModel(name="Theirs", url="https://theirs.example.com", organization_id=foreign_id)
+        test_db.add_all([mine, theirs])
+        test_db.flush()
+        user = test_db.query(UserModel).filter(UserModel.email == "test@example.com").one()
+        test_db.add(WebsiteMember(user_id=user.id, website_id=mine.id, role=UserRole.WEBSITE_USER))
+        test_db.commit()
+        mine_id, theirs_id = mine.id, theirs.id
+
+        response = client.post("/websites/bulk/delete", json=[mine_id, theirs_id], headers=auth_headers)
+
+        assert [r["status"] for r in response.json()] == [204, 403]
+        test_db.expire_all()
+        assert test_db.get(WebsiteModel, mine_id) is None
+        assert test_db.get(WebsiteModel, theirs_id) is not None
+        assert test_db.query(WebsiteMember).filter(WebsiteMember.website_id == mine_id).count() == 0
+
+    def test_rejects_oversized_requests(self, client, auth_headers, test_db):
+        """Test the entry count is capped"""
+        response = client.post(
+            "/websites/bulk/delete",
+            json=list(range(settings.MAX_BULK_ITEMS + 1)),
+            headers=auth_headers
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,69 @@
+# tests/test_cold_start.py
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Seconds allowed for `import app.main` plus create_app(); override on slow machines
+COLD_START_BUDGET_SECONDS = float(os.environ.get("COLD_START_BUDGET_SECONDS", "3.0"))
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import app.main
+app.main.create_app()
+elapsed = time.perf_counter() - started
+import app.database
+print(json.dumps({"seconds": elapsed, "engine_created": app.database._engine is not None}))
+"""
+
+def _cold_start(tmp_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'cold.db'}")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_import_does_not_touch_database(tmp_path):
+    """Test importing the app creates no engine and no database file"""
+    probe = _cold_start(tmp_path)
+
+    assert probe["engine_created"] is False
+    assert not (tmp_path / "cold.db").exists()
+
+SETTINGS_PROBE = """
+import json
+import app.main
+app.main.create_app()
+import app.config
+print(json.dumps({"settings_read": app.config.get_settings.cache_info().currsize > 0}))
+"""
+
+def test_import_does_not_read_settings(tmp_path):
+    """Test the app imports and builds with no DATABASE_URL, SECRET_KEY or .env"""
+    # Required settings are missing, so any import-time Settings() would raise
+    env = {
+        name: value for name, value in os.environ.items()
+        if name.upper() not in ("DATABASE_URL", "SECRET_KEY", "ALGORITHM", "ACCESS_TOKEN_EXPIRE_MINUTES")
+    }
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    result = subprocess.run(
+        [sys.executable, "-c", SETTINGS_PROBE], cwd=tmp_path, env=env,
+        capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == {"settings_read": False}
+
+def test_cold_start_within_budget(tmp_path):
+    """Test import plus app construction stays under the cold-start budget"""
+    # Best of three keeps a busy machine from failing the check
+    seconds = min(_cold_start(tmp_path)["seconds"] for _ in range(3))
+
+    assert seconds < COLD_START_BUDGET_SECONDS, (
+        f"cold start took {seconds:.2f}s, budget is {COLD_START_BUDGET_SECONDS:.2f}s"
+    )
@@ -0,0 +1,63 @@
+# tests/test_database_async.py
+import asyncio
+import pytest
+from fastapi import Response
+from sqlalchemy import text
+from fastapi import dependencies, routing
+from app.database import get_async_db, to_async_url
+from app.models.user import User
+from app.routers.users import get_user, get_users
+from app.utils.pagination import PageParams
+
+def test_async_url_mapping():
+    """Test sync URLs map onto their async drivers"""
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert to_async_url("postgresql://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+
+def test_async_session_dependency():
+    """Test the async dependency yields a working session"""
+    async def main():
+        async for db in get_async_db():
+            result = await db.execute(text("SELECT 1"))
+            return result.scalar()
+
+    assert asyncio.run(main()) == 1
+
+def test_users_router_is_async(test_db, run_async_db):
+    """Test user routes read through AsyncSession"""
+    user = User(email="async@example.com", hashed_password="hashed")
+    test_db.add(user)
+    test_db.commit()
+
+    users = run_async_db(get_users, Response(), PageParams(limit=10))
+    fetched = run_async_db(get_user, user.id)
+
+    assert [u.email for u in users] == ["async@example.com"]
+    assert fetched.email == "async@example.com"
+
+@pytest.mark.parametrize("path", [
+    "/api/organizations/",
+    "/api/organizations/summary",
+    "/api/organizations/1",
+    "/api/organizations/1/members",
+    "/websites/",
+    "/websites/search?q=async",
+    "/websites/{website_id}",
+    "/websites/{website_id}/members",
+    "/websites/organizations/1/websites",
+])
+def test_read_routes_stay_on_the_event_loop(client, auth_headers, monkeypatch, path):
+    """Test organization and website reads never hand a sync call to the threadpool"""
+    website_id = client.post("/websites/", json={
+        "name": "Async Site", "url": "https://async.example.com", "organization_id": 1
+    }, headers=auth_headers).json()["id"]
+    
+    def forbidden(func, *args, **kwargs):
+        raise AssertionError(f"{func.__name__} ran in the threadpool")
+    
+    monkeypatch.setattr(routing, "run_in_threadpool", forbidden)
+    monkeypatch.setattr(dependencies.utils, "run_in_threadpool", forbidden)
+    
+    response = client.get(path.format(website_id=website_id), headers=auth_headers)
+    
+    assert response.status_code == 200
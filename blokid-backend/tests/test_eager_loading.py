@@ -0,0 +1,78 @@
+# tests/test_eager_loading.py
+import pytest
+from sqlalchemy import exc, select
+from sqlalchemy.orm import selectinload
+from app.config import settings
+from app.database import enable_strict_loading, get_db
+from app.models.organization import Organization
+from app.models.website import Website
+
+def _add_websites(test_db, count):
+    org = test_db.query(Organization).filter(Organization.name == "Test Org").one()
+    test_db.add_all([
+        Website(name=f"Site {i}", url=f"https://{i}.example.com", organization_id=org.id)
+        for i in range(count)
+    ])
+    test_db.commit()
+    return org.id
+
+class TestEagerLoading:
+    @pytest.mark.parametrize("path", ["/websites/", "/websites/organizations/{org_id}/websites"])
+    def test_list_query_count_is_flat(self, client, auth_headers, test_db, query_counter, path):
+        """Test listing websites costs the same number of queries for 1 or 10 rows"""
+        org_id = _add_websites(test_db, 1)
+        # Warm the auth and permission caches so only the listing is counted
+        client.get(path.format(org_id=org_id), headers=auth_headers)
+        query_counter.clear()
+        response = client.get(path.format(org_id=org_id), headers=auth_headers)
+        assert response.status_code == 200
+        one_row = len(query_counter)
+
+        _add_websites(test_db, 9)
+        query_counter.clear()
+        response = client.get(path.format(org_id=org_id), headers=auth_headers)
+
+        assert len(response.json()) == 10
+        assert response.json()[0]["organization"]["owner"]["email"] == "test@example.com"
+        assert len(query_counter) == one_row
+
+    def test_organization_responses_include_owner(self, client, auth_headers):
+        """Test organization list and create serialize the owner without lazy loads"""
+        created = client.post("/api/organizations/", json={"name": "Eager"}, headers=auth_headers)
+        listed = client.get("/api/organizations/", headers=auth_headers)
+
+        assert created.json()["owner"]["email"] == "test@example.com"
+        assert {org["owner"]["email"] for org in listed.json()} == {"test@example.com"}
+
+    def test_strict_mode_rejects_lazy_loads(self, test_db, auth_headers):
+        """Test a relationship missing from the loader options raises in strict mode"""
+        _add_websites(test_db, 1)
+        test_db.expunge_all()
+        enable_strict_loading(test_db)
+
+        website = test_db.query(Website).first()
+        with pytest.raises(exc.InvalidRequestError, match="strict loading"):
+            website.organization
+
+    def test_strict_mode_allows_selectin_loads(self, test_db, auth_headers):
+        """Test eager selectinload queries pass in strict mode while lazy loads still raise"""
+        _add_websites(test_db, 1)
+        test_db.expunge_all()
+        enable_strict_loading(test_db)
+
+        organization = test_db.scalars(
+            select(Organization).options(selectinload(Organization.websites))
+        ).first()
+        website = organization.websites[0]
+
+        assert website.name == "Site 0"
+        with pytest.raises(exc.InvalidRequestError, match="strict loading"):
+            website.organization.owner
+
+    def test_get_db_follows_setting(self, monkeypatch):
+        """Test request sessions are strict only when configured"""
+        monkeypatch.setattr(settings, "STRICT_RELATIONSHIP_LOADING", True)
+        db = next(get_db())
+
+        assert db.info["strict_loading"] is True
+        db.close()
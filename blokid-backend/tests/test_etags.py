@@ -0,0 +1,110 @@
+# tests/test_etags.py
+import pytest
+from app.models.user import OrganizationMember, User as UserModel, UserRole
+from app.utils.auth_cache import invalidate_user
+from app.utils.etags import etag_matches
+
+class TestETags:
+    @pytest.mark.parametrize("path", ["/websites/{website_id}", "/api/organizations/{org_id}"])
+    def test_single_resource_revalidates(self, client, auth_headers, add_website, path):
+        """Test a strong ETag answers 304 until the resource is updated"""
+        org_id, website_id = add_website()
+        url = path.format(org_id=org_id, website_id=website_id)
+        first = client.get(url, headers=auth_headers)
+        etag = first.headers["ETag"]
+
+        assert not etag.startswith("W/")
+        cached = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+        client.put(url, json={"name": "Renamed"}, headers=auth_headers)
+        changed = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["name"] == "Renamed"
+        assert changed.headers["ETag"] != etag
+
+    @pytest.mark.parametrize("path", [
+        "/websites/",
+        "/api/organizations/",
+        "/websites/organizations/{org_id}/websites",
+        "/api/organizations/{org_id}/members",
+    ])
+    def test_collections_use_weak_etags(self, client, auth_headers, test_db, add_website, path):
+        """Test collection ETags are weak and change when rows are added"""
+        org_id, _ = add_website()
+        url = path.format(org_id=org_id)
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+
+        assert etag.startswith("W/")
+        assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+        add_website("Another")
+        client.post("/api/organizations/", json={"name": "Another"}, headers=auth_headers)
+        member = UserModel(email="member@example.com", hashed_password="x")
+        test_db.add(member)
+        test_db.flush()
+        test_db.add(OrganizationMember(
+            user_id=member.id, organization_id=org_id, role=UserRole.ORGANIZATION_USER
+        ))
+        test_db.commit()
+        changed = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    @pytest.mark.parametrize("path", [
+        "/websites/",
+        "/websites/organizations/{org_id}/websites",
+        "/api/organizations/",
+    ])
+    def test_collections_revalidate_when_embedded_rows_change(self, client, auth_headers, test_db, add_website, path):
+        """Test editing the embedded organization or its owner changes collection ETags"""
+        org_id, _ = add_website()
+        url = path.format(org_id=org_id)
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+
+        client.put(f"/api/organizations/{org_id}", json={"name": "Renamed"}, headers=auth_headers)
+        renamed = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert renamed.status_code == 200
+        etag = renamed.headers["ETag"]
+
+        owner = test_db.query(UserModel).filter(UserModel.email == "test@example.com").one()
+        owner.is_verified = True
+        test_db.commit()
+        # As the user update route does, so the request does not reuse the cached principal
+        invalidate_user(owner.email)
+        verified = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert verified.status_code == 200
+        body = verified.json()[0]
+        owner_body = body["owner"] if "owner" in body else body["organization"]["owner"]
+        assert owner_body["is_verified"] is True
+
+    def test_collection_etag_varies_by_page(self, client, auth_headers, add_website):
+        """Test each page of a collection gets its own validator"""
+        add_website()
+        add_website("Another")
+        first = client.get("/websites/?limit=1", headers=auth_headers)
+        second = client.get(
+            f"/websites/?limit=1&cursor={first.headers['X-Next-Cursor']}", headers=auth_headers
+        )
+
+        assert first.headers["ETag"] != second.headers["ETag"]
+
+    def test_etag_varies_by_encoding(self, client, auth_headers, add_website):
+        """Test JSON and MessagePack representations carry different ETags"""
+        _, website_id = add_website()
+        as_json = client.get(f"/websites/{website_id}", headers=auth_headers)
+        as_msgpack = client.get(
+            f"/websites/{website_id}", headers={**auth_headers, "Accept": "application/msgpack"}
+        )
+
+        assert as_json.headers["ETag"] != as_msgpack.headers["ETag"]
+
+    def test_if_none_match_parsing(self):
+        """Test lists, weak prefixes and the wildcard all match"""
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches('"b"', 'W/"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
@@ -0,0 +1,117 @@
+# tests/test_member_listing.py
+import pytest
+from app.models.organization import Organization
+from app.models.user import OrganizationMember, User, UserRole, WebsiteMember
+from app.models.website import Website
+
+@pytest.fixture()
+def members(test_db, auth_headers):
+    """Fixture adding five organization and website members with alternating roles"""
+    org = test_db.query(Organization).one()
+    website = Website(name="Site", url="https://site.example.com", organization_id=org.id)
+    test_db.add(website)
+    users = [
+        User(email=f"member{index}@example.com", hashed_password="x", is_active=index != 2)
+        for index in range(5)
+    ]
+    test_db.add_all(users)
+    test_db.flush()
+    for index, user in enumerate(users):
+        test_db.add(OrganizationMember(
+            user_id=user.id, organization_id=org.id,
+            role=UserRole.ORGANIZATION_ADMIN if index % 2 else UserRole.ORGANIZATION_USER
+        ))
+        test_db.add(WebsiteMember(
+            user_id=user.id, website_id=website.id,
+            role=UserRole.WEBSITE_ADMIN if index % 2 else UserRole.WEBSITE_USER
+        ))
+    test_db.commit()
+    return org.id, website.id
+
+class TestMemberListing:
+    def test_members_include_account_details(self, client, auth_headers, members):
+        """Test each member carries the user's email and status"""
+        org_id, website_id = members
+        response = client.get(f"/websites/{website_id}/members", headers=auth_headers)
+
+        assert response.status_code == 200
+        listed = response.json()
+        assert [member["email"] for member in listed] == [f"member{index}@example.com" for index in range(5)]
+        assert [member["is_active"] for member in listed] == [True, True, False, True, True]
+        assert set(listed[0]) == {"user_id", "email", "is_active", "is_verified", "role", "joined_at"}
+
+    def test_page_is_one_joined_query(self, client, auth_headers, members, query_counter):
+        """Test a page of members costs a single SELECT however many members it lists"""
+        org_id, _ = members
+        query_counter.clear()
+        response = client.get(f"/api/organizations/{org_id}/members", headers=auth_headers)
+
+        assert len(response.json()) == 6
+        pages = [statement for statement in query_counter if "FROM organization_members JOIN users" in statement]
+        assert len(pages) == 2  # ETag aggregate and the page itself
+        # Plus the current user and the permission snapshot (2)
+        assert len(query_counter) == 5
+
+    @pytest.mark.parametrize("path, role, expected", [
+        ("/api/organizations/{org_id}/members", "organization_admin", [
+            "test@example.com", "member1@example.com", "member3@example.com"
+        ]),
+        ("/websites/{website_id}/members", "website_user", [
+            "member0@example.com", "member2@example.com", "member4@example.com"
+        ]),
+    ])
+    def test_role_filter(self, client, auth_headers, members, path, role, expected):
+        """Test the role parameter narrows the listing"""
+        org_id, website_id = members
+        url = path.format(org_id=org_id, website_id=website_id)
+        response = client.get(url, params={"role": role}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert [member["email"] for member in response.json()] == expected
+        assert {member["role"] for member in response.json()} == {role}
+        assert client.get(url, params={"role": "owner"}, headers=auth_headers).status_code == 422
+
+    def test_filtered_pages_follow_cursor(self, client, auth_headers, members):
+        """Test cursor pages of a role-filtered listing cover every match once"""
+        _, website_id = members
+        url = f"/websites/{website_id}/members"
+        params = {"role": "website_user", "limit": 2}
+        first = client.get(url, params=params, headers=auth_headers)
+        second = client.get(
+            url, params={**params, "cursor": first.headers["X-Next-Cursor"]}, headers=auth_headers
+        )
+
+        assert [member["email"] for member in first.json() + second.json()] == [
+            "member0@example.com", "member2@example.com", "member4@example.com"
+        ]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_etag_changes_when_member_account_changes(self, client, auth_headers, members, test_db):
+        """Test editing a member's account revalidates the listing that shows it"""
+        _, website_id = members
+        url = f"/websites/{website_id}/members"
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+
+        user = test_db.query(User).filter(User.email == "member2@example.com").one()
+        user.is_active = True
+        test_db.commit()
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json()[2]["is_active"] is True
+
+    def test_listing_seeks_on_composite_index(self, test_db, members):
+        """Test the page query is answered by the (parent, created_at, id) index without sorting"""
+        org_id, website_id = members
+        for table, column, parent_id in [
+            ("organization_members", "organization_id", org_id),
+            ("website_members", "website_id", website_id),
+        ]:
+            plan = [row[-1] for row in test_db.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN SELECT m.id, users.email FROM {table} AS m "
+                f"JOIN users ON users.id = m.user_id WHERE m.{column} = ? "
+                f"ORDER BY m.created_at, m.id LIMIT 3", (parent_id,)
+            )]
+
+            assert any(f"ix_{table}_{column}_created_at_id" in step for step in plan)
+            assert not any("TEMP B-TREE" in step for step in plan)
@@ -0,0 +1,45 @@
+# tests/test_migrations.py
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from pathlib import Path
+from sqlalchemy import create_engine, inspect
+from app.database import Base
+from app.models.website import is_search_object
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def _alembic_config(url):
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+def test_migrations_match_models(tmp_path):
+    """Test upgrading to head yields exactly the schema the models declare"""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    command.upgrade(_alembic_config(url), "head")
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={
+            "include_object": lambda obj, name, type_, reflected, compare_to: not is_search_object(name)
+        })
+        diff = compare_metadata(context, Base.metadata)
+        indexes = {index["name"]: index for index in inspect(connection).get_indexes("organization_members")}
+    engine.dispose()
+
+    assert diff == []
+    assert indexes["ix_organization_members_user_id_organization_id"]["unique"]
+
+def test_migrations_downgrade_cleanly(tmp_path):
+    """Test every migration can be rolled back"""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = _alembic_config(url)
+    command.upgrade(config, "head")
+    command.downgrade(config, "base")
+
+    engine = create_engine(url)
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
@@ -0,0 +1,102 @@
+# tests/test_organization_summary.py
+import pytest
+from datetime import datetime
+from app.models.organization import Organization
+from app.models.user import OrganizationMember, User, UserRole
+from app.models.website import Website
+
+@pytest.fixture()
+def organizations(test_db, auth_headers):
+    """Fixture giving the test user two organizations with websites and members"""
+    owner = test_db.query(User).filter(User.email == "test@example.com").one()
+    first = test_db.query(Organization).one()
+    second = Organization(name="Second Org", owner_id=owner.id)
+    test_db.add(second)
+    test_db.flush()
+    test_db.add(OrganizationMember(user_id=owner.id, organization_id=second.id, role=UserRole.ORGANIZATION_USER))
+    test_db.add_all([
+        Website(name=f"Site {index}", url=f"https://site{index}.example.com", organization_id=first.id)
+        for index in range(3)
+    ])
+    members = [User(email=f"member{index}@example.com", hashed_password="x") for index in range(3)]
+    test_db.add_all(members)
+    test_db.flush()
+    test_db.add_all([
+        OrganizationMember(user_id=member.id, organization_id=first.id, role=UserRole.ORGANIZATION_USER)
+        for member in members
+    ])
+    test_db.commit()
+    return first.id, second.id
+
+class TestOrganizationSummary:
+    def test_summarizes_every_readable_organization(self, client, auth_headers, organizations):
+        """Test counts per organization, with zero for roles and websites it lacks"""
+        first_id, second_id = organizations
+        response = client.get("/api/organizations/summary", headers=auth_headers)
+
+        assert response.status_code == 200
+        summaries = {summary["organization_id"]: summary for summary in response.json()}
+        assert summaries[first_id]["website_count"] == 3
+        assert summaries[first_id]["member_counts"] == {"organization_admin": 1, "organization_user": 3}
+        assert summaries[second_id]["website_count"] == 0
+        assert summaries[second_id]["member_counts"] == {"organization_admin": 0, "organization_user": 1}
+
+    def test_last_updated_at_follows_websites(self, client, auth_headers, organizations, test_db):
+        """Test a website edit moves its organization's last change"""
+        first_id, _ = organizations
+        website = test_db.query(Website).filter(Website.organization_id == first_id).first()
+        client.put(f"/websites/{website.id}", json={"name": "Renamed"}, headers=auth_headers)
+        test_db.expire_all()
+        website = test_db.get(Website, website.id)
+
+        response = client.get(f"/api/organizations/summary?organization_id={first_id}", headers=auth_headers)
+
+        [summary] = response.json()
+        assert datetime.fromisoformat(summary["last_updated_at"]) == website.updated_at
+
+    def test_selected_organizations_must_be_readable(self, client, auth_headers, organizations, test_db):
+        """Test asking for an organization outside the user's access is refused"""
+        first_id, _ = organizations
+        outsider = User(email="outsider@example.com", hashed_password="x")
+        test_db.add(outsider)
+        test_db.flush()
+        foreign = Organization(name="Foreign", owner_id=outsider.id)
+        test_db.add(foreign)
+        test_db.commit()
+
+        response = client.get(
+            "/api/organizations/summary",
+            params={"organization_id": [first_id, foreign.id]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 403
+
+    def test_pages_follow_cursor(self, client, auth_headers, organizations):
+        """Test summaries of all organizations page like the organization list"""
+        first = client.get("/api/organizations/summary?limit=1", headers=auth_headers)
+        second = client.get(
+            f"/api/organizations/summary?limit=1&cursor={first.headers['X-Next-Cursor']}", headers=auth_headers
+        )
+
+        assert [summary["organization_id"] for summary in first.json() + second.json()] == list(organizations)
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_query_count_is_independent_of_tenant_size(self, client, auth_headers, organizations, test_db, query_counter):
+        """Test the summary runs grouped aggregates, never one query per row"""
+        first_id, _ = organizations
+        client.get("/api/organizations/summary", headers=auth_headers)
+        baseline = len(query_counter)
+
+        test_db.add_all([
+            Website(name=f"More {index}", url=f"https://more{index}.example.com", organization_id=first_id)
+            for index in range(20)
+        ])
+        test_db.commit()
+        query_counter.clear()
+        response = client.get("/api/organizations/summary", headers=auth_headers)
+
+        assert response.json()[0]["website_count"] == 23
+        assert len(query_counter) <= baseline
+        assert not any(statement.lstrip().startswith("SELECT websites.id") for statement in query_counter)
+        assert sum("GROUP BY" in statement for statement in query_counter) == 2
@@ -0,0 +1,77 @@
+# tests/test_pagination.py
+from datetime import datetime
+from app.models.user import User, OrganizationMember, UserRole
+from app.models.organization import Organization
+from app.models.website import Website
+from app.utils.pagination import decode_cursor, encode_cursor
+
+def _follow(client, path, headers, limit):
+    """Collect every page of a collection route"""
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+class TestPagination:
+    def test_cursor_round_trip(self):
+        """Test cursors are opaque but carry (created_at, id)"""
+        created_at = datetime(2026, 1, 2, 3, 4, 5, 678901)
+        cursor = encode_cursor(created_at, 42)
+
+        assert "42" not in cursor
+        assert decode_cursor(cursor) == (created_at, 42)
+
+    def test_invalid_cursor_is_rejected(self, client, auth_headers):
+        """Test a malformed cursor is a client error, not a 500"""
+        response = client.get("/websites/?cursor=not-a-cursor", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+    def test_ties_on_created_at_break_by_id(self, client, test_db, auth_headers):
+        """Test rows sharing a timestamp are neither skipped nor repeated"""
+        org = test_db.query(Organization).first()
+        same_instant = datetime(2026, 1, 1, 12, 0, 0)
+        test_db.add_all([
+            Website(name=f"Tied {i}", url="https://tied.example.com",
+                    organization_id=org.id, created_at=same_instant)
+            for i in range(5)
+        ])
+        test_db.commit()
+
+        pages = _follow(client, f"/websites/organizations/{org.id}/websites", auth_headers, 2)
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [w["name"] for page in pages for w in page] == [f"Tied {i}" for i in range(5)]
+
+    def test_every_collection_route_pages(self, client, test_db, auth_headers):
+        """Test organizations and member lists page with the same cursor protocol"""
+        owner = test_db.query(User).filter(User.email == "test@example.com").one()
+        org = test_db.query(Organization).first()
+        website = Website(name="Site", url="https://site.example.com", organization_id=org.id)
+        extra_orgs = [Organization(name=f"Extra {i}", owner_id=owner.id) for i in range(2)]
+        test_db.add_all([website] + extra_orgs)
+        test_db.commit()
+        members = [User(email=f"member{i}@example.com", hashed_password="hashed") for i in range(3)]
+        test_db.add_all(members)
+        test_db.commit()
+        test_db.add_all(
+            [OrganizationMember(user_id=owner.id, organization_id=o.id, role=UserRole.ORGANIZATION_ADMIN)
+             for o in extra_orgs]
+            + [OrganizationMember(user_id=m.id, organization_id=org.id, role=UserRole.ORGANIZATION_USER)
+               for m in members]
+        )
+        test_db.commit()
+
+        organizations = _follow(client, "/api/organizations/", auth_headers, 2)
+        org_members = _follow(client, f"/api/organizations/{org.id}/members", auth_headers, 3)
+        website_members = _follow(client, f"/websites/{website.id}/members", auth_headers, 3)
+
+        assert [len(page) for page in organizations] == [2, 1]
+        assert [len(page) for page in org_members] == [3, 1]
+        assert website_members == [[]]
@@ -0,0 +1,60 @@
+# tests/test_password_hasher.py
+import asyncio
+import os
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from app.utils.password_hasher import PasswordHasher
+from app.utils.security import password_hasher
+
+def test_process_pool_round_trip():
+    """Test hashing and verification through pool workers"""
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+
+    async def run():
+        hashed = await hasher.hash("testpassword123")
+        return (
+            await hasher.verify("testpassword123", hashed),
+            await hasher.verify("wrongpassword", hashed),
+        )
+
+    try:
+        assert asyncio.run(run()) == (True, False)
+    finally:
+        hasher.shutdown()
+
+def test_broken_pool_is_replaced():
+    """Test a pool whose worker died is rebuilt instead of failing every later call"""
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+    broken = hasher._get_executor()
+    # The worker exits mid-task, as it would when OOM-killed
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result()
+
+    try:
+        hashed = asyncio.run(hasher.hash("testpassword123"))
+        assert asyncio.run(hasher.verify("testpassword123", hashed))
+        assert hasher._executor is not broken
+    finally:
+        hasher.shutdown()
+
+def test_saturated_pool_rejects_fast():
+    """Test requests beyond the queue depth get a 503"""
+    hasher = PasswordHasher(max_workers=0, max_pending=0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(hasher.hash("testpassword123"))
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert hasher.rejected == 1
+    assert hasher.pending == 0
+
+def test_login_returns_503_when_saturated(client, monkeypatch):
+    """Test login floods are shed instead of queued"""
+    client.post("/auth/register", json={"email": "busy@example.com", "password": "testpass123"})
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = client.post("/auth/login", json={"email": "busy@example.com", "password": "testpass123"})
+
+    assert response.status_code == 503
@@ -0,0 +1,88 @@
+# tests/test_permission_snapshot.py
+import pytest
+from app.services.permission_service import PermissionService
+from app.services.organization_service import OrganizationService
+from app.services.website_service import WebsiteService
+from app.models.user import User, OrganizationMember, UserRole
+from app.models.organization import Organization
+from app.models.website import Website
+
+@pytest.fixture()
+def tenant(test_db):
+    admin = User(email="snapshot-admin@example.com", hashed_password="hashed")
+    member = User(email="snapshot-member@example.com", hashed_password="hashed")
+    test_db.add_all([admin, member])
+    test_db.commit()
+    org = Organization(name="Snapshot Org", owner_id=admin.id)
+    test_db.add(org)
+    test_db.commit()
+    website = Website(name="Site", url="https://site.example.com", organization_id=org.id)
+    test_db.add(website)
+    test_db.add(OrganizationMember(
+        user_id=admin.id, organization_id=org.id, role=UserRole.ORGANIZATION_ADMIN
+    ))
+    test_db.commit()
+    # Load expired attributes so query counts only see permission queries
+    test_db.refresh(admin)
+    test_db.refresh(member)
+    test_db.refresh(org)
+    test_db.refresh(website)
+    return admin, member, org, website
+
+class TestPermissionSnapshot:
+    def test_checks_answer_from_snapshot(self, test_db, tenant, query_counter):
+        """Test repeated checks reuse one snapshot"""
+        admin, _, org, website = tenant
+        permission_service = PermissionService(test_db)
+
+        query_counter.clear()
+        assert permission_service.can_manage_organization(admin, org.id)
+        assert permission_service.can_read_website(admin, website.id)
+        assert permission_service.can_update_website(admin, website.id)
+        assert permission_service.can_manage_website(admin, website.id)
+        assert permission_service.can_create_website_in_organization(admin, org.id)
+
+        # One organization query, one website-membership query, one website lookup
+        assert len(query_counter) == 3
+
+    def test_snapshot_is_shared_across_requests(self, test_db, tenant, query_counter):
+        """Test a new service instance reuses the cached snapshot"""
+        admin, _, org, website = tenant
+        PermissionService(test_db).can_read_website(admin, website.id)
+
+        query_counter.clear()
+        assert PermissionService(test_db).can_manage_website(admin, website.id)
+        assert query_counter == []
+
+    def test_invite_invalidates_snapshot(self, test_db, tenant):
+        """Test the invitee sees their new role immediately"""
+        admin, member, org, website = tenant
+        assert not PermissionService(test_db).can_read_organization(member, org.id)
+
+        OrganizationService(test_db).invite_user_to_organization(
+            org.id, member.email, UserRole.ORGANIZATION_USER, admin
+        )
+
+        permission_service = PermissionService(test_db)
+        assert permission_service.can_read_organization(member, org.id)
+        assert not permission_service.can_manage_organization(member, org.id)
+        assert not permission_service.can_update_website(member, website.id)
+
+    def test_website_invite_and_delete_invalidate(self, test_db, tenant):
+        """Test website membership changes reach the snapshot"""
+        admin, member, _, website = tenant
+        WebsiteService(test_db).invite_user_to_website(
+            website.id, member.email, UserRole.WEBSITE_USER, admin
+        )
+        assert PermissionService(test_db).can_update_website(member, website.id)
+
+        WebsiteService(test_db).delete_website(website.id, admin)
+
+        assert not PermissionService(test_db).can_read_website(member, website.id)
+        assert not PermissionService(test_db).can_read_website(admin, website.id)
+
+    def test_missing_website_is_denied(self, test_db, tenant):
+        """Test checks against unknown websites fail closed"""
+        admin, _, _, _ = tenant
+
+        assert not PermissionService(test_db).can_read_website(admin, 9999)
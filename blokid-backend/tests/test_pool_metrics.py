@@ -0,0 +1,75 @@
+# tests/test_pool_metrics.py
+import asyncio
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import settings
+from app.database import create_db_engine, engine_options
+from app.utils.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, pool_status
+
+def test_engine_options_follow_settings(monkeypatch):
+    """Test pool settings are read from Settings"""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_POOL_USE_LIFO", True)
+
+    options = engine_options("postgresql://u:p@localhost/db")
+
+    assert options["pool_size"] == 3
+    assert options["pool_use_lifo"] is True
+    assert "pool_size" not in engine_options("sqlite://")
+
+def test_null_pool_option(monkeypatch, tmp_path):
+    """Test the external-pooler mode disables pooling"""
+    monkeypatch.setattr(settings, "DB_USE_NULL_POOL", True)
+
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'null_pool.db'}")
+
+    assert pool_status(engine)["pool"] == "NullPool"
+
+def test_pool_status_reports_occupancy(tmp_path):
+    """Test checked-out, idle and overflow connections and wait times"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.05
+    )
+    first = engine.connect()
+    second = engine.connect()
+
+    status = pool_status(engine)
+    assert status["checked_out"] == 2
+    assert status["overflow"] == 1
+    assert status["checkouts"] == 2
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert pool_status(engine)["timeouts"] == 1
+
+    second.close()
+    first.close()
+    assert pool_status(engine)["idle"] == 1
+
+def test_async_pool_status_reports_waits(tmp_path):
+    """Test async engines record checkouts like sync ones"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncAdaptedQueuePool, pool_size=1, max_overflow=0
+    )
+
+    async def run():
+        async with engine.connect():
+            status = pool_status(engine)
+        await engine.dispose()
+        return status
+
+    status = asyncio.run(run())
+    assert status["pool"] == "InstrumentedAsyncAdaptedQueuePool"
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+
+def test_db_pool_endpoint(client):
+    """Test the pool metrics endpoint"""
+    response = client.get("/health/db-pool")
+
+    assert response.status_code == 200
+    assert response.json()["primary"]["pool"] == "InstrumentedQueuePool"
+    assert "primary_async" in response.json()
@@ -0,0 +1,154 @@
+# tests/test_principal_claims.py
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from app.config import settings
+from app.models.user import User, OrganizationMember, UserRole
+from app.models.organization import Organization
+from app.routers.users import update_user
+from app.schemas.user import UserUpdate
+from app.services.auth_service import AuthService
+from app.services.organization_service import OrganizationService
+from app.services.permission_service import clear_permission_caches
+from app.utils.auth_cache import principal_cache, token_version_floors
+from app.utils.dependencies import get_current_principal
+from app.utils.principal import bump_token_versions
+from app.utils.unit_of_work import unit_of_work
+from app.utils.security import decode_token
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+@pytest.fixture()
+def org_admin(test_db):
+    user = User(email="claims@example.com", hashed_password="hashed")
+    test_db.add(user)
+    test_db.commit()
+    org = Organization(name="Claims Org", owner_id=user.id)
+    test_db.add(org)
+    test_db.commit()
+    test_db.add(OrganizationMember(
+        user_id=user.id,
+        organization_id=org.id,
+        role=UserRole.ORGANIZATION_ADMIN
+    ))
+    test_db.commit()
+    return user, org
+
+class TestPrincipalClaims:
+    def test_embedded_claims_skip_database(self, test_db, org_admin, monkeypatch, query_counter):
+        """Test principal is rebuilt from the token alone"""
+        user, org = org_admin
+        monkeypatch.setattr(settings, "TOKEN_EMBED_PRINCIPAL", True)
+        token = AuthService(test_db).create_user_token(user)
+        # The first request also reads recent revocations; later ones within the interval don't
+        get_current_principal(_credentials(token), test_db)
+
+        query_counter.clear()
+        principal = get_current_principal(_credentials(token), test_db)
+
+        assert query_counter == []
+        assert principal.id == user.id
+        assert principal.email == "claims@example.com"
+        assert principal.organization_roles == {org.id: UserRole.ORGANIZATION_ADMIN}
+        assert principal.website_roles == {}
+
+    def test_routes_authenticate_from_claims(self, client, test_db, org_admin, monkeypatch, query_counter):
+        """Test guarded sync and async routes make no user or membership queries"""
+        user, org = org_admin
+        monkeypatch.setattr(settings, "TOKEN_EMBED_PRINCIPAL", True)
+        headers = {"Authorization": f"Bearer {AuthService(test_db).create_user_token(user)}"}
+        # The first request also reads recent revocations; later ones within the interval don't
+        client.get("/api/organizations/", headers=headers)
+        principal_cache.clear()
+        clear_permission_caches()
+
+        query_counter.clear()
+        read = client.get(f"/api/organizations/{org.id}", headers=headers)
+        update = client.put(f"/api/organizations/{org.id}", headers=headers, json={"name": "Renamed"})
+
+        assert read.status_code == 200
+        assert update.status_code == 200
+        assert not [
+            statement for statement in query_counter
+            if "FROM users" in statement or "members" in statement
+        ]
+
+    def test_plain_tokens_fall_back_to_database(self, test_db, org_admin):
+        """Test tokens without embedded claims still resolve"""
+        user, org = org_admin
+        token = AuthService(test_db).create_user_token(user)
+
+        principal = get_current_principal(_credentials(token), test_db)
+
+        assert principal.id == user.id
+        assert principal.organization_roles == {org.id: UserRole.ORGANIZATION_ADMIN}
+
+    def test_deactivation_revokes_old_tokens(self, test_db, org_admin, monkeypatch, run_async_db):
+        """Test bumping token_version rejects previously issued tokens"""
+        user, _ = org_admin
+        monkeypatch.setattr(settings, "TOKEN_EMBED_PRINCIPAL", True)
+        token = AuthService(test_db).create_user_token(user)
+
+        run_async_db(update_user, user.id, UserUpdate(is_active=False))
+
+        assert user.token_version == 1
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_principal(_credentials(token), test_db)
+        assert exc_info.value.status_code == 401
+
+    def test_rolled_back_bump_keeps_tokens_valid(self, test_db, org_admin, monkeypatch):
+        """Test a bump inside a failed unit of work leaves no floor behind"""
+        user, _ = org_admin
+        monkeypatch.setattr(settings, "TOKEN_EMBED_PRINCIPAL", True)
+        token = AuthService(test_db).create_user_token(user)
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work(test_db).begin():
+                bump_token_versions(test_db, [user.id])
+                raise RuntimeError("delete failed")
+
+        assert token_version_floors.get(user.id) is None
+        assert get_current_principal(_credentials(token), test_db).id == user.id
+
+    def test_mass_revocation_keeps_every_floor(self, test_db, org_admin, monkeypatch):
+        """Test revoking more users than the principal cache holds evicts no floor"""
+        user, org = org_admin
+        monkeypatch.setattr(settings, "PRINCIPAL_CACHE_SIZE", 5)
+        members = [User(email=f"member{n}@example.com", hashed_password="x") for n in range(30)]
+        test_db.add_all(members)
+        test_db.flush()
+        test_db.add_all([
+            OrganizationMember(user_id=member.id, organization_id=org.id, role=UserRole.ORGANIZATION_USER)
+            for member in members
+        ])
+        test_db.commit()
+
+        OrganizationService(test_db).delete_organization(org.id, user)
+
+        assert all(token_version_floors.get(member.id) == 1 for member in members)
+
+    def test_bumps_from_other_processes_are_synced(self, test_db, org_admin, monkeypatch):
+        """Test a version bumped without this process's floors is read back from the database"""
+        user, _ = org_admin
+        monkeypatch.setattr(settings, "TOKEN_EMBED_PRINCIPAL", True)
+        monkeypatch.setattr(settings, "TOKEN_REVOCATION_SYNC_SECONDS", 0)
+        token = AuthService(test_db).create_user_token(user)
+        get_current_principal(_credentials(token), test_db)
+
+        # Another worker's bump: committed to the database, never seen locally
+        user.token_version = 1
+        test_db.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_principal(_credentials(token), test_db)
+        assert exc_info.value.status_code == 401
+
+    def test_default_token_only_carries_subject(self, test_db, org_admin):
+        """Test the stateless mode is opt-in"""
+        user, _ = org_admin
+        token = AuthService(test_db).create_user_token(user)
+
+        claims = decode_token(token)
+        assert claims["sub"] == "claims@example.com"
+        assert "uid" not in claims
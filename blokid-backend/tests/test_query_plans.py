@@ -0,0 +1,80 @@
+# tests/test_query_plans.py
+import re
+import pytest
+from sqlalchemy import event
+from app.models.user import User, OrganizationMember, WebsiteMember, UserRole
+from app.models.organization import Organization
+from app.models.website import Website
+from app.services.permission_service import PermissionService
+from app.utils.pagination import PageParams
+from tests.conftest import engine
+
+# EXPLAIN QUERY PLAN and its SCAN/SEARCH steps are SQLite's
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="asserts on SQLite query plans")
+
+# A plan step reading a whole table, or an index SQLite had to build on the fly
+FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)|AUTOMATIC (COVERING |PARTIAL )?INDEX")
+
+def full_scans(db, statements):
+    """EXPLAIN each captured statement and return the offending plan steps"""
+    offenders = []
+    connection = db.connection()
+    for statement, parameters in statements:
+        for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+            if FULL_SCAN.search(row[-1]):
+                offenders.append((row[-1], statement))
+    return offenders
+
+@pytest.fixture()
+def captured_statements(test_db):
+    """Fixture capturing statements and parameters sent on the test session's engine"""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+    
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+@pytest.fixture()
+def member(test_db):
+    user = User(email="plans@example.com", hashed_password="hashed")
+    test_db.add(user)
+    test_db.commit()
+    org = Organization(name="Plans Org", owner_id=user.id)
+    test_db.add(org)
+    test_db.commit()
+    website = Website(name="Site", url="https://plans.example.com", organization_id=org.id)
+    test_db.add(website)
+    test_db.commit()
+    test_db.add_all([
+        OrganizationMember(user_id=user.id, organization_id=org.id, role=UserRole.ORGANIZATION_USER),
+        WebsiteMember(user_id=user.id, website_id=website.id, role=UserRole.WEBSITE_ADMIN),
+    ])
+    test_db.commit()
+    return user, org, website
+
+class TestPermissionQueryPlans:
+    def test_permission_queries_use_indexes(self, test_db, member, captured_statements):
+        """Test no PermissionService query falls back to a full table scan"""
+        user, org, website = member
+        permission_service = PermissionService(test_db)
+
+        captured_statements.clear()
+        permission_service.can_manage_organization(user, org.id)
+        permission_service.can_read_website(user, website.id)
+        permission_service.can_read_website(user, 9999)
+        permission_service.get_user_organizations(user)
+        permission_service.get_user_websites(user, PageParams(limit=10))
+
+        assert captured_statements
+        assert full_scans(test_db, captured_statements) == []
+
+    def test_harness_detects_full_scans(self, test_db, member):
+        """Test the checker flags an unindexed filter"""
+        offenders = full_scans(test_db, [("SELECT id FROM websites WHERE name = ?", ("Site",))])
+
+        assert [plan for plan, _ in offenders] == ["SCAN websites"]
@@ -0,0 +1,156 @@
+# tests/test_read_replicas.py
+import sqlite3
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from app.config import settings
+from app.models.website import Website as WebsiteModel
+from app.utils import replicas
+from tests.conftest import engine
+
+# Replicas are file copies of the primary made with SQLite's backup API
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="copies a SQLite primary")
+PRIMARY_PATH = engine.url.database
+
+@pytest.fixture()
+def configure_replicas(monkeypatch, client):
+    """Fixture pointing the replica set at the given URLs"""
+    def configure(*urls):
+        monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", ",".join(urls))
+        monkeypatch.setattr(replicas, "_replica_set", None)
+        # Setup writes would otherwise pin the test client to the primary
+        client.cookies.clear()
+    return configure
+
+@pytest.fixture()
+def website_with_replica(client, auth_headers, tmp_path):
+    """Fixture creating a website, then a replica copy where its name differs"""
+    response = client.post("/websites/", json={
+        "name": "Primary Name", "url": "https://replica.example.com", "organization_id": 1
+    }, headers=auth_headers)
+    website_id = response.json()["id"]
+
+    replica_path = tmp_path / "replica.db"
+    with sqlite3.connect(PRIMARY_PATH) as source, sqlite3.connect(replica_path) as target:
+        source.backup(target)
+    replica_engine = create_engine(f"sqlite:///{replica_path}")
+    with replica_engine.begin() as connection:
+        connection.execute(text("UPDATE websites SET name = 'Replica Name'"))
+    replica_engine.dispose()
+    return website_id, f"sqlite:///{replica_path}"
+
+class TestReadReplicas:
+    def test_reads_go_to_replica(self, client, auth_headers, website_with_replica, configure_replicas):
+        """Test read routes are served from the replica"""
+        _, replica_url = website_with_replica
+        configure_replicas(replica_url)
+
+        response = client.get("/websites/", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()[0]["name"] == "Replica Name"
+
+    def test_read_your_writes(self, client, auth_headers, website_with_replica, configure_replicas):
+        """Test a user's reads stay on the primary right after they write"""
+        website_id, replica_url = website_with_replica
+        configure_replicas(replica_url)
+
+        client.put(f"/websites/{website_id}", json={"name": "Updated"}, headers=auth_headers)
+        response = client.get(f"/websites/{website_id}", headers=auth_headers)
+
+        assert response.json()["name"] == "Updated"
+
+    def test_read_your_writes_follows_the_client(
+        self, client, auth_headers, website_with_replica, configure_replicas
+    ):
+        """Test the write marker travels with the client, so any worker honours it"""
+        website_id, replica_url = website_with_replica
+        configure_replicas(replica_url)
+        client.put(f"/websites/{website_id}", json={"name": "Updated"}, headers=auth_headers)
+        cookie = client.cookies[replicas.LAST_WRITE_COOKIE]
+        client.cookies.clear()
+        # Nothing is remembered server-side: without the cookie the read uses the replica
+        assert client.get("/websites/", headers=auth_headers).json()[0]["name"] == "Replica Name"
+
+        client.cookies.set(replicas.LAST_WRITE_COOKIE, cookie)
+        response = client.get("/websites/", headers=auth_headers)
+
+        assert response.json()[0]["name"] == "Updated"
+
+    def test_failed_or_anonymous_writes_set_no_marker(self, client, auth_headers, website_with_replica):
+        """Test only successful authenticated writes pin reads to the primary"""
+        website_id, _ = website_with_replica
+        client.cookies.clear()
+
+        client.put(f"/websites/{website_id}", json={"name": "Updated"})
+        client.put("/websites/999999", json={"name": "Missing"}, headers=auth_headers)
+
+        assert replicas.LAST_WRITE_COOKIE not in client.cookies
+
+    def test_stale_or_forged_write_marker_is_ignored(
+        self, client, auth_headers, website_with_replica, configure_replicas
+    ):
+        """Test expired and future timestamps do not pin reads to the primary"""
+        _, replica_url = website_with_replica
+        configure_replicas(replica_url)
+        now = time.time()
+
+        for written_at in (now - settings.READ_YOUR_WRITES_SECONDS - 1, now + 3600, "garbage"):
+            client.cookies.set(replicas.LAST_WRITE_COOKIE, str(written_at))
+            response = client.get("/websites/", headers=auth_headers)
+            assert response.json()[0]["name"] == "Replica Name"
+
+    def test_cache_misses_read_the_primary(
+        self, client, auth_headers, test_db, website_with_replica, configure_replicas
+    ):
+        """Test cached bodies are filled from the primary, never from a lagging replica"""
+        website_id, replica_url = website_with_replica
+        configure_replicas(replica_url)
+        assert client.get(f"/websites/{website_id}", headers=auth_headers).json()["name"] == "Primary Name"
+
+        # Changed behind the cache's back: a hit must not touch either database
+        test_db.query(WebsiteModel).filter(WebsiteModel.id == website_id).update({"name": "Uncached"})
+        test_db.commit()
+        response = client.get(f"/websites/{website_id}", headers=auth_headers)
+
+        assert response.json()["name"] == "Primary Name"
+
+    def test_recent_writer_skips_cached_bodies(
+        self, client, auth_headers, test_db, website_with_replica, configure_replicas
+    ):
+        """Test a user who just wrote reads the primary, not a body cached before the write"""
+        website_id, replica_url = website_with_replica
+        client.get(f"/websites/{website_id}", headers=auth_headers)
+        # Written by another worker, whose eviction never reaches this one's cache
+        test_db.query(WebsiteModel).filter(WebsiteModel.id == website_id).update({"name": "Elsewhere"})
+        test_db.commit()
+        configure_replicas(replica_url)
+        client.post("/websites/", json={
+            "name": "Other", "url": "https://other.example.com", "organization_id": 1
+        }, headers=auth_headers)
+
+        response = client.get(f"/websites/{website_id}", headers=auth_headers)
+
+        assert response.json()["name"] == "Elsewhere"
+
+    def test_failed_replica_is_ejected(self, client, auth_headers, website_with_replica, configure_replicas):
+        """Test an unreachable replica falls back to the primary and leaves rotation"""
+        configure_replicas("sqlite:////nonexistent-dir/replica.db")
+
+        response = client.get("/websites/", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()[0]["name"] == "Primary Name"
+        assert replicas.get_replica_set().status() == [{"index": 0, "ejected": True}]
+
+    def test_health_reports_replicas(self, client, auth_headers, website_with_replica, configure_replicas):
+        """Test the pool endpoint lists each replica"""
+        _, replica_url = website_with_replica
+        configure_replicas(replica_url)
+
+        client.get("/websites/", headers=auth_headers)
+        body = client.get("/health/db-pool").json()
+
+        assert body["replicas"][0]["ejected"] is False
+        assert "async" in body["replicas"][0]
+        assert "primary" in body
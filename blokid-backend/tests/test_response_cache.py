@@ -0,0 +1,96 @@
+# tests/test_response_cache.py
+import pytest
+from app.models.user import OrganizationMember, User as UserModel, UserRole
+from app.utils.response_cache import response_cache
+from app.utils.security import create_access_token, get_password_hash
+
+def _add_member(test_db, org_id, email="member@example.com"):
+    member = UserModel(email=email, hashed_password=get_password_hash("password123"))
+    test_db.add(member)
+    test_db.flush()
+    test_db.add(OrganizationMember(
+        user_id=member.id, organization_id=org_id, role=UserRole.ORGANIZATION_USER
+    ))
+    test_db.commit()
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': email})}"}
+
+class TestResponseCache:
+    @pytest.mark.parametrize("path", ["/websites/{website_id}", "/api/organizations/{org_id}"])
+    def test_hits_skip_the_database(self, client, auth_headers, add_website, query_counter, path):
+        """Test a repeated read is answered from the cache without loading the row"""
+        org_id, website_id = add_website()
+        url = path.format(org_id=org_id, website_id=website_id)
+        first = client.get(url, headers=auth_headers)
+        query_counter.clear()
+        second = client.get(url, headers=auth_headers)
+
+        assert second.json() == first.json()
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert not any("FROM websites" in q or "FROM organizations" in q for q in query_counter)
+        assert response_cache.hits == 1
+
+    @pytest.mark.parametrize("path", ["/websites/{website_id}", "/api/organizations/{org_id}"])
+    def test_updates_evict(self, client, auth_headers, add_website, path):
+        """Test an update through the service is visible on the next read"""
+        org_id, website_id = add_website()
+        url = path.format(org_id=org_id, website_id=website_id)
+        client.get(url, headers=auth_headers)
+        client.put(url, json={"name": "Renamed"}, headers=auth_headers)
+
+        assert client.get(url, headers=auth_headers).json()["name"] == "Renamed"
+        assert response_cache.invalidations >= 1
+
+    def test_organization_update_evicts_its_websites(self, client, auth_headers, add_website):
+        """Test website bodies embedding an organization are dropped with it"""
+        org_id, website_id = add_website()
+        client.get(f"/websites/{website_id}", headers=auth_headers)
+        client.put(f"/api/organizations/{org_id}", json={"name": "Renamed"}, headers=auth_headers)
+
+        website = client.get(f"/websites/{website_id}", headers=auth_headers).json()
+        assert website["organization"]["name"] == "Renamed"
+
+    def test_delete_evicts(self, client, auth_headers, add_website):
+        """Test a deleted website is not served from the cache"""
+        _, website_id = add_website()
+        client.get(f"/websites/{website_id}", headers=auth_headers)
+        client.delete(f"/websites/{website_id}", headers=auth_headers)
+
+        assert client.get(f"/websites/{website_id}", headers=auth_headers).status_code in (403, 404)
+
+    def test_scope_is_part_of_the_key(self, client, auth_headers, test_db, add_website):
+        """Test readers with different roles get separate entries"""
+        org_id, _ = add_website()
+        member_headers = _add_member(test_db, org_id)
+        client.get(f"/api/organizations/{org_id}", headers=auth_headers)
+        client.get(f"/api/organizations/{org_id}", headers=member_headers)
+
+        assert len(response_cache) == 2
+        assert response_cache.hits == 0
+
+    def test_outsiders_are_refused_after_a_fill(self, client, auth_headers, test_db, add_website):
+        """Test a cached body is never served to a user without access"""
+        org_id, website_id = add_website()
+        client.get(f"/websites/{website_id}", headers=auth_headers)
+        outsider = UserModel(email="outsider@example.com", hashed_password=get_password_hash("password123"))
+        test_db.add(outsider)
+        test_db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': outsider.email})}"}
+
+        assert client.get(f"/websites/{website_id}", headers=headers).status_code == 403
+        assert client.get(f"/api/organizations/{org_id}", headers=headers).status_code == 403
+
+    def test_size_is_bounded(self, monkeypatch):
+        """Test least recently used entries are evicted beyond maxsize"""
+        monkeypatch.setattr(response_cache, "maxsize", 2)
+        for resource_id in range(3):
+            response_cache.set(("Website", resource_id, None), object())
+
+        assert len(response_cache) == 2
+        assert response_cache.stats()["evictions"] == 1
+
+    def test_health_endpoint_reports_counters(self, client):
+        """Test the counters are exposed for monitoring"""
+        stats = client.get("/health/response-cache").json()
+
+        assert set(stats) >= {"size", "maxsize", "hits", "misses", "evictions", "invalidations"}
+
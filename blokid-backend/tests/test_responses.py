@@ -0,0 +1,41 @@
+# tests/test_responses.py
+from datetime import datetime
+import msgpack
+from app.models.user import UserRole
+from app.utils.responses import NegotiatedResponse
+
+class TestNegotiatedResponses:
+    def test_json_by_default(self, client, add_website, auth_headers):
+        """Test clients without a preference still get JSON"""
+        add_website()
+
+        response = client.get("/websites/", headers=auth_headers)
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["vary"] == "Accept"
+        assert response.json()[0]["organization"]["owner"]["email"] == "test@example.com"
+
+    def test_msgpack_when_accepted(self, client, add_website, auth_headers):
+        """Test Accept: application/msgpack yields the same document as MessagePack"""
+        add_website()
+        as_json = client.get("/websites/", headers=auth_headers).json()
+
+        response = client.get("/websites/", headers={**auth_headers, "Accept": "application/msgpack"})
+
+        assert response.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == as_json
+
+    def test_errors_stay_json(self, client, auth_headers):
+        """Test error bodies are unaffected by negotiation"""
+        response = client.get("/websites/9999", headers={**auth_headers, "Accept": "application/msgpack"})
+
+        assert response.status_code == 403
+        assert response.json()["detail"]
+
+    def test_render_handles_rich_types(self):
+        """Test datetimes, enums and non-string keys encode like the JSON encoder would"""
+        body = NegotiatedResponse(
+            {"at": datetime(2026, 1, 2, 3, 4, 5), "role": UserRole.WEBSITE_USER, 1: "one"}
+        ).body
+
+        assert body == b'{"at":"2026-01-02T03:04:05","role":"website_user","1":"one"}'
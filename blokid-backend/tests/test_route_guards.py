@@ -0,0 +1,59 @@
+# tests/test_route_guards.py
+import pytest
+from app.models.user import User, UserRole
+from app.models.organization import Organization
+from app.models.website import Website
+from app.services.permission_service import snapshot_cache
+
+@pytest.fixture()
+def website(test_db, auth_headers):
+    org = test_db.query(Organization).first()
+    website = Website(name="Guarded", url="https://guarded.example.com", organization_id=org.id)
+    test_db.add(website)
+    test_db.commit()
+    return website
+
+def _membership_queries(statements):
+    return [s for s in statements if "FROM organization_members" in s]
+
+class TestRouteGuards:
+    def test_permission_resolved_once_per_request(self, client, website, auth_headers, query_counter, monkeypatch):
+        """Test guard and service share one permission evaluation"""
+        website_id = website.id
+        # Without the cross-request snapshot cache every evaluation would hit the DB
+        monkeypatch.setattr(snapshot_cache, "maxsize", 0)
+
+        query_counter.clear()
+        response = client.put(f"/websites/{website_id}", json={"name": "Renamed"}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert len(_membership_queries(query_counter)) == 1
+
+    def test_organization_guard_denies_non_members(self, client, test_db, auth_headers):
+        """Test guards reject users outside the organization"""
+        outsider = User(email="outsider@example.com", hashed_password="hashed")
+        test_db.add(outsider)
+        test_db.commit()
+        foreign = Organization(name="Foreign", owner_id=outsider.id)
+        test_db.add(foreign)
+        test_db.commit()
+
+        response = client.get(f"/api/organizations/{foreign.id}", headers=auth_headers)
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Organization access required"
+
+    def test_website_invite_route(self, client, test_db, website, auth_headers):
+        """Test website admins can invite through the guarded route"""
+        invitee = User(email="invitee@example.com", hashed_password="hashed")
+        test_db.add(invitee)
+        test_db.commit()
+
+        response = client.post(
+            f"/websites/{website.id}/invite",
+            json={"email": "invitee@example.com", "role": UserRole.WEBSITE_USER.value},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        assert "membership_id" in response.json()
@@ -0,0 +1,57 @@
+# tests/test_trusted_serialization.py
+from types import SimpleNamespace
+from datetime import datetime
+from app.config import settings
+from app.models.organization import Organization as OrganizationModel
+from app.models.website import Website as WebsiteModel
+from app.models.user import UserRole
+from app.schemas.organization import Organization
+from app.schemas.user import Member
+from app.schemas.website import Website
+from app.services.permission_service import PermissionService
+from app.models.user import User as UserModel
+from app.utils.serialization import dump_trusted, list_adapter
+
+class TestTrustedSerialization:
+    def test_matches_validated_output(self, test_db, auth_headers):
+        """Test the fast path yields what response_model validation would"""
+        org = test_db.query(OrganizationModel).first()
+        test_db.add(WebsiteModel(name="Site", url="https://site.example.com", organization_id=org.id))
+        test_db.commit()
+        user = test_db.query(UserModel).filter(UserModel.email == "test@example.com").one()
+        permission_service = PermissionService(test_db)
+
+        for schema, rows in [
+            (Website, permission_service.get_user_websites(user)),
+            (Organization, permission_service.get_user_organizations(user)),
+        ]:
+            adapter = list_adapter(schema)
+            validated = adapter.dump_python(adapter.validate_python(rows, from_attributes=True))
+            assert dump_trusted(schema, rows) == validated
+
+    def test_reads_core_rows_and_aliases(self):
+        """Test Row-like tuples work and validation aliases pick the source column"""
+        joined = datetime(2026, 1, 1)
+        row = SimpleNamespace(
+            id=1, user_id=7, email="member@example.com", is_active=True, is_verified=False,
+            role=UserRole.WEBSITE_USER, created_at=joined
+        )
+
+        assert dump_trusted(Member, [row]) == [{
+            "user_id": 7, "email": "member@example.com", "is_active": True, "is_verified": False,
+            "role": UserRole.WEBSITE_USER, "joined_at": joined
+        }]
+
+    def test_skips_validation_unless_configured(self, monkeypatch):
+        """Test trusted rows are copied, not validated, in production mode"""
+        monkeypatch.setattr(settings, "VALIDATE_TRUSTED_RESPONSES", False)
+        owner = SimpleNamespace(
+            id=1, email="not-an-email", is_active=True, is_verified=False,
+            created_at=datetime(2026, 1, 1), updated_at=None
+        )
+        org = SimpleNamespace(
+            id=1, name="Org", description=None, owner_id=1,
+            created_at=datetime(2026, 1, 1), updated_at=None, owner=owner
+        )
+
+        assert dump_trusted(Organization, [org])[0]["owner"]["email"] == "not-an-email"
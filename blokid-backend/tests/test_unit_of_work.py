@@ -0,0 +1,104 @@
+# tests/test_unit_of_work.py
+import pytest
+from sqlalchemy import event
+from app.models.user import User, OrganizationMember
+from app.models.organization import Organization
+from app.models.website import Website
+from app.schemas.organization import OrganizationCreate
+from app.schemas.user import UserCreate
+from app.schemas.website import WebsiteCreate
+from app.services.auth_service import AuthService
+from app.services.organization_service import OrganizationService
+from app.services.website_service import WebsiteService
+from app.utils.unit_of_work import unit_of_work
+
+@pytest.fixture()
+def commits(test_db):
+    """Fixture counting commits on the test session"""
+    recorded = []
+    listener = lambda session: recorded.append(session)
+    event.listen(test_db, "after_commit", listener)
+    yield recorded
+    event.remove(test_db, "after_commit", listener)
+
+class TestUnitOfWork:
+    def test_registration_commits_once(self, test_db, commits):
+        """Test user, organization and membership share one transaction"""
+        user = AuthService(test_db).register_user(
+            UserCreate(email="uow@example.com", password="password123"), hashed_password="hashed"
+        )
+
+        assert len(commits) == 1
+        membership = test_db.query(OrganizationMember).filter(
+            OrganizationMember.user_id == user.id
+        ).one()
+        assert membership.organization.name == "uow@example.com's Organization"
+
+    def test_failure_leaves_no_orphans(self, test_db, monkeypatch):
+        """Test a crash after the user insert rolls the whole registration back"""
+        def fail(*args, **kwargs):
+            raise RuntimeError("organization insert failed")
+        monkeypatch.setattr(OrganizationService, "create_organization", fail)
+
+        with pytest.raises(RuntimeError):
+            AuthService(test_db).register_user(
+                UserCreate(email="orphan@example.com", password="password123"), hashed_password="hashed"
+            )
+
+        assert test_db.query(User).count() == 0
+        assert test_db.query(Organization).count() == 0
+
+    def test_routers_compose_service_calls(self, test_db, commits):
+        """Test an outer scope turns several service calls into one commit"""
+        owner = User(email="composer@example.com", hashed_password="hashed")
+        test_db.add(owner)
+        test_db.commit()
+        commits.clear()
+
+        with unit_of_work(test_db).begin():
+            org = OrganizationService(test_db).create_organization(
+                OrganizationCreate(name="Composed"), owner
+            )
+            WebsiteService(test_db).create_website(
+                WebsiteCreate(name="Site", url="https://composed.example.com", organization_id=org.id),
+                owner
+            )
+
+        assert len(commits) == 1
+        assert test_db.query(Website).filter(Website.organization_id == org.id).count() == 1
+
+    def test_after_commit_waits_for_outer_scope(self, test_db):
+        """Test callbacks run after the outermost commit and are dropped on rollback"""
+        uow = unit_of_work(test_db)
+        calls = []
+
+        with uow.begin():
+            with uow.begin():
+                uow.after_commit(lambda: calls.append("inner"))
+            assert calls == []
+        assert calls == ["inner"]
+
+        with pytest.raises(ValueError):
+            with uow.begin():
+                uow.after_commit(lambda: calls.append("rolled back"))
+                raise ValueError()
+        assert calls == ["inner"]
+
+    def test_failed_commit_drops_callbacks(self, test_db, monkeypatch):
+        """Test callbacks of a transaction whose commit failed never run later"""
+        uow = unit_of_work(test_db)
+        calls = []
+        commit = test_db.commit
+
+        def failing_commit():
+            raise RuntimeError("commit failed")
+
+        monkeypatch.setattr(test_db, "commit", failing_commit)
+        with pytest.raises(RuntimeError):
+            with uow.begin():
+                uow.after_commit(lambda: calls.append("failed"))
+        monkeypatch.setattr(test_db, "commit", commit)
+
+        with uow.begin():
+            uow.after_commit(lambda: calls.append("next"))
+        assert calls == ["next"]
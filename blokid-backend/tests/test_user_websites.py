@@ -0,0 +1,84 @@
+# tests/test_user_websites.py
+from app.services.permission_service import PermissionService
+from app.utils.pagination import PageParams
+from app.models.user import User, OrganizationMember, WebsiteMember, UserRole
+from app.models.organization import Organization
+from app.models.website import Website
+
+def _create_tenant(test_db):
+    user = User(email="many-orgs@example.com", hashed_password="hashed")
+    outsider = User(email="outsider@example.com", hashed_password="hashed")
+    test_db.add_all([user, outsider])
+    test_db.commit()
+
+    orgs = [Organization(name=f"Org {i}", owner_id=user.id) for i in range(3)]
+    foreign_org = Organization(name="Foreign", owner_id=outsider.id)
+    test_db.add_all(orgs + [foreign_org])
+    test_db.commit()
+
+    for org in orgs:
+        test_db.add(OrganizationMember(
+            user_id=user.id, organization_id=org.id, role=UserRole.ORGANIZATION_USER
+        ))
+        test_db.add_all([
+            Website(name=f"{org.name} site {i}", url="https://example.com", organization_id=org.id)
+            for i in range(2)
+        ])
+    shared = Website(name="Shared", url="https://shared.example.com", organization_id=foreign_org.id)
+    hidden = Website(name="Hidden", url="https://hidden.example.com", organization_id=foreign_org.id)
+    test_db.add_all([shared, hidden])
+    test_db.commit()
+    test_db.add(WebsiteMember(user_id=user.id, website_id=shared.id, role=UserRole.WEBSITE_USER))
+    test_db.commit()
+    return user, shared, hidden
+
+class TestUserWebsites:
+    def test_single_query_over_all_access_paths(self, test_db, query_counter):
+        """Test org-derived and direct websites come back from one statement"""
+        user, shared, hidden = _create_tenant(test_db)
+        user_id, shared_id, hidden_id = user.id, shared.id, hidden.id
+
+        query_counter.clear()
+        websites = PermissionService(test_db).get_user_websites(user)
+
+        assert len(query_counter) == 1
+        ids = [w.id for w in websites]
+        assert len(ids) == 7
+        assert ids == sorted(ids)
+        assert shared_id in ids
+        assert hidden_id not in ids
+
+    def test_keyset_pages_cover_everything_once(self, test_db):
+        """Test following next_cursor neither skips nor repeats rows"""
+        user, _, _ = _create_tenant(test_db)
+        permission_service = PermissionService(test_db)
+
+        seen, cursor = [], None
+        while True:
+            page = permission_service.get_user_websites(user, PageParams(cursor=cursor, limit=3))
+            seen.extend(w.id for w in page)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [w.id for w in permission_service.get_user_websites(user)]
+
+    def test_route_returns_next_cursor(self, client, test_db, auth_headers):
+        """Test /websites/ pages via X-Next-Cursor and caps the page size"""
+        org = test_db.query(Organization).first()
+        test_db.add_all([
+            Website(name=f"Site {i}", url="https://example.com", organization_id=org.id)
+            for i in range(3)
+        ])
+        test_db.commit()
+
+        first = client.get("/websites/?limit=2", headers=auth_headers)
+        assert first.status_code == 200
+        assert len(first.json()) == 2
+
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/websites/?limit=2&cursor={cursor}", headers=auth_headers)
+        assert [w["name"] for w in second.json()] == ["Site 2"]
+        assert "X-Next-Cursor" not in second.headers
+
+        assert client.get("/websites/?limit=100000", headers=auth_headers).status_code == 422
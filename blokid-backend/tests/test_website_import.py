@@ -0,0 +1,158 @@
+# tests/test_website_import.py
+import asyncio
+import json
+from app.config import settings
+from app.models.organization import Organization as OrganizationModel
+from app.models.website import Website as WebsiteModel
+from app.models.user import User as UserModel
+from app.services.permission_service import PermissionService
+from app.utils.export import ExportFormat
+from app.utils.imports import read_records
+
+def _org_id(test_db):
+    return test_db.query(OrganizationModel).first().id
+
+def _ndjson(records):
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+def _on_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def _parse(body, format, chunk_size=7):
+    """Every (line, record, error) read_records yields for body sent in small chunks"""
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+    
+    async def collect():
+        return [item async for item in read_records(chunks(), format)]
+    
+    return asyncio.run(collect())
+
+class TestWebsiteImport:
+    def test_imports_in_batches_and_reports_rejections(self, client, auth_headers, test_db, monkeypatch):
+        """Test valid lines are committed batch by batch and bad lines are listed"""
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 4)
+        org_id = _org_id(test_db)
+        lines = [{"name": f"Site {n}", "url": f"https://site{n}.example.com"} for n in range(10)]
+        lines[3] = {"name": "No url"}
+        lines[6] = {"name": "Elsewhere", "url": "https://x.example.com", "organization_id": org_id + 1}
+        body = _ndjson(lines) + b"\nnot json\n\n"
+
+        response = client.post(
+            f"/websites/organizations/{org_id}/websites/import?import_id=first",
+            content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+        )
+
+        summary = response.json()
+        assert response.status_code == 200
+        assert summary["import_id"] == "first"
+        assert (summary["processed"], summary["imported"], summary["rejected"]) == (11, 8, 3)
+        assert summary["batches"] == 2
+        assert summary["done"] is True
+        assert [r["line"] for r in summary["rejections"]] == [4, 7, 11]
+        assert "url" in summary["rejections"][0]["detail"]
+        assert test_db.query(WebsiteModel).filter(WebsiteModel.organization_id == org_id).count() == 8
+
+        progress = client.get("/websites/imports/first", headers=auth_headers).json()
+        assert progress == summary
+
+    def test_csv_with_multiline_fields(self, client, auth_headers, test_db):
+        """Test quoted CSV fields may span lines"""
+        org_id = _org_id(test_db)
+        body = (
+            'name,url,description\r\n'
+            'One,https://one.example.com,"first\nsecond"\r\n'
+            'Two,https://two.example.com,\r\n'
+            'Three,https://three.example.com\r\n'
+        ).encode()
+
+        summary = client.post(
+            f"/websites/organizations/{org_id}/websites/import?format=csv",
+            content=body,
+            headers=auth_headers
+        ).json()
+
+        assert (summary["imported"], summary["rejected"]) == (2, 1)
+        assert summary["rejections"][0]["line"] == 5
+        one = test_db.query(WebsiteModel).filter(WebsiteModel.name == "One").one()
+        assert one.description == "first\nsecond"
+
+    def test_checks_permission_once(self, client, auth_headers, test_db, monkeypatch):
+        """Test the organization permission is decided once per upload"""
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+        calls = []
+        original = PermissionService.can_create_website_in_organization
+        monkeypatch.setattr(
+            PermissionService, "can_create_website_in_organization",
+            lambda self, user, org_id: calls.append((org_id, _on_event_loop())) or original(self, user, org_id)
+        )
+        org_id = _org_id(test_db)
+        lines = [{"name": f"Site {n}", "url": f"https://site{n}.example.com"} for n in range(9)]
+
+        client.post(f"/websites/organizations/{org_id}/websites/import", content=_ndjson(lines), headers=auth_headers)
+
+        # Snapshot queries run on a worker thread, not the event loop
+        assert calls == [(org_id, False)]
+
+    def test_rejects_foreign_organizations(self, client, auth_headers, test_db):
+        """Test importing into an organization without access is refused"""
+        owner = UserModel(email="other@example.com", hashed_password="x")
+        test_db.add(owner)
+        test_db.flush()
+        foreign = OrganizationModel(name="Other", owner_id=owner.id)
+        test_db.add(foreign)
+        test_db.commit()
+
+        response = client.post(
+            f"/websites/organizations/{foreign.id}/websites/import",
+            content=_ndjson([{"name": "x", "url": "https://x.example.com"}]),
+            headers=auth_headers
+        )
+
+        assert response.status_code == 403
+        assert test_db.query(WebsiteModel).count() == 0
+
+    def test_progress_is_private(self, client, auth_headers):
+        """Test unknown or other users' imports are not found"""
+        assert client.get("/websites/imports/missing", headers=auth_headers).status_code == 404
+
+    def test_oversized_lines_are_rejected_without_buffering(self, monkeypatch):
+        """Test an NDJSON line over the record limit is rejected and parsing continues"""
+        monkeypatch.setattr(settings, "IMPORT_MAX_RECORD_BYTES", 64)
+        body = _ndjson([
+            {"name": "One", "url": "https://one.example.com"},
+            {"name": "x" * 200, "url": "https://long.example.com"},
+            {"name": "Two", "url": "https://two.example.com"},
+        ])
+
+        results = _parse(body, ExportFormat.NDJSON)
+
+        assert [(line, error) for line, _, error in results] == [
+            (1, None), (2, "Record exceeds 64 bytes"), (3, None)
+        ]
+
+    def test_stray_csv_quote_loses_a_bounded_run_of_rows(self, client, auth_headers, test_db, monkeypatch):
+        """Test an unbalanced quote rejects one oversized record, then parsing resumes"""
+        monkeypatch.setattr(settings, "IMPORT_MAX_RECORD_BYTES", 1024)
+        org_id = _org_id(test_db)
+        rows = [f"Site {n},https://site{n}.example.com" for n in range(3000)]
+        rows[1] = 'Site "1,https://site1.example.com'
+        body = ("name,url\n" + "\n".join(rows)).encode()
+
+        summary = client.post(
+            f"/websites/organizations/{org_id}/websites/import?format=csv",
+            content=body,
+            headers=auth_headers
+        ).json()
+
+        assert summary["rejected"] == 1
+        assert summary["rejections"][0]["line"] == 3
+        assert "unbalanced quote" in summary["rejections"][0]["detail"]
+        # Only the rows the stray quote swallowed before hitting the limit are lost
+        assert 2900 < summary["imported"] < 3000
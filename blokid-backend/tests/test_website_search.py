@@ -0,0 +1,97 @@
+# tests/test_website_search.py
+from app.models.organization import Organization as OrganizationModel
+from app.models.website import POSTGRESQL_SEARCH_DDL, SEARCH_DOCUMENT, Website as WebsiteModel
+from app.models.user import User as UserModel
+from app.utils.search import search_terms, website_search_condition
+
+def _seed(test_db):
+    org = test_db.query(OrganizationModel).first()
+    owner = UserModel(email="other@example.com", hashed_password="x")
+    test_db.add(owner)
+    test_db.flush()
+    foreign = OrganizationModel(name="Other", owner_id=owner.id)
+    test_db.add(foreign)
+    test_db.flush()
+    test_db.add_all([
+        WebsiteModel(name="Coffee Shop", url="https://beans.example.com", organization_id=org.id),
+        WebsiteModel(name="Tea Room", url="https://leaves.example.com", description="Fine coffee too",
+                     organization_id=org.id),
+        WebsiteModel(name="Bakery", url="https://bread.example.com", organization_id=org.id),
+        WebsiteModel(name="Coffee Rival", url="https://rival.example.com", organization_id=foreign.id),
+    ])
+    test_db.commit()
+    return org.id
+
+def _names(response):
+    return sorted(website["name"] for website in response.json())
+
+class TestWebsiteSearch:
+    def test_matches_name_url_and_description(self, client, auth_headers, test_db):
+        """Test words match any indexed column, by prefix, within the caller's access"""
+        _seed(test_db)
+
+        assert _names(client.get("/websites/search?q=coffee", headers=auth_headers)) == ["Coffee Shop", "Tea Room"]
+        assert _names(client.get("/websites/search?q=bea", headers=auth_headers)) == ["Coffee Shop"]
+        assert _names(client.get("/websites/search?q=tea%20fine", headers=auth_headers)) == ["Tea Room"]
+        assert _names(client.get("/websites/search?q=rival", headers=auth_headers)) == []
+
+    def test_index_follows_updates_and_deletes(self, client, auth_headers, test_db):
+        """Test the index stays in step with writes"""
+        _seed(test_db)
+        bakery = test_db.query(WebsiteModel).filter(WebsiteModel.name == "Bakery").one()
+        client.put(f"/websites/{bakery.id}", json={"name": "Patisserie"}, headers=auth_headers)
+
+        assert _names(client.get("/websites/search?q=bakery", headers=auth_headers)) == []
+        assert _names(client.get("/websites/search?q=patis", headers=auth_headers)) == ["Patisserie"]
+
+        client.delete(f"/websites/{bakery.id}", headers=auth_headers)
+        assert _names(client.get("/websites/search?q=patis", headers=auth_headers)) == []
+
+    def test_paginates(self, client, auth_headers, test_db):
+        """Test results page with the usual cursor"""
+        _seed(test_db)
+        first = client.get("/websites/search?q=coffee&limit=1", headers=auth_headers)
+        second = client.get(
+            f"/websites/search?q=coffee&limit=1&cursor={first.headers['X-Next-Cursor']}", headers=auth_headers
+        )
+
+        assert len(first.json()) == len(second.json()) == 1
+        assert "X-Next-Cursor" not in second.headers
+        assert _names(first) + _names(second) == ["Coffee Shop", "Tea Room"]
+
+    def test_query_syntax_is_literal(self, client, auth_headers, test_db):
+        """Test FTS operators and punctuation in the query cannot break the match"""
+        _seed(test_db)
+
+        assert _names(client.get('/websites/search?q="coffee OR*', headers=auth_headers)) == []
+        assert client.get("/websites/search?q=%22%2A", headers=auth_headers).json() == []
+
+    def test_uses_the_text_index(self, client, auth_headers, test_db, query_counter):
+        """Test the SQLite query goes through the FTS5 table, not a LIKE scan"""
+        _seed(test_db)
+        client.get("/websites/search?q=coffee", headers=auth_headers)
+
+        assert any("websites_fts MATCH" in statement for statement in query_counter)
+        assert not any("LIKE" in statement for statement in query_counter)
+
+    def test_urls_split_into_words(self, client, auth_headers, test_db):
+        """Test hosts match by each dotted part, like any other word"""
+        _seed(test_db)
+
+        assert _names(client.get("/websites/search?q=example", headers=auth_headers)) == [
+            "Bakery", "Coffee Shop", "Tea Room"
+        ]
+        assert _names(client.get("/websites/search?q=bread.example.com", headers=auth_headers)) == ["Bakery"]
+        assert _names(client.get("/websites/search?q=https%3A%2F%2Fleav", headers=auth_headers)) == ["Tea Room"]
+
+    def test_terms_split_like_both_indexes(self):
+        """Test queries split into the words FTS5 and the Postgres document index"""
+        assert search_terms("Beans.Example_com/path-2") == ["beans", "example", "com", "path", "2"]
+
+    def test_postgres_query_uses_the_indexed_document(self):
+        """Test Postgres matches the punctuation-free document ix_websites_search is built on"""
+        condition = str(website_search_condition("postgresql", ["example"]))
+
+        assert "regexp_replace(" in SEARCH_DOCUMENT
+        assert SEARCH_DOCUMENT in POSTGRESQL_SEARCH_DDL[0]
+        assert SEARCH_DOCUMENT.replace("coalesce(", "coalesce(websites.") in condition